@@ -1,17 +1,21 @@
 # app/api/routes/brochures.py
+import asyncio
 from uuid import UUID
 from enum import Enum
-from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException
 from sqlmodel import Session
-from typing import Any
+from typing import Any, AsyncGenerator
 from fastapi.responses import StreamingResponse
 from pydantic import BaseModel
 
 from app.api.deps import get_current_user, get_db
+from app.core.db import engine
 from app.crud import brochure as crud
 from app.models.brochure import BrochureCreate, BrochurePublic, BrochuresPublic
+from app.models.common import GenerationMode
 from app.models.user import User
 from app.services.brochure_service import BrochureService
+from app.services.singleflight import flight_key, singleflight
 
 router = APIRouter()
 brochure_service = BrochureService()
@@ -24,38 +28,75 @@ class BrochureStatus(str, Enum):
     FAILED = "failed"
 
 
-async def generate_and_save_brochure(
-    session: Session,
+def _flight_endpoint(endpoint: str, mode: GenerationMode) -> str:
+    return f"{endpoint}_quick" if mode == GenerationMode.QUICK else endpoint
+
+
+async def stream_and_save_brochure(
     brochure_id: UUID,
     company_name: str,
     url: str,
-) -> None:
-    """Background task to generate and save brochure content"""
-    try:
+    mode: GenerationMode = GenerationMode.FULL,
+) -> AsyncGenerator[str, None]:
+    """
+    Stream brochure chunks to the client and persist the same generation,
+    moving the brochure row through PROCESSING to COMPLETED or FAILED. A failed
+    generation ends the body with a "[Brochure generation failed: ...]" line.
+    """
+    # The request session is not guaranteed to outlive the response, so the
+    # stream owns its own session
+    with Session(engine) as session:
         brochure = crud.get_brochure_by_id(session=session, brochure_id=brochure_id)
         if not brochure:
             return
-
-        brochure.status = BrochureStatus.PROCESSING
-        session.add(brochure)
-        session.commit()
-
-        content = await brochure_service.generate_brochure(
-            company_name=company_name,
-            url=url,
+        crud.update_brochure(
+            session=session, brochure=brochure, status=BrochureStatus.PROCESSING
         )
 
-        brochure.content = content
-        brochure.status = BrochureStatus.COMPLETED
-        session.add(brochure)
-        session.commit()
+        chunks: list[str] = []
+        try:
+            # Concurrent identical requests attach to the same live stream
+            async for chunk in singleflight.stream(
+                flight_key(
+                    _flight_endpoint("brochures.stream", mode), url, company_name
+                ),
+                lambda: brochure_service.stream_brochure(
+                    company_name=company_name,
+                    url=url,
+                    mode=mode.value,
+                ),
+            ):
+                chunks.append(chunk)
+                yield chunk
+        except (asyncio.CancelledError, GeneratorExit):
+            # The client disconnected mid-stream
+            crud.update_brochure(
+                session=session,
+                brochure=brochure,
+                status=BrochureStatus.FAILED,
+                content="".join(chunks),
+                error_message="Stream interrupted before completion",
+            )
+            raise
+        except Exception as e:
+            detail = getattr(e, "detail", None) or str(e) or type(e).__name__
+            crud.update_brochure(
+                session=session,
+                brochure=brochure,
+                status=BrochureStatus.FAILED,
+                content="".join(chunks),
+                error_message=detail,
+            )
+            # End the response normally, telling the client the text is cut short
+            yield f"\n\n[Brochure generation failed: {detail}]\n"
+            return
 
-    except Exception as e:
-        if brochure:
-            brochure.status = BrochureStatus.FAILED
-            brochure.error_message = str(e)
-            session.add(brochure)
-            session.commit()
+        crud.update_brochure(
+            session=session,
+            brochure=brochure,
+            status=BrochureStatus.COMPLETED,
+            content="".join(chunks),
+        )
 
 
 @router.post("/", response_model=BrochurePublic)
@@ -66,11 +107,20 @@ async def create_brochure(
     brochure_in: BrochureCreate,
 ) -> Any:
     """
-    Create company brochure for authenticated user.
+    Create company brochure for authenticated user. mode="quick" uses the
+    landing page only.
     """
-    content = await brochure_service.generate_brochure(
-        company_name=brochure_in.company_name,
-        url=brochure_in.url,
+    content = await singleflight.do(
+        flight_key(
+            _flight_endpoint("brochures.generate", brochure_in.mode),
+            brochure_in.url,
+            brochure_in.company_name,
+        ),
+        lambda: brochure_service.generate_brochure(
+            company_name=brochure_in.company_name,
+            url=brochure_in.url,
+            mode=brochure_in.mode.value,
+        ),
     )
 
     db_brochure = crud.create_brochure(
@@ -90,11 +140,20 @@ async def create_public_brochure(
     brochure_in: BrochureCreate,
 ) -> Any:
     """
-    Create public company brochure without authentication.
+    Create public company brochure without authentication. mode="quick" uses
+    the landing page only.
     """
-    content = await brochure_service.generate_brochure(
-        company_name=brochure_in.company_name,
-        url=brochure_in.url,
+    content = await singleflight.do(
+        flight_key(
+            _flight_endpoint("brochures.generate", brochure_in.mode),
+            brochure_in.url,
+            brochure_in.company_name,
+        ),
+        lambda: brochure_service.generate_brochure(
+            company_name=brochure_in.company_name,
+            url=brochure_in.url,
+            mode=brochure_in.mode.value,
+        ),
     )
 
     db_brochure = crud.create_brochure(
@@ -110,13 +169,12 @@ async def create_public_brochure(
 async def create_streaming_brochure(
     *,
     brochure_in: BrochureCreate,
-    background_tasks: BackgroundTasks,
     session: Session = Depends(get_db),
     current_user: User = Depends(get_current_user),
 ) -> StreamingResponse:
     """
     Create company brochure with streaming response for authenticated user.
-    Streams content immediately while saving complete content in background.
+    Streams content immediately and saves the streamed brochure once complete.
     """
     db_brochure = crud.create_streaming_brochure(
         session=session,
@@ -126,18 +184,12 @@ async def create_streaming_brochure(
         status=BrochureStatus.PENDING,
     )
 
-    background_tasks.add_task(
-        generate_and_save_brochure,
-        session=session,
-        brochure_id=db_brochure.id,
-        company_name=brochure_in.company_name,
-        url=brochure_in.url,
-    )
-
     return StreamingResponse(
-        brochure_service.stream_brochure(
+        stream_and_save_brochure(
+            brochure_id=db_brochure.id,
             company_name=brochure_in.company_name,
             url=brochure_in.url,
+            mode=brochure_in.mode,
         ),
         media_type="text/plain",
         headers={
@@ -151,7 +203,6 @@ async def create_streaming_brochure(
 async def create_public_streaming_brochure(
     *,
     brochure_in: BrochureCreate,
-    background_tasks: BackgroundTasks,
     session: Session = Depends(get_db),
 ) -> StreamingResponse:
     """
@@ -164,18 +215,12 @@ async def create_public_streaming_brochure(
         status=BrochureStatus.PENDING,
     )
 
-    background_tasks.add_task(
-        generate_and_save_brochure,
-        session=session,
-        brochure_id=db_brochure.id,
-        company_name=brochure_in.company_name,
-        url=brochure_in.url,
-    )
-
     return StreamingResponse(
-        brochure_service.stream_brochure(
+        stream_and_save_brochure(
+            brochure_id=db_brochure.id,
             company_name=brochure_in.company_name,
             url=brochure_in.url,
+            mode=brochure_in.mode,
         ),
         media_type="text/plain",
         headers={
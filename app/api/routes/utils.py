@@ -2,6 +2,7 @@ from fastapi import APIRouter, Depends
 from pydantic.networks import EmailStr
 
 from app.api.deps import get_current_active_superuser
+from app.core import metrics
 from app.models import Message
 from app.utils import generate_test_email, send_email
 
@@ -34,3 +35,14 @@ async def root_head():
 @router.get("/health-check/")
 async def health_check() -> bool:
     return True
+
+
+@router.get(
+    "/metrics/",
+    dependencies=[Depends(get_current_active_superuser)],
+)
+def get_metrics() -> dict[str, float]:
+    """
+    Counters shared by all workers (cache hits and misses, etc.).
+    """
+    return metrics.get_counters()
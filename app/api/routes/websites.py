@@ -1,33 +1,131 @@
+import json
 from uuid import UUID
 from fastapi import APIRouter, Depends, HTTPException
+from fastapi.responses import StreamingResponse
 from sqlmodel import Session
-from typing import Any
+from typing import Any, AsyncGenerator
 
 from app.api.deps import get_current_user, get_db
+from app.core.db import engine
 from app.crud import website as crud
 from app.models.user import User
+from app.models.common import GenerationMode
 from app.models.website import WebsiteSummaryCreate, WebsiteSummaryPublic
-from app.services.website_service import WebsiteService
+from app.services.singleflight import flight_key, singleflight
+from app.services.website_service import PreviousSummary, WebsiteService
 
 router = APIRouter()
 website_service = WebsiteService()
 
 
+def _previous_summary(session: Session, url: str) -> PreviousSummary | None:
+    indexed = crud.get_indexed_summary(session=session, url=url)
+    if indexed is None:
+        return None
+    return PreviousSummary(summary=indexed[0], section_hashes=indexed[1])
+
+
+async def _summarize(
+    session: Session, url: str, mode: GenerationMode
+) -> tuple[str, str, list[str] | None]:
+    """
+    Fetch and summarize url, sharing the work with identical in-flight
+    requests and reusing the URL's previous summary where the page allows.
+    Quick summaries have no section hashes: they are never reused.
+    """
+    if mode == GenerationMode.QUICK:
+        title, summary = await singleflight.do(
+            flight_key("websites.summarize_quick", url),
+            lambda: website_service.quick_summary(url),
+        )
+        return title, summary, None
+    previous = _previous_summary(session, url)
+    return await singleflight.do(
+        flight_key("websites.summarize", url),
+        lambda: website_service.summarize(url, previous),
+    )
+
+
+async def stream_and_save_summary(
+    url: str,
+    owner_id: UUID | None = None,
+    mode: GenerationMode = GenerationMode.FULL,
+) -> AsyncGenerator[str, None]:
+    """
+    Stream summary progress as NDJSON events and save the final summary.
+    Full summaries reuse and index the URL's previous summary like the
+    non-streaming routes. Errors after the response has started are sent as
+    an "error" event.
+    """
+    final = None
+    section_hashes = None
+    try:
+        previous = None
+        if mode != GenerationMode.QUICK:
+            # The request session is not guaranteed to outlive the response
+            with Session(engine) as session:
+                previous = _previous_summary(session, url)
+        # Concurrent identical requests attach to the same live stream
+        endpoint = (
+            "websites.summarize_quick_stream"
+            if mode == GenerationMode.QUICK
+            else "websites.summarize_stream"
+        )
+        async for line in singleflight.stream(
+            flight_key(endpoint, url),
+            lambda: website_service.stream_summary(url, mode.value, previous),
+        ):
+            event = json.loads(line)
+            if event["event"] == "summary":
+                # Section hashes are for the index, not for the client
+                section_hashes = event.pop("section_hashes", None)
+                final = event
+                line = json.dumps(event) + "\n"
+            yield line
+    except Exception as e:
+        detail = getattr(e, "detail", None) or str(e)
+        yield json.dumps({"event": "error", "detail": detail}) + "\n"
+        return
+
+    if final is None:
+        return
+    with Session(engine) as session:
+        if owner_id is None:
+            db_summary = crud.create_public_website_summary(
+                session=session, url=url, title=final["title"], summary=final["summary"]
+            )
+        else:
+            db_summary = crud.create_website_summary(
+                session=session,
+                url=url,
+                title=final["title"],
+                summary=final["summary"],
+                owner_id=owner_id,
+            )
+        if section_hashes is not None:
+            crud.save_section_index(
+                session=session,
+                url=url,
+                summary_id=db_summary.id,
+                section_hashes=section_hashes,
+            )
+
+
 # Authenticated routes (commented out)
 @router.post("/summarize", response_model=WebsiteSummaryPublic)
-def create_summary(
+async def create_summary(
     *,
     session: Session = Depends(get_db),
     current_user: User = Depends(get_current_user),
     summary_in: WebsiteSummaryCreate,
 ) -> Any:
     """
-    Create website summary for authenticated user.
+    Create website summary for authenticated user. mode="quick" answers from
+    the landing page alone.
     """
-    # Fetch website content
-    title, content = website_service.fetch_website_content(summary_in.url)
-    # Generate summary
-    summary = website_service.generate_summary(title, content)
+    title, summary, section_hashes = await _summarize(
+        session, summary_in.url, summary_in.mode
+    )
     # Save to database
     db_summary = crud.create_website_summary(
         session=session,
@@ -36,9 +134,36 @@ def create_summary(
         summary=summary,
         owner_id=current_user.id,
     )
+    if section_hashes is not None:
+        crud.save_section_index(
+            session=session,
+            url=summary_in.url,
+            summary_id=db_summary.id,
+            section_hashes=section_hashes,
+        )
     return db_summary
 
 
+@router.post("/summarize/stream")
+async def create_streaming_summary(
+    *,
+    current_user: User = Depends(get_current_user),
+    summary_in: WebsiteSummaryCreate,
+) -> StreamingResponse:
+    """
+    Create website summary for authenticated user, streaming progress as
+    NDJSON events ("started", "partial" per chunk of a large page, then
+    "summary" or "error"). The summary is saved once complete.
+    """
+    return StreamingResponse(
+        stream_and_save_summary(
+            summary_in.url, owner_id=current_user.id, mode=summary_in.mode
+        ),
+        media_type="application/x-ndjson",
+        headers={"Cache-Control": "no-cache"},
+    )
+
+
 @router.get("/summaries", response_model=list[WebsiteSummaryPublic])
 def read_summaries(
     session: Session = Depends(get_db),
@@ -57,18 +182,18 @@ def read_summaries(
 
 # New routes without authentication
 @router.post("/public/summarize", response_model=WebsiteSummaryPublic)
-def create_public_summary(
+async def create_public_summary(
     *,
     session: Session = Depends(get_db),
     summary_in: WebsiteSummaryCreate,
 ) -> Any:
     """
-    Create website summary without authentication.
+    Create website summary without authentication. mode="quick" answers from
+    the landing page alone.
     """
-    # Fetch website content
-    title, content = website_service.fetch_website_content(summary_in.url)
-    # Generate summary
-    summary = website_service.generate_summary(title, content)
+    title, summary, section_hashes = await _summarize(
+        session, summary_in.url, summary_in.mode
+    )
     # Save to database
     db_summary = crud.create_public_website_summary(
         session=session,
@@ -76,9 +201,32 @@ def create_public_summary(
         title=title,
         summary=summary,
     )
+    if section_hashes is not None:
+        crud.save_section_index(
+            session=session,
+            url=summary_in.url,
+            summary_id=db_summary.id,
+            section_hashes=section_hashes,
+        )
     return db_summary
 
 
+@router.post("/public/summarize/stream")
+async def create_public_streaming_summary(
+    *,
+    summary_in: WebsiteSummaryCreate,
+) -> StreamingResponse:
+    """
+    Create website summary without authentication, streaming progress as
+    NDJSON events. The summary is saved once complete.
+    """
+    return StreamingResponse(
+        stream_and_save_summary(summary_in.url, mode=summary_in.mode),
+        media_type="application/x-ndjson",
+        headers={"Cache-Control": "no-cache"},
+    )
+
+
 @router.get("/public/summaries", response_model=list[WebsiteSummaryPublic])
 def read_public_summaries(
     session: Session = Depends(get_db),
@@ -0,0 +1,171 @@
+import asyncio
+import json
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+from collections.abc import Generator
+from dataclasses import dataclass
+from typing import Any
+
+from app.core.config import settings
+
+
+_local = threading.local()
+
+
+@contextmanager
+def cache_connection() -> Generator[sqlite3.Connection, None, None]:
+    """
+    Return this thread's connection to the shared cache database, opened on
+    first use and reused afterwards.
+
+    The cache lives in its own SQLite file (WAL mode) so every uvicorn worker
+    on the host reads and writes the same entries. Blocking calls belong off
+    the event loop: async code uses the *_async methods below.
+    """
+    conn = getattr(_local, "conn", None)
+    if conn is None or _local.path != settings.CACHE_DB:
+        if conn is not None:
+            conn.close()
+        conn = sqlite3.connect(settings.CACHE_DB, timeout=5, isolation_level=None)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        _local.conn, _local.path = conn, settings.CACHE_DB
+    yield conn
+
+
+@dataclass
+class CacheEntry:
+    value: Any
+    stored_at: float
+    fresh: bool
+
+
+class SQLiteCache:
+    """
+    JSON key/value cache with a TTL and a size-bounded LRU, stored in one table
+    of the shared cache database.
+    """
+
+    def __init__(self, table: str, *, ttl_seconds: int, max_entries: int):
+        self.table = table
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        # Cache databases the table is known to exist in
+        self._initialized: set[str] = set()
+
+    def _ensure_table(self, conn: sqlite3.Connection) -> None:
+        if settings.CACHE_DB in self._initialized:
+            return
+        conn.execute(
+            f"""
+            CREATE TABLE IF NOT EXISTS {self.table} (
+                key TEXT PRIMARY KEY,
+                value TEXT NOT NULL,
+                stored_at REAL NOT NULL,
+                accessed_at REAL NOT NULL
+            )
+            """
+        )
+        conn.execute(
+            f"CREATE INDEX IF NOT EXISTS ix_{self.table}_accessed_at "
+            f"ON {self.table} (accessed_at)"
+        )
+        self._initialized.add(settings.CACHE_DB)
+
+    def get(self, key: str) -> Any | None:
+        """Return the cached value, or None when missing or expired."""
+        now = time.time()
+        with cache_connection() as conn:
+            self._ensure_table(conn)
+            row = conn.execute(
+                f"SELECT value, stored_at FROM {self.table} WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                return None
+            value, stored_at = row
+            if now - stored_at > self.ttl_seconds:
+                conn.execute(f"DELETE FROM {self.table} WHERE key = ?", (key,))
+                return None
+            conn.execute(
+                f"UPDATE {self.table} SET accessed_at = ? WHERE key = ?", (now, key)
+            )
+        return json.loads(value)
+
+    def get_entry(self, key: str) -> CacheEntry | None:
+        """
+        Return the cached entry even when it has expired, so callers can
+        revalidate stale values instead of discarding them.
+        """
+        now = time.time()
+        with cache_connection() as conn:
+            self._ensure_table(conn)
+            row = conn.execute(
+                f"SELECT value, stored_at FROM {self.table} WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                return None
+            conn.execute(
+                f"UPDATE {self.table} SET accessed_at = ? WHERE key = ?", (now, key)
+            )
+        value, stored_at = row
+        return CacheEntry(
+            value=json.loads(value),
+            stored_at=stored_at,
+            fresh=now - stored_at <= self.ttl_seconds,
+        )
+
+    def touch(self, key: str) -> None:
+        """Restart the TTL of an entry whose value is known to be current."""
+        now = time.time()
+        with cache_connection() as conn:
+            self._ensure_table(conn)
+            conn.execute(
+                f"UPDATE {self.table} SET stored_at = ?, accessed_at = ? WHERE key = ?",
+                (now, now, key),
+            )
+
+    def set(self, key: str, value: Any) -> None:
+        """Store a value and evict the least recently used entries over the cap."""
+        now = time.time()
+        with cache_connection() as conn:
+            self._ensure_table(conn)
+            conn.execute(
+                f"""
+                INSERT INTO {self.table} (key, value, stored_at, accessed_at)
+                VALUES (?, ?, ?, ?)
+                ON CONFLICT(key) DO UPDATE SET
+                    value = excluded.value,
+                    stored_at = excluded.stored_at,
+                    accessed_at = excluded.accessed_at
+                """,
+                (key, json.dumps(value), now, now),
+            )
+            conn.execute(
+                f"""
+                DELETE FROM {self.table} WHERE key IN (
+                    SELECT key FROM {self.table}
+                    ORDER BY accessed_at DESC
+                    LIMIT -1 OFFSET ?
+                )
+                """,
+                (self.max_entries,),
+            )
+
+    def clear(self) -> None:
+        with cache_connection() as conn:
+            self._ensure_table(conn)
+            conn.execute(f"DELETE FROM {self.table}")
+
+    async def get_async(self, key: str) -> Any | None:
+        return await asyncio.to_thread(self.get, key)
+
+    async def get_entry_async(self, key: str) -> CacheEntry | None:
+        return await asyncio.to_thread(self.get_entry, key)
+
+    async def touch_async(self, key: str) -> None:
+        await asyncio.to_thread(self.touch, key)
+
+    async def set_async(self, key: str, value: Any) -> None:
+        await asyncio.to_thread(self.set, key, value)
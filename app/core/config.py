@@ -118,5 +118,137 @@ class Settings(BaseSettings):
     OPENAI_API_KEY: str
     OPENAI_MODEL: str
 
+    # Chat completion settings per pipeline stage: <STAGE>_MODEL (default
+    # OPENAI_MODEL), <STAGE>_MAX_TOKENS (completion tokens) and
+    # <STAGE>_TIMEOUT (seconds); unset limits keep the provider defaults.
+    # Link selection only answers with a short JSON list of links.
+    LINK_SELECTION_MODEL: str | None = None
+    LINK_SELECTION_MAX_TOKENS: int | None = None
+    LINK_SELECTION_TIMEOUT: float | None = None
+    BROCHURE_MODEL: str | None = None
+    BROCHURE_MAX_TOKENS: int | None = None
+    BROCHURE_TIMEOUT: float | None = None
+    # Single-call summaries, map-reduce chunk summaries and update passes
+    SUMMARY_MODEL: str | None = None
+    SUMMARY_MAX_TOKENS: int | None = None
+    SUMMARY_TIMEOUT: float | None = None
+    # Combining the chunk summaries of a large page
+    SUMMARY_REDUCE_MODEL: str | None = None
+    SUMMARY_REDUCE_MAX_TOKENS: int | None = None
+    SUMMARY_REDUCE_TIMEOUT: float | None = None
+
+    # Outbound HTTP client used to fetch websites
+    HTTP_TIMEOUT: float = 10.0
+    HTTP_MAX_CONNECTIONS: int = 100
+    HTTP_MAX_KEEPALIVE_CONNECTIONS: int = 20
+    HTTP_KEEPALIVE_EXPIRY: float = 30.0
+    HTTP_MAX_CONNECTIONS_PER_HOST: int = 4
+    # Minimum spacing between request starts to the same host
+    HTTP_MIN_HOST_INTERVAL: float = 0.2
+    # Retries after 429/503; without Retry-After the wait doubles from
+    # FETCH_RETRY_BACKOFF seconds. Longer Retry-After values are not waited out.
+    FETCH_MAX_RETRIES: int = 2
+    FETCH_RETRY_BACKOFF: float = 1.0
+    FETCH_MAX_RETRY_AFTER: float = 10.0
+    HTTP_USER_AGENT: str = "Mozilla/5.0 (compatible; BrochureCraft/1.0)"
+    # Page downloads are streamed and cut off at this many (decompressed) bytes
+    FETCH_MAX_BYTES: int = 2 * 1024 * 1024
+    FETCH_ALLOWED_CONTENT_TYPES: list[str] = [
+        "text/html",
+        "application/xhtml+xml",
+        "text/plain",
+    ]
+
+    # Shared SQLite cache (pages, counters) used by every worker on the host
+    CACHE_DB: str = "cache.db"
+    # Counters are buffered per process and written to CACHE_DB this often
+    METRICS_FLUSH_INTERVAL: float = 5.0
+    PAGE_CACHE_ENABLED: bool = True
+    PAGE_CACHE_TTL_SECONDS: int = 60 * 60
+    PAGE_CACHE_MAX_ENTRIES: int = 5_000
+    COMPLETION_CACHE_ENABLED: bool = True
+    COMPLETION_CACHE_TTL_SECONDS: int = 60 * 60 * 24
+    COMPLETION_CACHE_MAX_ENTRIES: int = 2_000
+    # Characters per chunk when replaying a cached completion as a stream
+    COMPLETION_REPLAY_CHUNK_SIZE: int = 32
+
+    # Coalescing of identical in-flight summary/brochure requests. Cross-worker
+    # coalescing uses a lease in the shared cache database.
+    SINGLEFLIGHT_CROSS_WORKER: bool = False
+    SINGLEFLIGHT_LEASE_SECONDS: int = 120
+    SINGLEFLIGHT_POLL_INTERVAL: float = 0.25
+
+    # HTML parser used for extraction: "auto" picks the fastest installed of
+    # selectolax, lxml and the standard library html.parser
+    HTML_PARSER_BACKEND: Literal["auto", "selectolax", "lxml", "html.parser"] = "auto"
+    # How hard extraction strips navigation, banners, footers and link lists
+    # from page text: off, light (semantic chrome only), balanced or aggressive
+    EXTRACT_BOILERPLATE: Literal["off", "light", "balanced", "aggressive"] = "balanced"
+    # HTML documents larger than this are parsed off the event loop, in a pool
+    # of PARSE_PROCESS_WORKERS processes (0 disables the pool: use a thread)
+    PARSE_INLINE_MAX_BYTES: int = 64 * 1024
+    PARSE_PROCESS_WORKERS: int = 2
+
+    # Per-domain robots.txt / sitemap.xml discovery used for brochure links.
+    # Only the DISCOVERY_MAX_URLS shallowest sitemap URLs are kept.
+    DISCOVERY_ENABLED: bool = True
+    DISCOVERY_CACHE_TTL_SECONDS: int = 60 * 60 * 24
+    DISCOVERY_CACHE_MAX_ENTRIES: int = 1_000
+    DISCOVERY_MAX_URLS: int = 100
+    DISCOVERY_MAX_SITEMAPS: int = 3
+    # Product token matched against robots.txt User-agent lines
+    ROBOTS_USER_AGENT: str = "BrochureCraft"
+
+    # Candidate links offered to the link-selection prompt, after prefiltering
+    LINK_CANDIDATES_MAX: int = 50
+    # Local keyword classifier tried before the link-selection LLM call; the
+    # LLM is only asked when the classifier's confidence is below the minimum
+    LINK_CLASSIFIER_ENABLED: bool = True
+    LINK_CLASSIFIER_MIN_CONFIDENCE: float = 0.8
+    # JSONL file that LLM link choices are appended to, for
+    # scripts/eval_link_classifier.py (disabled when unset)
+    LINK_SELECTION_RECORD_PATH: str | None = None
+    # Also ask the LLM, in the background, when the classifier is confident, so
+    # the record covers the cases the classifier answers (costs an LLM call each)
+    LINK_SELECTION_SHADOW: bool = False
+
+    # Maximum number of brochure sub-pages fetched concurrently per request
+    BROCHURE_FETCH_CONCURRENCY: int = 4
+    # Sub-pages whose estimated text similarity (MinHash) to an earlier page is
+    # at least this are left out of the brochure prompt
+    NEAR_DUPLICATE_THRESHOLD: float = 0.8
+    # Likely sub-pages fetched speculatively during link selection (0 disables)
+    BROCHURE_PREFETCH_MAX: int = 3
+
+    # Prompt token budgets (counted with tiktoken)
+    BROCHURE_PROMPT_TOKEN_BUDGET: int = 5_000
+    SUMMARY_PROMPT_TOKEN_BUDGET: int = 8_000
+    # Summaries of content over the threshold are map-reduced: chunks of
+    # SUMMARY_CHUNK_TOKENS are summarized concurrently, then combined. Content
+    # beyond SUMMARY_MAX_CHUNKS chunks is compressed first.
+    SUMMARY_MAP_REDUCE_THRESHOLD_TOKENS: int = 8_000
+    SUMMARY_CHUNK_TOKENS: int = 3_000
+    SUMMARY_MAX_CHUNKS: int = 12
+    SUMMARY_MAP_CONCURRENCY: int = 4
+    # Re-summarizing a URL sends only changed sections to an update pass when
+    # they make up at most this share of the page text; more is regenerated
+    SUMMARY_INCREMENTAL_MAX_CHANGE: float = 0.4
+    # Smallest share worth fetching a brochure sub-page for
+    PROMPT_MIN_PAGE_TOKENS: int = 400
+    # Over-budget page text keeps its most central sentences (TextRank) instead
+    # of being cut off at the end
+    PROMPT_COMPRESSION_ENABLED: bool = True
+
+    # mode="quick" summaries and brochures use the landing page only. A
+    # summary is answered straight from the page's meta/OpenGraph/JSON-LD
+    # description when one has at least QUICK_METADATA_MIN_CHARS characters;
+    # otherwise QUICK_MODEL (default OPENAI_MODEL) gets a prompt capped at
+    # QUICK_PROMPT_TOKEN_BUDGET tokens.
+    QUICK_MODEL: str | None = None
+    QUICK_MAX_TOKENS: int | None = None
+    QUICK_TIMEOUT: float | None = None
+    QUICK_METADATA_MIN_CHARS: int = 120
+    QUICK_PROMPT_TOKEN_BUDGET: int = 1_500
+
 
 settings = Settings()  # type: ignore
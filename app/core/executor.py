@@ -0,0 +1,31 @@
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+
+from app.core.config import settings
+
+_parse_executor: ProcessPoolExecutor | None = None
+
+
+def get_parse_executor() -> ProcessPoolExecutor | None:
+    """
+    Return the process pool for CPU-heavy HTML parsing, or None when it is
+    disabled (PARSE_PROCESS_WORKERS = 0).
+    """
+    global _parse_executor
+    if settings.PARSE_PROCESS_WORKERS <= 0:
+        return None
+    if _parse_executor is None:
+        # spawn rather than fork: the server process has a running event loop
+        # and threads that must not be duplicated into the children
+        _parse_executor = ProcessPoolExecutor(
+            max_workers=settings.PARSE_PROCESS_WORKERS,
+            mp_context=multiprocessing.get_context("spawn"),
+        )
+    return _parse_executor
+
+
+def shutdown_parse_executor() -> None:
+    global _parse_executor
+    if _parse_executor is not None:
+        _parse_executor.shutdown(wait=False, cancel_futures=True)
+        _parse_executor = None
@@ -0,0 +1,47 @@
+import importlib.util
+
+import httpx
+
+from app.core.config import settings
+
+_client: httpx.AsyncClient | None = None
+
+
+def _http2_available() -> bool:
+    # httpx only speaks HTTP/2 when the optional `h2` package is installed
+    return importlib.util.find_spec("h2") is not None
+
+
+def create_http_client() -> httpx.AsyncClient:
+    """
+    Create the pooled async client used for all outbound website fetches.
+    """
+    return httpx.AsyncClient(
+        http2=_http2_available(),
+        follow_redirects=True,
+        timeout=httpx.Timeout(settings.HTTP_TIMEOUT),
+        limits=httpx.Limits(
+            max_connections=settings.HTTP_MAX_CONNECTIONS,
+            max_keepalive_connections=settings.HTTP_MAX_KEEPALIVE_CONNECTIONS,
+            keepalive_expiry=settings.HTTP_KEEPALIVE_EXPIRY,
+        ),
+        headers={"User-Agent": settings.HTTP_USER_AGENT},
+    )
+
+
+def get_http_client() -> httpx.AsyncClient:
+    """
+    Return the process-wide client, creating it lazily outside the app lifespan
+    (scripts, tests).
+    """
+    global _client
+    if _client is None or _client.is_closed:
+        _client = create_http_client()
+    return _client
+
+
+async def close_http_client() -> None:
+    global _client
+    if _client is not None:
+        await _client.aclose()
+        _client = None
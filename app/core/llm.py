@@ -0,0 +1,23 @@
+from openai import AsyncOpenAI
+
+from app.core.config import settings
+
+_client: AsyncOpenAI | None = None
+
+
+def get_openai_client() -> AsyncOpenAI:
+    """
+    Return the process-wide AsyncOpenAI client, shared by every service so all
+    completions and streams are multiplexed over one connection pool.
+    """
+    global _client
+    if _client is None or _client.is_closed():
+        _client = AsyncOpenAI(api_key=settings.OPENAI_API_KEY)
+    return _client
+
+
+async def close_openai_client() -> None:
+    global _client
+    if _client is not None:
+        await _client.close()
+        _client = None
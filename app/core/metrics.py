@@ -0,0 +1,98 @@
+import asyncio
+import logging
+import threading
+from collections import defaultdict
+
+from app.core.cache import cache_connection
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+# Increments not yet written to the cache database, per process
+_pending: defaultdict[str, float] = defaultdict(float)
+_pending_lock = threading.Lock()
+_initialized: set[str] = set()
+
+
+def _ensure_table(conn) -> None:
+    if settings.CACHE_DB in _initialized:
+        return
+    conn.execute(
+        """
+        CREATE TABLE IF NOT EXISTS metric_counter (
+            name TEXT PRIMARY KEY,
+            value REAL NOT NULL
+        )
+        """
+    )
+    _initialized.add(settings.CACHE_DB)
+
+
+def incr(name: str, amount: float = 1) -> None:
+    """
+    Increment a named counter. Increments are buffered in memory and written
+    to the shared cache database by flush(), so counters aggregate across all
+    workers without a database write per call.
+    """
+    with _pending_lock:
+        _pending[name] += amount
+
+
+def flush() -> None:
+    """Add the buffered increments to the shared counters in one transaction."""
+    with _pending_lock:
+        pending = list(_pending.items())
+        _pending.clear()
+    if not pending:
+        return
+    try:
+        with cache_connection() as conn:
+            _ensure_table(conn)
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                conn.executemany(
+                    """
+                    INSERT INTO metric_counter (name, value) VALUES (?, ?)
+                    ON CONFLICT(name) DO UPDATE SET value = value + excluded.value
+                    """,
+                    pending,
+                )
+                conn.execute("COMMIT")
+            except BaseException:
+                conn.execute("ROLLBACK")
+                raise
+    except Exception:
+        # Keep the increments for the next flush rather than losing them
+        with _pending_lock:
+            for name, amount in pending:
+                _pending[name] += amount
+        raise
+
+
+async def flush_periodically() -> None:
+    """Flush every METRICS_FLUSH_INTERVAL seconds, off the event loop."""
+    while True:
+        await asyncio.sleep(settings.METRICS_FLUSH_INTERVAL)
+        try:
+            await asyncio.to_thread(flush)
+        except Exception as e:
+            logger.warning(f"Could not flush metrics: {e}")
+
+
+def get_counters() -> dict[str, float]:
+    """Counters of all workers, including this process's unflushed increments."""
+    flush()
+    with cache_connection() as conn:
+        _ensure_table(conn)
+        rows = conn.execute(
+            "SELECT name, value FROM metric_counter ORDER BY name"
+        ).fetchall()
+    return {name: value for name, value in rows}
+
+
+def reset_counters() -> None:
+    with _pending_lock:
+        _pending.clear()
+    with cache_connection() as conn:
+        _ensure_table(conn)
+        conn.execute("DELETE FROM metric_counter")
@@ -80,17 +80,19 @@ def create_streaming_brochure(
     return db_obj
 
 
-def update_brochure_content(
+def update_brochure(
     *,
     session: Session,
-    brochure_id: uuid.UUID,
-    content: str,
+    brochure: Brochure,
+    status: str,
+    content: Optional[str] = None,
+    error_message: Optional[str] = None,
 ) -> Brochure:
-    """Update the content of an existing brochure"""
-    brochure = get_brochure_by_id(session=session, brochure_id=brochure_id)
-    if not brochure:
-        raise ValueError("Brochure not found")
-    brochure.content = content
+    """Move a brochure to a new status, saving its content if given"""
+    brochure.status = status
+    if content is not None:
+        brochure.content = content
+    brochure.error_message = error_message
     session.add(brochure)
     session.commit()
     session.refresh(brochure)
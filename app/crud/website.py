@@ -1,8 +1,10 @@
 # app/crud/website.py
 import uuid
+from datetime import datetime
 from sqlmodel import Session, select
 
-from app.models.website import WebsiteSummary
+from app.models.website import WebsiteSectionIndex, WebsiteSummary
+from app.services.urls import canonicalize_url
 
 
 # Existing Website Summary CRUD operations
@@ -56,3 +58,31 @@ def get_public_summary_by_id(
         .where(WebsiteSummary.id == summary_id)
         .where(WebsiteSummary.owner_id.is_(None))
     ).first()
+
+
+def get_indexed_summary(*, session: Session, url: str) -> tuple[str, list[str]] | None:
+    """
+    The latest summary text of url together with its page's section hashes.
+    URLs are indexed in canonical form, so spelling variants share an entry.
+    """
+    index = session.get(WebsiteSectionIndex, canonicalize_url(url))
+    if index is None:
+        return None
+    summary = session.get(WebsiteSummary, index.summary_id)
+    if summary is None or not summary.summary:
+        return None
+    return summary.summary, index.section_hashes
+
+
+def save_section_index(
+    *, session: Session, url: str, summary_id: uuid.UUID, section_hashes: list[str]
+) -> WebsiteSectionIndex:
+    url = canonicalize_url(url)
+    index = session.get(WebsiteSectionIndex, url) or WebsiteSectionIndex(url=url)
+    index.summary_id = summary_id
+    index.section_hashes = section_hashes
+    index.updated_at = datetime.utcnow()
+    session.add(index)
+    session.commit()
+    session.refresh(index)
+    return index
@@ -5,9 +5,14 @@ from fastapi import FastAPI
 from fastapi.routing import APIRoute
 from fastapi.middleware.cors import CORSMiddleware
 from app.api.main import api_router
+from app.core import metrics
 from app.core.config import settings
 from app.core.db import init_db
 from app.core.db import engine
+from app.core.executor import shutdown_parse_executor
+from app.core.http import close_http_client, get_http_client
+from app.core.llm import close_openai_client
+import asyncio
 import os
 
 
@@ -22,11 +27,18 @@ async def lifespan(app: FastAPI):
     print("CORS Origins:", settings.all_cors_origins)  # Debug print
     with Session(engine) as session:
         init_db(session)
+    # Open the shared outbound HTTP pool for website fetching
+    get_http_client()
+    metrics_flusher = asyncio.create_task(metrics.flush_periodically())
 
     yield  # This is where the application runs
 
-    # Cleanup logic (if any) goes here
-    # For example: close database connections, cleanup resources, etc.
+    # Cleanup logic
+    metrics_flusher.cancel()
+    await asyncio.to_thread(metrics.flush)
+    await close_http_client()
+    await close_openai_client()
+    shutdown_parse_executor()
 
 
 # Initialize Sentry if configured
@@ -1,6 +1,6 @@
 # app/models/__init__.py
 from .base import BaseModel, TimestampModel
-from .common import Message
+from .common import GenerationMode, Message
 from .user import (
     User,
     UserBase,
@@ -12,6 +12,7 @@ from .user import (
     UserRegister,
 )
 from .website import (
+    WebsiteSectionIndex,
     WebsiteSummary,
     WebsiteSummaryBase,
     WebsiteSummaryCreate,
@@ -31,6 +32,7 @@ __all__ = [
     "BaseModel",
     "TimestampModel",
     # Common models
+    "GenerationMode",
     "Message",
     # User models
     "User",
@@ -42,6 +44,7 @@ __all__ = [
     "UsersPublic",
     "UserRegister",
     # Website models
+    "WebsiteSectionIndex",
     "WebsiteSummary",
     "WebsiteSummaryBase",
     "WebsiteSummaryCreate",
@@ -4,6 +4,7 @@ from typing import Optional, TYPE_CHECKING
 from sqlmodel import Field, Relationship, SQLModel
 import uuid
 from .base import TimestampModel
+from .common import GenerationMode
 from enum import Enum
 
 if TYPE_CHECKING:
@@ -45,6 +46,7 @@ class Brochure(TimestampModel, table=True):
 class BrochureCreate(SQLModel):
     url: str = Field(max_length=2048)
     company_name: str = Field(max_length=255)
+    mode: GenerationMode = GenerationMode.FULL
 
 
 class BrochurePublic(BrochureBase):
@@ -1,6 +1,15 @@
 # app/models/common.py
+from enum import Enum
+
 from sqlmodel import SQLModel
 
 
 class Message(SQLModel):
     message: str
+
+
+class GenerationMode(str, Enum):
+    # Landing page, sub-pages and the main model
+    FULL = "full"
+    # Landing page only: its metadata or a capped prompt to the quick model
+    QUICK = "quick"
@@ -1,9 +1,10 @@
 # app/models/website.py
 from datetime import datetime
 from typing import Optional, List
-from sqlmodel import Field, Relationship, SQLModel
+from sqlmodel import JSON, Column, Field, Relationship, SQLModel
 import uuid
 from .base import TimestampModel
+from .common import GenerationMode
 from .user import User
 
 
@@ -24,8 +25,18 @@ class WebsiteSummary(TimestampModel, table=True):
     )
 
 
+class WebsiteSectionIndex(SQLModel, table=True):
+    """Section content hashes of a URL as of its latest summary."""
+
+    url: str = Field(max_length=2048, primary_key=True)
+    summary_id: uuid.UUID
+    section_hashes: List[str] = Field(default_factory=list, sa_column=Column(JSON))
+    updated_at: datetime = Field(default_factory=datetime.utcnow)
+
+
 class WebsiteSummaryCreate(SQLModel):
     url: str = Field(max_length=2048)
+    mode: GenerationMode = GenerationMode.FULL
 
 
 class WebsiteSummaryPublic(WebsiteSummaryBase):
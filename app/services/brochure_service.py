@@ -1,12 +1,33 @@
 # app/services/brochure_service.py
-from typing import List, Dict, AsyncGenerator
+from typing import List, Dict, AsyncGenerator, Awaitable
 import asyncio
-import requests
 import json
-from bs4 import BeautifulSoup
+import logging
+from urllib.parse import urlsplit
 from fastapi import HTTPException
-from openai import OpenAI
+from app.core import metrics
 from app.core.config import settings
+from app.services.budget import (
+    allocate_budget,
+    count_tokens,
+    link_type_weight,
+)
+from app.services.completions import complete, stage_model, stream_completion
+from app.services.compress import compress_to_tokens
+from app.services.dedup import dedupe_lines, minhash_sketch, sketch_similarity
+from app.services.discovery import SiteIndex, discover_site
+from app.services.link_classifier import classify_links, link_relevance
+from app.services.links import normalize_link, prefilter_links
+from app.services.quick import quick_context
+from app.services.urls import canonicalize_url
+from app.services.fetcher import fetch_page
+
+logger = logging.getLogger(__name__)
+
+
+def _append_line(path: str, line: str) -> None:
+    with open(path, "a", encoding="utf-8") as f:
+        f.write(line + "\n")
 
 
 class Website:
@@ -17,44 +38,48 @@ class Website:
         self.title: str = ""
         self.text: str = ""
         self.links: List[str] = []
-        self._fetch_content()
+        self.link_texts: List[str] = []
+        self.fingerprint: List[int] = []
+        self.metadata: Dict[str, str] = {}
 
-    def _fetch_content(self) -> None:
+    @classmethod
+    async def fetch(cls, url: str) -> "Website":
+        """Create a Website and fetch its content."""
+        website = cls(url)
+        await website._fetch_content()
+        return website
+
+    async def _fetch_content(self) -> None:
         """Fetch and parse website content."""
         try:
-            response = requests.get(self.url, timeout=10)
-            response.raise_for_status()
-            soup = BeautifulSoup(response.content, "html.parser")
-
-            # Extract title
-            self.title = soup.title.string if soup.title else "No title found"
-
-            # Clean and extract text
-            if soup.body:
-                for tag in soup.body(["script", "style", "img", "input"]):
-                    tag.decompose()
-                self.text = soup.body.get_text(separator="\n", strip=True)
-
-            # Extract links
-            self.links = [
-                link.get("href") for link in soup.find_all("a") if link.get("href")
-            ]
+            page = await fetch_page(self.url)
+            self.title = page.title
+            self.text = page.text
+            self.links = page.links
+            self.link_texts = page.link_texts
+            self.metadata = page.metadata
+            # Pages cached before fingerprints existed are sketched here
+            self.fingerprint = page.fingerprint or minhash_sketch(page.text)
 
         except Exception as e:
             raise HTTPException(
                 status_code=400, detail=f"Failed to fetch website content: {str(e)}"
             )
 
-    def get_contents(self) -> str:
-        """Get formatted website contents."""
-        return f"Webpage Title:\n{self.title}\nWebpage Contents:\n{self.text}\n\n"
+    def get_contents(self, max_tokens: int | None = None) -> str:
+        """Get formatted website contents, optionally truncated to max_tokens."""
+        text = self.text
+        if max_tokens is not None:
+            text = compress_to_tokens(text, max_tokens, stage_model("brochure"))
+        return f"Webpage Title:\n{self.title}\nWebpage Contents:\n{text}\n\n"
 
 
 class BrochureService:
     """Service to generate company brochures."""
 
     def __init__(self):
-        self.openai_client = OpenAI(api_key=settings.OPENAI_API_KEY)
+        # Background LLM link selections of LINK_SELECTION_SHADOW
+        self._shadow_tasks: set[asyncio.Task] = set()
         self.link_system_prompt = """
             You are provided with a list of links found on a webpage.
             You are able to decide which of the links would be most relevant to include in a brochure about the company,
@@ -73,8 +98,125 @@ class BrochureService:
             Respond in markdown. Include details of company culture, customers and careers/jobs if you have the information.
         """
 
-    def _get_relevant_links(self, website: Website) -> Dict:
-        """Get relevant links from website."""
+    def _candidate_links(self, website: Website, site: SiteIndex) -> List[str]:
+        """
+        Landing page links plus the site's sitemap index: resolved,
+        canonicalized, deduplicated, without irrelevant or robots-disallowed
+        URLs, and capped at LINK_CANDIDATES_MAX. Over the cap, the links that
+        look most like brochure pages (then the shallowest) are kept, so a
+        long navigation list cannot crowd out the sitemap's /about.
+        """
+        raw = website.links + site.urls
+        landing = canonicalize_url(website.url)
+        candidates = []
+        for link in prefilter_links(website.url, raw):
+            if link == landing:
+                continue
+            if not site.allows(link):
+                metrics.incr("discovery.disallowed")
+                continue
+            candidates.append(link)
+        if len(candidates) > settings.LINK_CANDIDATES_MAX:
+            candidates = self._top_candidates(website, candidates)
+
+        # Savings against the old prompt, which listed the landing page's links
+        model = stage_model("link_selection")
+        saved_links = len(website.links) - len(candidates)
+        saved_tokens = count_tokens("\n".join(website.links), model) - count_tokens(
+            "\n".join(candidates), model
+        )
+        metrics.incr("links.prefilter_saved", max(saved_links, 0))
+        metrics.incr("links.prefilter_tokens_saved", max(saved_tokens, 0))
+        logger.info(
+            f"Link prefilter for {website.url}: {len(website.links)} landing links "
+            f"+ {len(site.urls)} sitemap URLs -> {len(candidates)} candidates, "
+            f"~{saved_tokens} prompt tokens saved"
+        )
+        return candidates
+
+    def _top_candidates(self, website: Website, candidates: List[str]) -> List[str]:
+        """The LINK_CANDIDATES_MAX most relevant candidates, in original order."""
+        link_texts = self._link_texts(website)
+        ranked = sorted(
+            range(len(candidates)),
+            key=lambda i: (
+                -link_relevance(candidates[i], link_texts.get(candidates[i], "")),
+                urlsplit(candidates[i]).path.rstrip("/").count("/"),
+                i,
+            ),
+        )
+        return [candidates[i] for i in sorted(ranked[: settings.LINK_CANDIDATES_MAX])]
+
+    def _link_texts(self, website: Website) -> Dict[str, str]:
+        """Visible link text by normalized URL (the first non-empty one wins)."""
+        texts: Dict[str, str] = {}
+        for href, text in zip(website.links, website.link_texts):
+            url = normalize_link(website.url, href)
+            if url and text and url not in texts:
+                texts[url] = text
+        return texts
+
+    async def _record_selection(
+        self, website: Website, links: List[str], link_texts: Dict, selection: Dict
+    ) -> None:
+        """Append an LLM link choice to LINK_SELECTION_RECORD_PATH for evaluation."""
+        if not settings.LINK_SELECTION_RECORD_PATH:
+            return
+        case = {
+            "url": website.url,
+            "candidates": links,
+            "link_texts": link_texts,
+            "selection": selection,
+        }
+        try:
+            await asyncio.to_thread(
+                _append_line,
+                settings.LINK_SELECTION_RECORD_PATH,
+                json.dumps(case, ensure_ascii=False),
+            )
+        except OSError as e:
+            logger.warning(f"Could not record link selection: {e}")
+
+    def _shadow_selection(
+        self, website: Website, links: List[str], link_texts: Dict
+    ) -> None:
+        """In the background, record the LLM's choice for a classifier-answered case."""
+
+        async def shadow() -> None:
+            try:
+                selection = await self._select_links_with_llm(website, links)
+            except HTTPException as e:
+                logger.warning(f"Shadow link selection failed: {e.detail}")
+                return
+            await self._record_selection(website, links, link_texts, selection)
+
+        task = asyncio.create_task(shadow())
+        self._shadow_tasks.add(task)
+        task.add_done_callback(self._shadow_tasks.discard)
+
+    async def _get_relevant_links(self, website: Website, links: List[str]) -> Dict:
+        """
+        Get relevant links from the candidate links of a website, using the
+        local classifier when it is confident and the LLM otherwise.
+        """
+        link_texts = self._link_texts(website)
+        if settings.LINK_CLASSIFIER_ENABLED:
+            classification = classify_links(links, link_texts)
+            if classification.confidence >= settings.LINK_CLASSIFIER_MIN_CONFIDENCE:
+                metrics.incr("links.classifier_hit")
+                if (
+                    settings.LINK_SELECTION_SHADOW
+                    and settings.LINK_SELECTION_RECORD_PATH
+                ):
+                    self._shadow_selection(website, links, link_texts)
+                return classification.as_selection()
+            metrics.incr("links.classifier_fallback")
+        selection = await self._select_links_with_llm(website, links)
+        await self._record_selection(website, links, link_texts, selection)
+        return selection
+
+    async def _select_links_with_llm(self, website: Website, links: List[str]) -> Dict:
+        """Ask the LLM which candidate links belong in the brochure."""
         try:
             user_prompt = (
                 f"Here is the list of links on the website of {website.url} - "
@@ -82,87 +224,209 @@ class BrochureService:
             user_prompt += """please decide which of these are relevant web links for a brochure about the company,
                           respond with the full https URL in JSON format.
                           Do not include Terms of Service, Privacy, email links.\n"""
-            user_prompt += "\n".join(website.links)
-
-            response = self.openai_client.chat.completions.create(
-                model=settings.OPENAI_MODEL,
-                messages=[
-                    {"role": "system", "content": self.link_system_prompt},
-                    {"role": "user", "content": user_prompt},
-                ],
+            user_prompt += "\n".join(links)
+
+            content = await complete(
+                model=stage_model("link_selection"),
+                system_prompt=self.link_system_prompt,
+                user_prompt=user_prompt,
                 response_format={"type": "json_object"},
+                stage="link_selection",
             )
-            return json.loads(response.choices[0].message.content)
+            return json.loads(content)
         except Exception as e:
             raise HTTPException(
                 status_code=500, detail=f"Failed to analyze website links: {str(e)}"
             )
 
-    def _get_all_details(self, url: str) -> str:
-        """Gather all relevant website details."""
-        result = "Landing page:\n"
-        website = Website(url)
-        result += website.get_contents()
+    async def _get_all_details(self, url: str) -> str:
+        """Gather all relevant website details within the prompt token budget."""
+        model = stage_model("brochure")
+        budget = settings.BROCHURE_PROMPT_TOKEN_BUDGET
+        website, site = await asyncio.gather(Website.fetch(url), discover_site(url))
 
-        links = self._get_relevant_links(website)
-        for link in links["links"]:
-            result += f"\n\n{link['type']}\n"
-            link_website = Website(link["url"])
-            result += link_website.get_contents()
+        candidates = self._candidate_links(website, site)
+        semaphore = asyncio.Semaphore(settings.BROCHURE_FETCH_CONCURRENCY)
 
-        return result[:20_000]  # Truncate if more than 20,000 characters
+        async def fetch_link(link_url: str) -> Website | None:
+            async with semaphore:
+                try:
+                    return await Website.fetch(link_url)
+                except HTTPException as e:
+                    # A broken or non-HTML sub-page shouldn't sink the brochure
+                    logger.warning(f"Skipping {link_url}: {e.detail}")
+                    return None
 
-    async def generate_brochure(self, company_name: str, url: str) -> str:
-        """Generate a company brochure."""
+        # Start fetching the pages the local classifier finds most likely while
+        # the link selection is still in flight
+        likely = classify_links(candidates, self._link_texts(website)).links
+        prefetched = {
+            link["url"]: asyncio.create_task(fetch_link(link["url"]))
+            for link in likely[: settings.BROCHURE_PREFETCH_MAX]
+        }
         try:
-            user_prompt = f"You are looking at a company called: {company_name}\n"
+            links = (await self._get_relevant_links(website, candidates))["links"]
+            # The model may answer with URLs that were never candidates
+            links = [link for link in links if site.allows(link["url"])]
+            # Don't fetch pages the budget could not give a useful share anyway
+            max_links = max(budget // settings.PROMPT_MIN_PAGE_TOKENS - 1, 0)
+            links = links[:max_links]
+
+            def fetch_selected(link: Dict) -> Awaitable[Website | None]:
+                key = normalize_link(website.url, link["url"]) or link["url"]
+                if task := prefetched.pop(key, None):
+                    metrics.incr("brochure.prefetch_used")
+                    return task
+                return fetch_link(link["url"])
+
+            # gather preserves input order, so the prompt stays deterministic
+            fetched = await asyncio.gather(*(fetch_selected(link) for link in links))
+        finally:
+            # Prefetched pages the selection did not pick are dropped
+            for task in prefetched.values():
+                task.cancel()
+            metrics.incr("brochure.prefetch_wasted", len(prefetched))
+            await asyncio.gather(*prefetched.values(), return_exceptions=True)
+        kept = [(link, page) for link, page in zip(links, fetched) if page]
+        # Deduplicating and compressing the pages is CPU work
+        return await asyncio.to_thread(
+            self._assemble_details, url, website, kept, budget, model
+        )
+
+    def _assemble_details(
+        self,
+        url: str,
+        website: Website,
+        selected: List[tuple[Dict, Website]],
+        budget: int,
+        model: str,
+    ) -> str:
+        """The landing page and selected sub-pages, fitted into budget tokens."""
+        kept = self._drop_near_duplicates(website, selected)
+        links = [link for link, _ in kept]
+        link_websites = [page for _, page in kept]
+
+        labels = ["Landing page:\n"] + [f"\n\n{link['type']}\n" for link in links]
+        pages = [website, *link_websites]
+        self._dedupe_pages(url, pages)
+        overhead = sum(
+            count_tokens(label + page.get_contents(max_tokens=0), model)
+            for label, page in zip(labels, pages)
+        )
+        allocation = allocate_budget(
+            needs=[count_tokens(page.text, model, limit=budget) for page in pages],
+            weights=[link_type_weight("landing")]
+            + [link_type_weight(link.get("type", "")) for link in links],
+            budget=max(budget - overhead, 0),
+        )
+        return "".join(
+            label + page.get_contents(max_tokens=max_tokens)
+            for label, page, max_tokens in zip(labels, pages, allocation)
+        )
+
+    def _drop_near_duplicates(
+        self, website: Website, pages: List[tuple[Dict, Website]]
+    ) -> List[tuple[Dict, Website]]:
+        """
+        Drop sub-pages whose text is nearly the same as the landing page or an
+        earlier sub-page (/about vs /about-us, localized or ?ref= copies).
+        """
+        kept: List[tuple[Dict, Website]] = []
+        seen = [website.fingerprint]
+        for link, page in pages:
+            if any(
+                sketch_similarity(page.fingerprint, other)
+                >= settings.NEAR_DUPLICATE_THRESHOLD
+                for other in seen
+            ):
+                metrics.incr("brochure.near_duplicates_dropped")
+                logger.info(f"Dropping {page.url}: near-duplicate of an earlier page")
+                continue
+            seen.append(page.fingerprint)
+            kept.append((link, page))
+        return kept
+
+    def _dedupe_pages(self, url: str, pages: List[Website]) -> None:
+        """Remove lines repeated across pages so each appears once in the prompt."""
+        texts, stats = dedupe_lines([page.text for page in pages])
+        for page, text in zip(pages, texts):
+            page.text = text
+        metrics.incr("prompt.dedup_lines_removed", stats.removed_lines)
+        metrics.incr("prompt.dedup_chars_removed", stats.removed_chars)
+        logger.info(
+            f"Prompt dedup for {url}: {stats.removed_lines}/{stats.lines} "
+            f"repeated lines ({stats.removed_chars} chars) removed"
+        )
+
+    async def _get_landing_details(self, url: str) -> str:
+        """The landing page alone, metadata first, within QUICK_PROMPT_TOKEN_BUDGET."""
+        website = await Website.fetch(url)
+        return "Landing page:\n" + await asyncio.to_thread(
+            quick_context,
+            website.title,
+            website.text,
+            website.metadata,
+            settings.QUICK_PROMPT_TOKEN_BUDGET,
+            stage_model("quick"),
+        )
+
+    def _stage(self, mode: str) -> str:
+        return "quick" if mode == "quick" else "brochure"
+
+    async def _get_brochure_user_prompt(
+        self, company_name: str, url: str, mode: str = "full"
+    ) -> str:
+        user_prompt = f"You are looking at a company called: {company_name}\n"
+        if mode == "quick":
+            user_prompt += "Here are the contents of its landing page; "
+        else:
             user_prompt += (
                 "Here are the contents of its landing page and other relevant pages; "
             )
-            user_prompt += "use this information to build a short brochure of the company in markdown.\n"
-            user_prompt += self._get_all_details(url)
-
-            response = self.openai_client.chat.completions.create(
-                model=settings.OPENAI_MODEL,
-                messages=[
-                    {"role": "system", "content": self.brochure_system_prompt},
-                    {"role": "user", "content": user_prompt},
-                ],
+        user_prompt += "use this information to build a short brochure of the company in markdown.\n"
+        if mode == "quick":
+            user_prompt += await self._get_landing_details(url)
+        else:
+            user_prompt += await self._get_all_details(url)
+        return user_prompt
+
+    async def generate_brochure(
+        self, company_name: str, url: str, mode: str = "full"
+    ) -> str:
+        """
+        Generate a company brochure. mode="quick" uses the landing page only
+        and the quick model.
+        """
+        try:
+            user_prompt = await self._get_brochure_user_prompt(company_name, url, mode)
+            return await complete(
+                model=stage_model(self._stage(mode)),
+                system_prompt=self.brochure_system_prompt,
+                user_prompt=user_prompt,
+                stage=self._stage(mode),
             )
-            return response.choices[0].message.content
         except Exception as e:
             raise HTTPException(
                 status_code=500, detail=f"Failed to generate brochure: {str(e)}"
             )
 
     async def stream_brochure(
-        self, company_name: str, url: str
+        self, company_name: str, url: str, mode: str = "full"
     ) -> AsyncGenerator[str, None]:
         """Generate a company brochure with streaming response."""
         try:
-            user_prompt = f"You are looking at a company called: {company_name}\n"
-            user_prompt += (
-                "Here are the contents of its landing page and other relevant pages; "
-            )
-            user_prompt += "use this information to build a short brochure of the company in markdown.\n"
-            user_prompt += self._get_all_details(url)
-
-            stream = self.openai_client.chat.completions.create(
-                model=settings.OPENAI_MODEL,
-                messages=[
-                    {"role": "system", "content": self.brochure_system_prompt},
-                    {"role": "user", "content": user_prompt},
-                ],
-                stream=True,
-            )
-
-            for chunk in stream:
-                if content := chunk.choices[0].delta.content:
-                    # Remove this line in production
-                    # await asyncio.sleep(
-                    #     0.05
-                    # )  # Optional: control streaming pace, this is purely for demo purposes to show streaming on frontend
-                    yield content
+            user_prompt = await self._get_brochure_user_prompt(company_name, url, mode)
+            async for content in stream_completion(
+                model=stage_model(self._stage(mode)),
+                system_prompt=self.brochure_system_prompt,
+                user_prompt=user_prompt,
+                stage=self._stage(mode),
+            ):
+                # Remove this line in production
+                # await asyncio.sleep(
+                #     0.05
+                # )  # Optional: control streaming pace, this is purely for demo purposes to show streaming on frontend
+                yield content
 
         except Exception as e:
             raise HTTPException(
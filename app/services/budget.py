@@ -0,0 +1,137 @@
+import logging
+import math
+from functools import lru_cache
+
+import tiktoken
+
+logger = logging.getLogger(__name__)
+
+# Rough average for English prose when the tokenizer cannot be loaded
+CHARS_PER_TOKEN = 4
+# A token always spans at least one character and rarely more than ~10, so this
+# bounds how much of a huge page ever has to be tokenized
+_MAX_CHARS_PER_TOKEN = 10
+
+# Relative share of the prompt budget for each kind of page
+LINK_TYPE_WEIGHTS = {
+    "landing": 2.0,
+    "about": 1.5,
+    "company": 1.5,
+    "careers": 1.0,
+    "jobs": 1.0,
+}
+DEFAULT_LINK_WEIGHT = 0.75
+
+
+@lru_cache
+def _encoding(model: str) -> tiktoken.Encoding | None:
+    """The tokenizer for model, or None when its encoding cannot be loaded."""
+    try:
+        try:
+            return tiktoken.encoding_for_model(model)
+        except KeyError:
+            return tiktoken.get_encoding("o200k_base")
+    except Exception as e:
+        # Encoding files are downloaded on first use unless they are cached in
+        # TIKTOKEN_CACHE_DIR (the Docker image ships them there)
+        logger.warning(
+            f"No tiktoken encoding for {model} ({e}); "
+            f"estimating {CHARS_PER_TOKEN} characters per token"
+        )
+        return None
+
+
+def count_tokens(text: str, model: str, limit: int | None = None) -> int:
+    """
+    Count the tokens of text for model. With a limit, counting stops early and
+    the result is capped at limit.
+    """
+    if limit is not None:
+        text = text[: limit * _MAX_CHARS_PER_TOKEN]
+    encoding = _encoding(model)
+    if encoding is None:
+        count = math.ceil(len(text) / CHARS_PER_TOKEN)
+    else:
+        count = len(encoding.encode_ordinary(text))
+    return count if limit is None else min(count, limit)
+
+
+def min_tokens(text: str, model: str) -> int:
+    """A lower bound on count_tokens(text, model) that is cheap to compute."""
+    if _encoding(model) is None:
+        return count_tokens(text, model)
+    # Tokenizers split at whitespace before merging, so every word is a token
+    return len(text.split())
+
+
+def truncate_to_tokens(text: str, max_tokens: int, model: str) -> str:
+    """Return the longest prefix of text that fits in max_tokens."""
+    if max_tokens <= 0:
+        return ""
+    encoding = _encoding(model)
+    if encoding is None:
+        return text[: max_tokens * CHARS_PER_TOKEN]
+    tokens = encoding.encode_ordinary(text[: max_tokens * _MAX_CHARS_PER_TOKEN])
+    if len(tokens) <= max_tokens and len(text) <= max_tokens * _MAX_CHARS_PER_TOKEN:
+        return text
+    return encoding.decode(tokens[:max_tokens])
+
+
+def link_type_weight(link_type: str) -> float:
+    link_type = link_type.lower()
+    for keyword, weight in LINK_TYPE_WEIGHTS.items():
+        if keyword in link_type:
+            return weight
+    return DEFAULT_LINK_WEIGHT
+
+
+def allocate_budget(needs: list[int], weights: list[float], budget: int) -> list[int]:
+    """
+    Split a token budget across pages in proportion to their weights. Pages
+    that need less than their share keep only what they need, and the surplus
+    is redistributed to the others (water-filling).
+    """
+    allocation = [0] * len(needs)
+    remaining = set(range(len(needs)))
+    while remaining and budget > 0:
+        total_weight = sum(weights[i] for i in remaining)
+        shares = {i: budget * weights[i] / total_weight for i in remaining}
+        satisfied = {i for i in remaining if needs[i] <= shares[i]}
+        if not satisfied:
+            for i in remaining:
+                allocation[i] = int(shares[i])
+            break
+        for i in satisfied:
+            allocation[i] = needs[i]
+            budget -= needs[i]
+        remaining -= satisfied
+    return allocation
+
+
+def split_into_chunks(text: str, max_tokens: int, model: str) -> list[str]:
+    """
+    Split text at line boundaries into chunks of at most max_tokens each.
+    Lines too long for one chunk are split mid-line.
+    """
+    chunks: list[str] = []
+    current: list[str] = []
+    used = 0
+    for line in text.splitlines():
+        tokens = count_tokens(line, model) + 1  # Newline
+        while tokens > max_tokens and line:
+            head = truncate_to_tokens(line, max_tokens - 1, model) or line[:1]
+            chunks.extend(["\n".join(current)] if current else [])
+            chunks.append(head)
+            current, used = [], 0
+            line = line[len(head) :]
+            tokens = count_tokens(line, model) + 1
+        if not line:
+            continue
+        if current and used + tokens > max_tokens:
+            chunks.append("\n".join(current))
+            current, used = [], 0
+        current.append(line)
+        used += tokens
+    if current:
+        chunks.append("\n".join(current))
+    return chunks
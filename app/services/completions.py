@@ -0,0 +1,203 @@
+import hashlib
+import json
+import logging
+import time
+from dataclasses import dataclass
+from typing import AsyncGenerator
+
+from app.core import metrics
+from app.core.cache import SQLiteCache
+from app.core.config import settings
+from app.core.llm import get_openai_client
+
+logger = logging.getLogger(__name__)
+
+completion_cache = SQLiteCache(
+    "completion_cache",
+    ttl_seconds=settings.COMPLETION_CACHE_TTL_SECONDS,
+    max_entries=settings.COMPLETION_CACHE_MAX_ENTRIES,
+)
+
+
+# Pipeline stages with their own <STAGE>_MODEL, <STAGE>_MAX_TOKENS and
+# <STAGE>_TIMEOUT settings
+STAGES = ("link_selection", "brochure", "summary", "summary_reduce", "quick")
+
+
+@dataclass(frozen=True)
+class StageConfig:
+    model: str
+    # Completion (output) token cap and request timeout in seconds; None
+    # leaves the provider/client default
+    max_tokens: int | None = None
+    timeout: float | None = None
+
+
+def stage_config(stage: str | None) -> StageConfig:
+    """Model, max tokens and timeout for a pipeline stage (None: defaults)."""
+    if stage is None:
+        return StageConfig(model=settings.OPENAI_MODEL)
+    if stage not in STAGES:
+        raise ValueError(f"Unknown completion stage {stage!r}; expected {STAGES}")
+    prefix = stage.upper()
+    return StageConfig(
+        model=getattr(settings, f"{prefix}_MODEL") or settings.OPENAI_MODEL,
+        max_tokens=getattr(settings, f"{prefix}_MAX_TOKENS"),
+        timeout=getattr(settings, f"{prefix}_TIMEOUT"),
+    )
+
+
+def stage_model(stage: str | None) -> str:
+    return stage_config(stage).model
+
+
+def completion_key(
+    model: str,
+    system_prompt: str,
+    user_prompt: str,
+    response_format: dict | None = None,
+    max_tokens: int | None = None,
+) -> str:
+    """Hash of everything that determines a completion's output."""
+    payload = json.dumps(
+        [model, system_prompt, user_prompt, response_format, max_tokens],
+        sort_keys=True,
+    )
+    return hashlib.sha256(payload.encode()).hexdigest()
+
+
+async def _get_cached(key: str) -> str | None:
+    if not settings.COMPLETION_CACHE_ENABLED:
+        return None
+    content = await completion_cache.get_async(key)
+    metrics.incr(
+        "completion_cache.hit" if content is not None else "completion_cache.miss"
+    )
+    return content
+
+
+async def _store(key: str, content: str) -> None:
+    if settings.COMPLETION_CACHE_ENABLED:
+        await completion_cache.set_async(key, content)
+
+
+def _request_kwargs(config: StageConfig) -> dict:
+    kwargs: dict = {}
+    if config.max_tokens is not None:
+        kwargs["max_tokens"] = config.max_tokens
+    if config.timeout is not None:
+        kwargs["timeout"] = config.timeout
+    return kwargs
+
+
+def _record_call(
+    stage: str | None, model: str, started: float, usage, cached: bool = False
+) -> None:
+    """
+    Count a completion under llm.<stage>.*: calls, seconds (sum of latencies),
+    cached replays and, for live calls, prompt/completion tokens.
+    """
+    name = f"llm.{stage or 'other'}"
+    seconds = time.perf_counter() - started
+    metrics.incr(f"{name}.calls")
+    metrics.incr(f"{name}.seconds", seconds)
+    if cached:
+        metrics.incr(f"{name}.cached")
+        return
+    prompt_tokens = getattr(usage, "prompt_tokens", 0) or 0
+    completion_tokens = getattr(usage, "completion_tokens", 0) or 0
+    metrics.incr(f"{name}.prompt_tokens", prompt_tokens)
+    metrics.incr(f"{name}.completion_tokens", completion_tokens)
+    logger.info(
+        f"Completion for {stage or 'other'} stage with {model}: {seconds:.2f}s, "
+        f"{prompt_tokens} prompt + {completion_tokens} completion tokens"
+    )
+
+
+async def complete(
+    *,
+    model: str,
+    system_prompt: str,
+    user_prompt: str,
+    response_format: dict | None = None,
+    stage: str | None = None,
+) -> str:
+    """
+    Run a chat completion, served from the completion cache when possible.
+    stage (one of STAGES) sets the max tokens and timeout of the request and
+    the name its latency and token metrics are recorded under.
+    """
+    config = stage_config(stage)
+    started = time.perf_counter()
+    key = completion_key(
+        model, system_prompt, user_prompt, response_format, config.max_tokens
+    )
+    if (cached := await _get_cached(key)) is not None:
+        _record_call(stage, model, started, None, cached=True)
+        return cached
+
+    kwargs = _request_kwargs(config)
+    if response_format:
+        kwargs["response_format"] = response_format
+    response = await get_openai_client().chat.completions.create(
+        model=model,
+        messages=[
+            {"role": "system", "content": system_prompt},
+            {"role": "user", "content": user_prompt},
+        ],
+        **kwargs,
+    )
+    content = response.choices[0].message.content
+    _record_call(stage, model, started, getattr(response, "usage", None))
+    await _store(key, content)
+    return content
+
+
+async def stream_completion(
+    *,
+    model: str,
+    system_prompt: str,
+    user_prompt: str,
+    stage: str | None = None,
+) -> AsyncGenerator[str, None]:
+    """
+    Stream a chat completion. Cached completions are replayed in chunks so
+    clients see the same incremental output; fresh streams are cached once
+    they finish. stage works as in complete(); live streams also record
+    llm.<stage>.first_token_seconds.
+    """
+    config = stage_config(stage)
+    started = time.perf_counter()
+    key = completion_key(model, system_prompt, user_prompt, None, config.max_tokens)
+    if (cached := await _get_cached(key)) is not None:
+        size = settings.COMPLETION_REPLAY_CHUNK_SIZE
+        for start in range(0, len(cached), size):
+            yield cached[start : start + size]
+        _record_call(stage, model, started, None, cached=True)
+        return
+
+    stream = await get_openai_client().chat.completions.create(
+        model=model,
+        messages=[
+            {"role": "system", "content": system_prompt},
+            {"role": "user", "content": user_prompt},
+        ],
+        stream=True,
+        # The last chunk then carries the token usage of the whole stream
+        stream_options={"include_usage": True},
+        **_request_kwargs(config),
+    )
+    chunks: list[str] = []
+    usage = None
+    async for chunk in stream:
+        usage = getattr(chunk, "usage", None) or usage
+        if chunk.choices and (content := chunk.choices[0].delta.content):
+            if not chunks:
+                metrics.incr(
+                    f"llm.{stage or 'other'}.first_token_seconds",
+                    time.perf_counter() - started,
+                )
+            chunks.append(content)
+            yield content
+    _record_call(stage, model, started, usage)
+    await _store(key, "".join(chunks))
@@ -0,0 +1,166 @@
+import asyncio
+import re
+import zlib
+
+import numpy as np
+
+from app.core.config import settings
+from app.services.budget import count_tokens, min_tokens, truncate_to_tokens
+
+# Sentence ends followed by what looks like the start of a new sentence
+_SENTENCE_END = re.compile(r"(?<=[.!?])\s+(?=[\"'“(\[]?[A-Z0-9À-Ý])")
+_WORD = re.compile(r"\w{3,}")
+
+# Width of the hashed term space; collisions barely move sentence ranks
+_HASH_DIMENSIONS = 512
+_DAMPING = 0.85
+_MAX_ITERATIONS = 30
+_TOLERANCE = 1e-4
+# Cosine similarity above which a sentence is redundant with a kept one
+_MAX_REDUNDANCY = 0.9
+# Ranked sentences checked for redundancy per matrix product
+_BATCH = 64
+
+
+def split_sentences(text: str) -> list[str]:
+    """Split extracted page text (one block per line) into sentences."""
+    sentences: list[str] = []
+    for line in text.splitlines():
+        sentences.extend(s for s in _SENTENCE_END.split(line.strip()) if s)
+    return sentences
+
+
+def _sentence_vectors(sentences: list[str]) -> np.ndarray:
+    """L2-normalized hashed, sublinear TF-IDF vectors, one row per sentence."""
+    words_per_sentence = [_WORD.findall(sentence.casefold()) for sentence in sentences]
+    words = [word for sentence_words in words_per_sentence for word in sentence_words]
+    n = len(sentences)
+    if not words:
+        return np.zeros((n, _HASH_DIMENSIONS), dtype=np.float32)
+    # Hash each distinct word once
+    vocabulary: dict[str, int] = {}
+    word_ids = np.array(
+        [vocabulary.setdefault(word, len(vocabulary)) for word in words]
+    )
+    buckets = np.array(
+        [zlib.crc32(word.encode()) % _HASH_DIMENSIONS for word in vocabulary],
+        dtype=np.intp,
+    )
+    rows = np.repeat(np.arange(n), [len(w) for w in words_per_sentence])
+    # Weigh only the (sentence, bucket) cells that occur; most of the n x
+    # _HASH_DIMENSIONS matrix is zero
+    cells, tf = np.unique(
+        rows * _HASH_DIMENSIONS + buckets[word_ids], return_counts=True
+    )
+    cell_rows, cell_buckets = np.divmod(cells, _HASH_DIMENSIONS)
+    df = np.bincount(cell_buckets, minlength=_HASH_DIMENSIONS)
+    idf = np.log((1 + n) / (1 + df)) + 1
+    weights = np.log1p(tf) * idf[cell_buckets]
+    norms = np.sqrt(np.bincount(cell_rows, weights=weights**2, minlength=n))
+    vectors = np.zeros((n, _HASH_DIMENSIONS), dtype=np.float32)
+    vectors.flat[cells] = weights / norms[cell_rows]
+    return vectors
+
+
+def rank_sentences(vectors: np.ndarray) -> np.ndarray:
+    """
+    TextRank centrality of each sentence: PageRank over the cosine similarity
+    graph of the sentence vectors. The n x n similarity matrix is never built:
+    S @ x is computed as V @ (V.T @ x) minus the self-similarity, which keeps
+    every iteration linear in the number of sentences.
+    """
+    n = len(vectors)
+    self_similarity = np.einsum("ij,ij->i", vectors, vectors)
+
+    def similarity_times(x: np.ndarray) -> np.ndarray:
+        return vectors @ (vectors.T @ x) - self_similarity * x
+
+    out_weight = similarity_times(np.ones(n, dtype=np.float32))
+    dangling = out_weight <= 1e-9
+    out_weight[dangling] = 1
+    scores = np.full(n, 1 / n, dtype=np.float32)
+    for _ in range(_MAX_ITERATIONS):
+        flow = np.where(dangling, 0, scores / out_weight)
+        # Sentences with no similar sentence spread their score uniformly
+        updated = (1 - _DAMPING) / n + _DAMPING * (
+            similarity_times(flow) + scores[dangling].sum() / n
+        )
+        converged = np.abs(updated - scores).sum() < _TOLERANCE
+        scores = updated
+        if converged:
+            break
+    return scores
+
+
+def _select(
+    sentences: list[str],
+    vectors: np.ndarray,
+    scores: np.ndarray,
+    max_tokens: int,
+    model: str,
+) -> list[int]:
+    """
+    Greedily keep the best-ranked sentences that fit in max_tokens, skipping
+    sentences that repeat what a kept sentence already says. Candidates are
+    compared in batches so the similarity math stays vectorized.
+    """
+    kept: list[int] = []
+    kept_vectors = np.empty_like(vectors)
+    used = 0
+    order = np.argsort(-scores, kind="stable")
+    for start in range(0, len(order), _BATCH):
+        batch = order[start : start + _BATCH]
+        batch_vectors = vectors[batch]
+        redundant = (batch_vectors @ kept_vectors[: len(kept)].T).max(
+            axis=1, initial=0
+        ) > _MAX_REDUNDANCY
+        within = batch_vectors @ batch_vectors.T > _MAX_REDUNDANCY
+        picked: list[int] = []
+        for position, index in enumerate(batch.tolist()):
+            if redundant[position]:
+                continue
+            # Skip tokenizing sentences that cannot fit whatever they count
+            if used + min_tokens(sentences[index], model) + 1 > max_tokens:
+                continue
+            tokens = count_tokens(sentences[index], model) + 1  # Newline
+            if used + tokens > max_tokens:
+                continue
+            picked.append(position)
+            kept.append(index)
+            used += tokens
+            # Later candidates in the batch that repeat this one are redundant
+            redundant |= within[position]
+            if used >= max_tokens - 1:
+                return kept
+        kept_vectors[len(kept) - len(picked) : len(kept)] = batch_vectors[picked]
+    return kept
+
+
+def compress_to_tokens(text: str, max_tokens: int, model: str) -> str:
+    """
+    Fit text into max_tokens. Texts that do not fit keep their most central
+    sentences, in original order, when PROMPT_COMPRESSION_ENABLED is set;
+    otherwise they are truncated.
+    """
+    if max_tokens <= 0:
+        return ""
+    if (
+        min_tokens(text, model) <= max_tokens
+        and count_tokens(text, model, limit=max_tokens + 1) <= max_tokens
+    ):
+        return text
+    sentences = split_sentences(text)
+    if not settings.PROMPT_COMPRESSION_ENABLED or len(sentences) < 2:
+        return truncate_to_tokens(text, max_tokens, model)
+
+    vectors = _sentence_vectors(sentences)
+    scores = rank_sentences(vectors)
+    kept = _select(sentences, vectors, scores, max_tokens, model)
+    if not kept:
+        return truncate_to_tokens(text, max_tokens, model)
+    return "\n".join(sentences[index] for index in sorted(kept))
+
+
+async def compress_to_tokens_async(text: str, max_tokens: int, model: str) -> str:
+    """compress_to_tokens in a worker thread, off the event loop."""
+    return await asyncio.to_thread(compress_to_tokens, text, max_tokens, model)
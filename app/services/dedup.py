@@ -0,0 +1,77 @@
+import hashlib
+import heapq
+from dataclasses import dataclass
+
+
+@dataclass
+class DedupStats:
+    lines: int = 0
+    removed_lines: int = 0
+    removed_chars: int = 0
+
+
+def _line_key(line: str) -> bytes:
+    normalized = " ".join(line.casefold().split())
+    return hashlib.blake2b(normalized.encode(), digest_size=8).digest()
+
+
+def dedupe_lines(texts: list[str]) -> tuple[list[str], DedupStats]:
+    """
+    Drop every line already seen on an earlier text (compared case- and
+    whitespace-insensitively), so headers, menus and footers repeated across a
+    site's pages appear only once, on the first page that has them. Lines
+    repeated within one page (table cells, list items) are kept.
+    """
+    seen: set[bytes] = set()
+    stats = DedupStats()
+    deduped = []
+    for text in texts:
+        kept = []
+        page_keys: set[bytes] = set()
+        for line in text.splitlines():
+            if not line.strip():
+                continue
+            stats.lines += 1
+            key = _line_key(line)
+            if key in seen:
+                stats.removed_lines += 1
+                stats.removed_chars += len(line)
+                continue
+            page_keys.add(key)
+            kept.append(line)
+        seen |= page_keys
+        deduped.append("\n".join(kept))
+    return deduped, stats
+
+
+# Words per shingle and size of the bottom-k MinHash sketch
+SHINGLE_WORDS = 5
+SKETCH_SIZE = 64
+
+
+def _hash64(text: str) -> int:
+    return int.from_bytes(hashlib.blake2b(text.encode(), digest_size=8).digest(), "big")
+
+
+def minhash_sketch(text: str) -> list[int]:
+    """
+    Bottom-k MinHash sketch of text: the SKETCH_SIZE smallest hashes of its
+    word shingles. Sketches of two texts estimate their Jaccard similarity.
+    """
+    words = text.casefold().split()
+    shingles = {
+        " ".join(words[i : i + SHINGLE_WORDS])
+        for i in range(max(len(words) - SHINGLE_WORDS + 1, 1))
+    }
+    shingles.discard("")
+    return heapq.nsmallest(SKETCH_SIZE, {_hash64(shingle) for shingle in shingles})
+
+
+def sketch_similarity(a: list[int], b: list[int]) -> float:
+    """Estimated Jaccard similarity (0 to 1) of the texts behind two sketches."""
+    if not a or not b:
+        return 0.0
+    k = min(SKETCH_SIZE, len(set(a) | set(b)))
+    union = heapq.nsmallest(k, set(a) | set(b))
+    shared = set(a) & set(b)
+    return sum(1 for h in union if h in shared) / len(union)
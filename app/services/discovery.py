@@ -0,0 +1,158 @@
+import asyncio
+import logging
+from dataclasses import dataclass, field
+from urllib.parse import urljoin, urlsplit
+from urllib.robotparser import RobotFileParser
+from xml.etree.ElementTree import ParseError, XMLPullParser
+
+import httpx
+
+from app.core import metrics
+from app.core.cache import SQLiteCache
+from app.core.config import settings
+from app.services.fetcher import ThrottledError, UnsupportedContentError, fetch
+from app.services.urls import canonicalize_url
+
+logger = logging.getLogger(__name__)
+
+discovery_cache = SQLiteCache(
+    "discovery_cache",
+    ttl_seconds=settings.DISCOVERY_CACHE_TTL_SECONDS,
+    max_entries=settings.DISCOVERY_CACHE_MAX_ENTRIES,
+)
+
+_SITEMAP_CONTENT_TYPES = ["application/xml", "text/xml", "text/plain"]
+
+_FETCH_ERRORS = (httpx.HTTPError, UnsupportedContentError, ThrottledError)
+
+
+@dataclass
+class SiteIndex:
+    """What a domain publishes about itself: robots.txt rules and sitemap URLs."""
+
+    origin: str
+    robots_txt: str = ""
+    urls: list[str] = field(default_factory=list)
+
+    def __post_init__(self) -> None:
+        self._robots = RobotFileParser()
+        self._robots.parse(self.robots_txt.splitlines())
+
+    def allows(self, url: str) -> bool:
+        """
+        Whether robots.txt lets us fetch url (relative URLs are resolved). The
+        rules only cover this site; URLs on other hosts are always allowed.
+        """
+        absolute = urljoin(self.origin + "/", url)
+        if site_host(absolute) != site_host(self.origin):
+            return True
+        return self._robots.can_fetch(settings.ROBOTS_USER_AGENT, absolute)
+
+    def sitemaps(self) -> list[str]:
+        return self._robots.site_maps() or [f"{self.origin}/sitemap.xml"]
+
+    def to_dict(self) -> dict:
+        return {"origin": self.origin, "robots_txt": self.robots_txt, "urls": self.urls}
+
+
+def site_origin(url: str) -> str:
+    parts = urlsplit(canonicalize_url(url))
+    return f"{parts.scheme}://{parts.netloc}"
+
+
+def site_host(url: str) -> str:
+    """Host of url without a leading "www.", so apex and www compare equal."""
+    host = (urlsplit(url).hostname or "").lower()
+    return host.removeprefix("www.")
+
+
+def _parse_sitemap(content: bytes) -> tuple[list[str], list[str]]:
+    """
+    Return (page URLs, child sitemap URLs) from a sitemap or sitemap index.
+    Parsing is incremental so a body truncated at FETCH_MAX_BYTES still yields
+    every <loc> before the cut.
+    """
+    parser = XMLPullParser(events=("end",))
+    locs: list[str] = []
+    is_index = False
+    try:
+        parser.feed(content)
+        parser.close()
+    except ParseError:
+        pass
+    for _, element in parser.read_events():
+        tag = element.tag.rsplit("}", 1)[-1]
+        if tag == "loc" and element.text:
+            locs.append(element.text.strip())
+        elif tag == "sitemapindex":
+            is_index = True
+    return ([], locs) if is_index else (locs, [])
+
+
+def _compact(urls: list[str], origin: str) -> list[str]:
+    """Same-site URLs, deduplicated, shallowest paths first, capped."""
+    host = site_host(origin)
+    seen = set()
+    kept = []
+    for url in urls:
+        canonical = canonicalize_url(url)
+        if site_host(canonical) == host and canonical not in seen:
+            seen.add(canonical)
+            kept.append(canonical)
+    kept.sort(key=lambda url: urlsplit(url).path.rstrip("/").count("/"))
+    return kept[: settings.DISCOVERY_MAX_URLS]
+
+
+async def _fetch_robots(origin: str) -> str:
+    try:
+        result = await fetch(f"{origin}/robots.txt")
+    except _FETCH_ERRORS as e:
+        # A missing or unreadable robots.txt places no restrictions
+        logger.info(f"No robots.txt for {origin}: {e}")
+        return ""
+    return result.content.decode("utf-8", errors="replace")
+
+
+async def _fetch_sitemap_urls(index: SiteIndex) -> list[str]:
+    pending = index.sitemaps()
+    urls: list[str] = []
+    fetched = 0
+    while pending and fetched < settings.DISCOVERY_MAX_SITEMAPS:
+        sitemap = pending.pop(0)
+        if sitemap.endswith(".gz") or not index.allows(sitemap):
+            continue
+        fetched += 1
+        try:
+            result = await fetch(sitemap, content_types=_SITEMAP_CONTENT_TYPES)
+        except _FETCH_ERRORS as e:
+            logger.info(f"Skipping sitemap {sitemap}: {e}")
+            continue
+        # Sitemaps run up to FETCH_MAX_BYTES; parse them off the event loop
+        pages, children = await asyncio.to_thread(_parse_sitemap, result.content)
+        urls.extend(pages)
+        pending.extend(children)
+    return urls
+
+
+async def discover_site(url: str) -> SiteIndex:
+    """
+    Return the robots.txt rules and a compact sitemap URL index for url's
+    domain, fetched once per DISCOVERY_CACHE_TTL_SECONDS and shared by every
+    worker through the cache database.
+    """
+    origin = site_origin(url)
+    if not settings.DISCOVERY_ENABLED:
+        return SiteIndex(origin=origin)
+    cached = await discovery_cache.get_async(origin)
+    if cached is not None:
+        metrics.incr("discovery.hit")
+        return SiteIndex(**cached)
+    metrics.incr("discovery.miss")
+
+    index = SiteIndex(origin=origin, robots_txt=await _fetch_robots(origin))
+    index.urls = await asyncio.to_thread(
+        _compact, await _fetch_sitemap_urls(index), origin
+    )
+    # Failures are cached too, so a site without a sitemap is not re-probed
+    await discovery_cache.set_async(origin, index.to_dict())
+    return index
@@ -0,0 +1,504 @@
+import asyncio
+import json
+import re
+from collections.abc import Callable
+from dataclasses import asdict, dataclass, field
+from html.parser import HTMLParser
+
+from bs4 import UnicodeDammit
+
+from app.core.config import settings
+from app.core.executor import get_parse_executor
+from app.services.dedup import minhash_sketch
+
+try:
+    from selectolax.lexbor import LexborHTMLParser
+
+    _HAVE_SELECTOLAX = True
+except ImportError:  # Optional C-accelerated backend
+    _HAVE_SELECTOLAX = False
+
+try:
+    from lxml import etree  # type: ignore[import]
+    from lxml import html as lxml_html  # type: ignore[import]
+
+    _HAVE_LXML = True
+except ImportError:  # Optional C-accelerated backend
+    _HAVE_LXML = False
+
+
+@dataclass
+class Page:
+    """Content extracted from one fetched HTML page."""
+
+    url: str
+    title: str = ""
+    text: str = ""
+    links: list[str] = field(default_factory=list)
+    # Visible text of each link, parallel to links
+    link_texts: list[str] = field(default_factory=list)
+    # Share of the visible text dropped as boilerplate
+    boilerplate_ratio: float = 0.0
+    # MinHash sketch of text, for near-duplicate detection
+    fingerprint: list[int] = field(default_factory=list)
+    # Self-description from <meta>, OpenGraph and JSON-LD markup, keyed like
+    # "description", "og:site_name" or "ld:description"
+    metadata: dict[str, str] = field(default_factory=dict)
+
+    def to_dict(self) -> dict:
+        return asdict(self)
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "Page":
+        return cls(**{k: v for k, v in data.items() if k in cls.__dataclass_fields__})
+
+
+# <meta name/property> values kept in Page.metadata
+_META_KEYS = {
+    "description", "og:title", "og:site_name", "og:description", "og:type",
+    "twitter:title", "twitter:description",
+}  # fmt: skip
+# JSON-LD types describing the site owner, most specific first
+_JSON_LD_TYPES = (
+    "Organization", "Corporation", "LocalBusiness", "NGO",
+    "EducationalOrganization", "Brand", "WebSite",
+)  # fmt: skip
+
+# Elements whose text is never visible page content
+_SKIP_TAGS = {"script", "style", "noscript", "template"}
+
+# Elements that start a new block of text
+_BLOCK_TAGS = {
+    "address", "article", "aside", "blockquote", "dd", "div", "dl", "dt",
+    "fieldset", "figcaption", "figure", "footer", "form", "h1", "h2", "h3",
+    "h4", "h5", "h6", "header", "hr", "li", "main", "nav", "ol", "p", "pre",
+    "section", "table", "td", "th", "tr", "ul",
+}  # fmt: skip
+_HEADING_TAGS = {"h1", "h2", "h3", "h4", "h5", "h6"}
+# Elements without an end tag, and elements whose end tag is often omitted,
+# never open a region: the region could not be closed reliably
+_UNCLOSED_TAGS = {
+    "area", "base", "br", "col", "embed", "hr", "img", "input", "link",
+    "meta", "source", "track", "wbr", "li", "p", "td", "th", "tr", "dt", "dd",
+    "option",
+}  # fmt: skip
+
+# Page chrome by tag and ARIA role. header/footer only count outside the main
+# content, where they are site chrome rather than an article's own header.
+_CHROME_TAGS = {"nav", "aside"}
+_CHROME_OUTSIDE_CONTENT_TAGS = {"header", "footer"}
+_CHROME_ROLES = {
+    "navigation", "banner", "contentinfo", "complementary", "search", "menu",
+    "menubar", "dialog", "alertdialog",
+}  # fmt: skip
+_CONTENT_TAGS = {"main", "article"}
+# class/id words of typical chrome widgets. A class or id token is a hint when
+# its -/_ separated parts are all such words or widget parts, so "cookie-banner"
+# and "skip-link" match but "shareholders" and "social-impact" do not.
+_CHROME_HINT_WORDS = {
+    "cookie", "cookies", "consent", "gdpr", "breadcrumb", "breadcrumbs", "share",
+    "sharing", "social", "newsletter", "subscribe", "popup", "modal", "sidebar",
+    "menu", "navbar", "skip", "advert", "ad", "ads",
+}  # fmt: skip
+_CHROME_HINT_PARTS = {
+    "banner", "bar", "box", "button", "buttons", "link", "links", "icons",
+    "notice", "wrapper", "container", "widget", "form", "signup", "overlay",
+    "toggle", "nav", "list", "main", "site", "top", "primary", "mobile", "to",
+    "content", "dialog",
+}  # fmt: skip
+_HINT_TOKEN_SEPARATORS = re.compile(r"[-_]+")
+# Never hinted: a class on the page root says nothing about chrome
+_HINTLESS_TAGS = {"html", "body"}
+
+
+def _is_chrome_hint(token: str) -> bool:
+    parts = [part for part in _HINT_TOKEN_SEPARATORS.split(token) if part]
+    return any(part in _CHROME_HINT_WORDS for part in parts) and all(
+        part in _CHROME_HINT_WORDS or part in _CHROME_HINT_PARTS for part in parts
+    )
+
+
+@dataclass(frozen=True)
+class _BoilerplateLevel:
+    # Drop text inside nav/aside/ARIA-role chrome and site header/footer
+    semantic: bool
+    # Also drop text inside elements whose class/id names a chrome widget
+    hints: bool
+    # Drop blocks whose share of link text is above this
+    max_link_density: float
+    # Drop non-heading blocks with fewer words than this
+    min_words: int
+
+
+BOILERPLATE_LEVELS: dict[str, _BoilerplateLevel | None] = {
+    "off": None,
+    "light": _BoilerplateLevel(
+        semantic=True, hints=False, max_link_density=1.0, min_words=0
+    ),
+    "balanced": _BoilerplateLevel(
+        semantic=True, hints=True, max_link_density=0.5, min_words=0
+    ),
+    "aggressive": _BoilerplateLevel(
+        semantic=True, hints=True, max_link_density=0.33, min_words=4
+    ),
+}
+
+
+@dataclass
+class _Block:
+    pieces: list[str] = field(default_factory=list)
+    chars: int = 0
+    link_chars: int = 0
+    chrome: bool = False
+    hinted: bool = False
+    heading: bool = False
+
+    def keep(self, level: _BoilerplateLevel) -> bool:
+        if (level.semantic and self.chrome) or (level.hints and self.hinted):
+            return False
+        if self.link_chars > level.max_link_density * self.chars:
+            return False
+        words = sum(len(piece.split()) for piece in self.pieces)
+        return self.heading or words >= level.min_words
+
+
+class _PageBuilder:
+    """
+    Collects title, visible text and links from a stream of start/end/data
+    events, so every parser backend shares one single-pass extraction.
+
+    Text is grouped into blocks that remember their link density and whether
+    they sit inside page chrome, so boilerplate (navigation, banners, footers,
+    cookie notices) can be dropped according to the boilerplate level.
+    """
+
+    def __init__(self, url: str, boilerplate: str = "off"):
+        self.url = url
+        self.level = BOILERPLATE_LEVELS[boilerplate]
+        self.links: list[str] = []
+        self.link_texts: list[str] = []
+        self._anchor: list[str] | None = None
+        self._title: list[str] = []
+        self._blocks: list[_Block] = []
+        self._block: _Block | None = None
+        # Open chrome/content regions as [tag, open same-tag depth, kind]
+        self._regions: list[list] = []
+        self._heading_depth = 0
+        self._skip_depth = 0
+        self._in_title = False
+        self._in_head = False
+        self.metadata: dict[str, str] = {}
+        self._json_ld: list[str] | None = None
+        self._json_ld_blocks: list[str] = []
+
+    def _region_kind(self, tag: str, attrs: dict) -> str | None:
+        if tag in _CONTENT_TAGS or attrs.get("role") == "main":
+            return "content"
+        if (
+            tag in _CHROME_TAGS
+            or attrs.get("role") in _CHROME_ROLES
+            or attrs.get("aria-hidden") == "true"
+            or "hidden" in attrs
+        ):
+            return "chrome"
+        if tag in _CHROME_OUTSIDE_CONTENT_TAGS and not any(
+            kind == "content" for _, _, kind in self._regions
+        ):
+            return "chrome"
+        if tag in _HINTLESS_TAGS:
+            return None
+        hints = f"{attrs.get('class') or ''} {attrs.get('id') or ''}".lower()
+        if any(_is_chrome_hint(token) for token in hints.split()):
+            return "hinted"
+        return None
+
+    def _open_region(self, tag: str, attrs: dict) -> None:
+        for region in self._regions:
+            if region[0] == tag:
+                region[1] += 1
+        if tag not in _UNCLOSED_TAGS and (kind := self._region_kind(tag, attrs)):
+            self._regions.append([tag, 1, kind])
+            self._block = None
+
+    def _close_region(self, tag: str) -> None:
+        for region in self._regions:
+            if region[0] == tag:
+                region[1] -= 1
+        if any(region[1] <= 0 for region in self._regions):
+            self._regions = [region for region in self._regions if region[1] > 0]
+            self._block = None
+
+    def start(self, tag: str, attrs: dict) -> None:
+        if tag in _BLOCK_TAGS:
+            self._block = None
+        if tag in _HEADING_TAGS:
+            self._heading_depth += 1
+        self._open_region(tag, attrs)
+        if tag == "meta":
+            self._meta(attrs)
+        elif tag == "script" and (attrs.get("type") or "").lower() == (
+            "application/ld+json"
+        ):
+            self._json_ld = []
+        if tag in _SKIP_TAGS:
+            self._skip_depth += 1
+        elif tag == "title":
+            self._in_title = True
+        elif tag == "head":
+            self._in_head = True
+        elif tag == "body":
+            self._in_head = False
+        elif tag == "a" and (href := attrs.get("href")):
+            self._close_anchor()
+            self.links.append(href)
+            self._anchor = []
+
+    def end(self, tag: str) -> None:
+        if tag in _BLOCK_TAGS:
+            self._block = None
+        if tag in _HEADING_TAGS:
+            self._heading_depth = max(self._heading_depth - 1, 0)
+        self._close_region(tag)
+        if tag == "script" and self._json_ld is not None:
+            self._json_ld_blocks.append("".join(self._json_ld))
+            self._json_ld = None
+        if tag in _SKIP_TAGS:
+            self._skip_depth = max(self._skip_depth - 1, 0)
+        elif tag == "title":
+            self._in_title = False
+        elif tag == "head":
+            self._in_head = False
+        elif tag == "a":
+            self._close_anchor()
+
+    def _meta(self, attrs: dict) -> None:
+        key = (attrs.get("property") or attrs.get("name") or "").lower()
+        content = " ".join((attrs.get("content") or "").split())
+        if key in _META_KEYS and content:
+            self.metadata.setdefault(key, content)
+
+    def _close_anchor(self) -> None:
+        if self._anchor is not None:
+            self.link_texts.append(" ".join(" ".join(self._anchor).split()))
+            self._anchor = None
+
+    def data(self, text: str) -> None:
+        if self._json_ld is not None:
+            self._json_ld.append(text)
+        if self._skip_depth:
+            return
+        if self._in_title:
+            self._title.append(text)
+        elif not self._in_head and (text := text.strip()):
+            if self._block is None:
+                # Content regions vouch for their subtree: a hinted ancestor
+                # (e.g. a "page-sidebar" layout wrapper) does not reach into it
+                chrome = hinted = False
+                for _, _, kind in self._regions:
+                    chrome = chrome or kind == "chrome"
+                    hinted = kind == "hinted" or (hinted and kind != "content")
+                self._block = _Block(
+                    chrome=chrome,
+                    hinted=hinted,
+                    heading=self._heading_depth > 0,
+                )
+                self._blocks.append(self._block)
+            self._block.pieces.append(text)
+            self._block.chars += len(text)
+            if self._anchor is not None:
+                self._anchor.append(text)
+                self._block.link_chars += len(text)
+
+    def _json_ld_metadata(self) -> dict[str, str]:
+        """name/description of the most specific site-owner JSON-LD object."""
+        found: dict[str, dict] = {}
+        for block in self._json_ld_blocks:
+            try:
+                stack = [json.loads(block)]
+            except ValueError:
+                continue  # Invalid markup is common; it is only a hint
+            # Breadth-first, so top-level objects win over nested ones
+            while stack:
+                item = stack.pop(0)
+                if isinstance(item, list):
+                    stack.extend(item)
+                elif isinstance(item, dict):
+                    stack.extend(
+                        v for v in item.values() if isinstance(v, (list, dict))
+                    )
+                    types = item.get("@type")
+                    for t in types if isinstance(types, list) else [types]:
+                        if isinstance(t, str):
+                            found.setdefault(t, item)
+        for t in _JSON_LD_TYPES:
+            if t in found:
+                return {
+                    f"ld:{key}": " ".join(found[t][key].split())
+                    for key in ("name", "description")
+                    if isinstance(found[t].get(key), str) and found[t][key].strip()
+                }
+        return {}
+
+    def _main_blocks(self) -> list[_Block]:
+        if self.level is None:
+            return self._blocks
+        kept = [block for block in self._blocks if block.keep(self.level)]
+        # A page that is all "boilerplate" was misjudged; keep it whole
+        return kept or self._blocks
+
+    def build(self) -> Page:
+        self._close_anchor()
+        title = " ".join("".join(self._title).split())
+        kept = self._main_blocks()
+        raw_chars = sum(block.chars for block in self._blocks)
+        kept_chars = sum(block.chars for block in kept)
+        text = "\n".join(piece for block in kept for piece in block.pieces)
+        return Page(
+            url=self.url,
+            title=title or "No title found",
+            text=text,
+            links=self.links,
+            link_texts=self.link_texts,
+            boilerplate_ratio=1 - kept_chars / raw_chars if raw_chars else 0.0,
+            fingerprint=minhash_sketch(text),
+            metadata={**self.metadata, **self._json_ld_metadata()},
+        )
+
+
+def _decode(html: bytes | str) -> str:
+    if isinstance(html, str):
+        return html
+    return UnicodeDammit(html, is_html=True).unicode_markup or html.decode(
+        "utf-8", errors="replace"
+    )
+
+
+class _StdlibParser(HTMLParser):
+    def __init__(self, builder: _PageBuilder):
+        super().__init__(convert_charrefs=True)
+        self.builder = builder
+
+    def handle_starttag(self, tag: str, attrs: list) -> None:
+        self.builder.start(tag, dict(attrs))
+
+    def handle_startendtag(self, tag: str, attrs: list) -> None:
+        self.builder.start(tag, dict(attrs))
+        self.builder.end(tag)
+
+    def handle_endtag(self, tag: str) -> None:
+        self.builder.end(tag)
+
+    def handle_data(self, data: str) -> None:
+        self.builder.data(data)
+
+
+def _parse_stdlib(html: bytes | str, builder: _PageBuilder) -> None:
+    parser = _StdlibParser(builder)
+    parser.feed(_decode(html))
+    parser.close()
+
+
+def _parse_lxml(html: bytes | str, builder: _PageBuilder) -> None:
+    # lxml sniffs the charset itself when given bytes
+    try:
+        root = lxml_html.document_fromstring(html)
+    except etree.ParserError:  # Empty document
+        return
+    # Explicit walk rather than iterwalk, which drops the tail text of comments
+    stack = [(root, False)]
+    while stack:
+        element, closing = stack.pop()
+        if closing:
+            builder.end(element.tag)
+            if element.tail:
+                builder.data(element.tail)
+        elif isinstance(element.tag, str):
+            builder.start(element.tag, element.attrib)
+            if element.text:
+                builder.data(element.text)
+            stack.append((element, True))
+            stack.extend((child, False) for child in reversed(element))
+        elif element.tail:  # Comments and processing instructions
+            builder.data(element.tail)
+
+
+def _parse_selectolax(html: bytes | str, builder: _PageBuilder) -> None:
+    root = LexborHTMLParser(_decode(html)).root
+    if root is None:
+        return
+    # Iterative depth-first walk; deeply nested pages would overflow recursion
+    stack = [(root, False)]
+    while stack:
+        node, closing = stack.pop()
+        tag = node.tag
+        if tag is None:
+            continue
+        if closing:
+            builder.end(tag)
+        elif tag == "-text":
+            builder.data(node.text_content or "")
+        elif not tag.startswith("-"):  # Skip comments and doctype
+            builder.start(tag, node.attributes)
+            stack.append((node, True))
+            children = []
+            child = node.child
+            while child is not None:
+                children.append(child)
+                child = child.next
+            stack.extend((child, False) for child in reversed(children))
+
+
+BACKENDS: dict[str, Callable[[bytes | str, _PageBuilder], None]] = {
+    "selectolax": _parse_selectolax,
+    "lxml": _parse_lxml,
+    "html.parser": _parse_stdlib,
+}
+
+
+def available_backends() -> list[str]:
+    """Installed parser backends, fastest first."""
+    installed = {
+        "selectolax": _HAVE_SELECTOLAX,
+        "lxml": _HAVE_LXML,
+        "html.parser": True,
+    }
+    return [name for name in BACKENDS if installed[name]]
+
+
+def resolve_backend(name: str | None = None) -> str:
+    name = name or settings.HTML_PARSER_BACKEND
+    available = available_backends()
+    if name == "auto":
+        return available[0]
+    if name not in available:
+        raise ValueError(
+            f"HTML parser backend {name!r} is not installed; available: {available}"
+        )
+    return name
+
+
+def extract_page(
+    url: str,
+    html: bytes | str,
+    backend: str | None = None,
+    boilerplate: str | None = None,
+) -> Page:
+    """
+    Extract the title, main text and links from an HTML document. boilerplate
+    (default EXTRACT_BOILERPLATE) is one of BOILERPLATE_LEVELS.
+    """
+    builder = _PageBuilder(url, boilerplate or settings.EXTRACT_BOILERPLATE)
+    BACKENDS[resolve_backend(backend)](html, builder)
+    return builder.build()
+
+
+async def extract_page_async(url: str, html: bytes | str) -> Page:
+    """
+    Extract a page without stalling the event loop: small documents are parsed
+    inline, large ones in the parse process pool (or a thread when the pool is
+    disabled).
+    """
+    if len(html) <= settings.PARSE_INLINE_MAX_BYTES:
+        return extract_page(url, html)
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(get_parse_executor(), extract_page, url, html)
@@ -0,0 +1,171 @@
+import logging
+from dataclasses import dataclass
+
+import httpx
+
+from app.core import metrics
+from app.core.config import settings
+from app.core.http import get_http_client
+from app.services.extractor import Page, extract_page_async
+from app.services.host_scheduler import (
+    ThrottledError,
+    host_scheduler,
+    parse_retry_after,
+)
+from app.services.page_cache import lookup_page, mark_revalidated, store_page
+
+logger = logging.getLogger(__name__)
+
+# Statuses that mean "slow down" rather than "failed"
+_THROTTLE_STATUSES = {429, 503}
+
+
+class UnsupportedContentError(Exception):
+    """The response is not an HTML/text document worth downloading."""
+
+
+# Magic numbers of common binary formats served without a usable Content-Type
+_BINARY_SIGNATURES = (
+    b"%PDF",
+    b"\x89PNG",
+    b"GIF8",
+    b"\xff\xd8\xff",  # JPEG
+    b"PK\x03\x04",  # ZIP / Office documents
+    b"RIFF",  # WebP, AVI, WAV
+    b"\x1a\x45\xdf\xa3",  # WebM / Matroska
+)
+
+
+@dataclass
+class FetchResult:
+    url: str
+    status_code: int
+    headers: httpx.Headers
+    content: bytes = b""
+    truncated: bool = False
+
+
+def _check_content_type(content_type: str | None, allowed: list[str]) -> None:
+    if not content_type:
+        return  # Decided by sniffing the first bytes instead
+    mime = content_type.split(";", 1)[0].strip().lower()
+    if mime not in allowed:
+        raise UnsupportedContentError(f"Unsupported content type: {mime}")
+
+
+def _sniff(chunk: bytes) -> None:
+    head = chunk[:16]
+    if head.startswith(_BINARY_SIGNATURES) or head[4:8] == b"ftyp":  # MP4/MOV
+        raise UnsupportedContentError("Response body is a binary document")
+    if b"\x00" in chunk[:1024]:
+        raise UnsupportedContentError("Response body is not text")
+
+
+async def _read_capped(response: httpx.Response, max_bytes: int) -> tuple[bytes, bool]:
+    """
+    Read the (incrementally decompressed) body up to max_bytes, stopping the
+    download as soon as the cap is reached.
+    """
+    chunks: list[bytes] = []
+    size = 0
+    async for chunk in response.aiter_bytes():
+        if not chunks:
+            _sniff(chunk)
+        chunk = chunk[: max_bytes - size]
+        chunks.append(chunk)
+        size += len(chunk)
+        if size >= max_bytes:
+            return b"".join(chunks), True
+    return b"".join(chunks), False
+
+
+async def _fetch_once(
+    url: str, headers: dict[str, str] | None, content_types: list[str]
+) -> FetchResult:
+    client = get_http_client()
+    async with client.stream("GET", url, headers=headers) as response:
+        result = FetchResult(
+            url=url, status_code=response.status_code, headers=response.headers
+        )
+        if response.status_code == 304 or response.status_code in _THROTTLE_STATUSES:
+            return result
+        response.raise_for_status()
+        try:
+            _check_content_type(response.headers.get("Content-Type"), content_types)
+            result.content, result.truncated = await _read_capped(
+                response, settings.FETCH_MAX_BYTES
+            )
+        except UnsupportedContentError:
+            metrics.incr("fetch.rejected_content")
+            raise
+    metrics.incr("fetch.bytes", len(result.content))
+    if result.truncated:
+        metrics.incr("fetch.truncated")
+    return result
+
+
+async def fetch(
+    url: str,
+    headers: dict[str, str] | None = None,
+    *,
+    content_types: list[str] | None = None,
+) -> FetchResult:
+    """
+    Stream a URL through the shared pooled client under the per-host
+    politeness scheduler. Bodies whose Content-Type is not in content_types
+    (default FETCH_ALLOWED_CONTENT_TYPES) are rejected before they are
+    downloaded and bodies are cut off at FETCH_MAX_BYTES. 429/503 answers pause
+    the host (honouring Retry-After) and are retried up to FETCH_MAX_RETRIES
+    times. Raises httpx errors on network failure or on a status other than
+    2xx and 304 Not Modified.
+    """
+    content_types = content_types or settings.FETCH_ALLOWED_CONTENT_TYPES
+    for attempt in range(settings.FETCH_MAX_RETRIES + 1):
+        async with host_scheduler.slot(url):
+            result = await _fetch_once(url, headers, content_types)
+        if result.status_code not in _THROTTLE_STATUSES:
+            return result
+
+        metrics.incr("fetch.throttled")
+        delay = parse_retry_after(result.headers.get("Retry-After"))
+        if delay is None:
+            delay = settings.FETCH_RETRY_BACKOFF * 2**attempt
+        host_scheduler.back_off(url, delay)
+        if delay > settings.FETCH_MAX_RETRY_AFTER:
+            break
+        if attempt < settings.FETCH_MAX_RETRIES:
+            metrics.incr("fetch.retries")
+    raise ThrottledError(
+        f"{url} answered {result.status_code}; asked to retry after {delay:.0f}s"
+    )
+
+
+async def fetch_page(url: str) -> Page:
+    """
+    Return the extracted content of a page. Fresh cache entries are served
+    directly; stale ones are revalidated with a conditional request and reused
+    without reparsing on 304 Not Modified.
+    """
+    cached = await lookup_page(url)
+    if cached is not None and cached.fresh:
+        return cached.page
+
+    validators = cached.validators if cached is not None else {}
+    response = await fetch(url, headers=validators or None)
+    if response.status_code == 304 and cached is not None:
+        await mark_revalidated(url)
+        return cached.page
+    if validators:
+        metrics.incr("page_cache.revalidation_changed")
+
+    page = await extract_page_async(url, response.content)
+    logger.info(
+        f"Extracted {url}: {len(page.text)} chars of text, "
+        f"{page.boilerplate_ratio:.0%} removed as boilerplate"
+    )
+    await store_page(
+        page,
+        etag=response.headers.get("ETag"),
+        last_modified=response.headers.get("Last-Modified"),
+    )
+    return page
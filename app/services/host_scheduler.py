@@ -0,0 +1,110 @@
+import asyncio
+import time
+from collections.abc import AsyncGenerator
+from contextlib import asynccontextmanager
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from urllib.parse import urlsplit
+
+from app.core.config import settings
+
+
+class ThrottledError(Exception):
+    """The host kept answering 429/503 or asked us to wait too long."""
+
+
+class _HostState:
+    def __init__(self) -> None:
+        self.semaphore = asyncio.Semaphore(settings.HTTP_MAX_CONNECTIONS_PER_HOST)
+        # Monotonic time before which no new request may start
+        self.next_start = 0.0
+        # Requests holding or waiting for a slot
+        self.users = 0
+
+    def idle(self, now: float) -> bool:
+        return self.users == 0 and self.next_start <= now
+
+
+# Seconds between sweeps that forget idle hosts
+_SWEEP_INTERVAL = 60.0
+
+
+def host_key(url: str) -> str:
+    return urlsplit(url).netloc.lower()
+
+
+def parse_retry_after(value: str | None) -> float | None:
+    """Seconds to wait from a Retry-After header (delta-seconds or HTTP date)."""
+    if not value:
+        return None
+    value = value.strip()
+    if value.isdigit():
+        return float(value)
+    try:
+        retry_at = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if retry_at.tzinfo is None:
+        retry_at = retry_at.replace(tzinfo=timezone.utc)
+    return max((retry_at - datetime.now(timezone.utc)).total_seconds(), 0.0)
+
+
+class HostScheduler:
+    """
+    Keeps outbound crawling polite per host: caps concurrent connections,
+    spaces request starts by HTTP_MIN_HOST_INTERVAL and pauses a host after it
+    answers 429/503. Hosts with no request in flight and no pending pause are
+    forgotten periodically, so crawling many hosts does not grow the state.
+    """
+
+    def __init__(self) -> None:
+        self._hosts: dict[str, _HostState] = {}
+        self._next_sweep = time.monotonic() + _SWEEP_INTERVAL
+
+    def _state(self, url: str) -> _HostState:
+        key = host_key(url)
+        state = self._hosts.get(key)
+        if state is None:
+            state = self._hosts[key] = _HostState()
+        return state
+
+    def _evict_idle(self) -> None:
+        now = time.monotonic()
+        if now < self._next_sweep:
+            return
+        self._next_sweep = now + _SWEEP_INTERVAL
+        for key in [key for key, state in self._hosts.items() if state.idle(now)]:
+            del self._hosts[key]
+
+    @asynccontextmanager
+    async def slot(self, url: str) -> AsyncGenerator[None, None]:
+        state = self._state(url)
+        state.users += 1
+        try:
+            async with state.semaphore:
+                # Reserve a start time before sleeping, so concurrent waiters on
+                # the same host line up instead of all waking at once
+                now = time.monotonic()
+                # A host that asked for a long pause fails fast instead of
+                # parking requests (and their slots) until the pause ends
+                if state.next_start - now > settings.FETCH_MAX_RETRY_AFTER:
+                    raise ThrottledError(
+                        f"{host_key(url)} is paused for another "
+                        f"{state.next_start - now:.0f}s"
+                    )
+                start = max(now, state.next_start)
+                state.next_start = start + settings.HTTP_MIN_HOST_INTERVAL
+                if start > now:
+                    await asyncio.sleep(start - now)
+                yield
+        finally:
+            state.users -= 1
+            self._evict_idle()
+
+    def back_off(self, url: str, delay: float) -> None:
+        """Hold every request to url's host for at least delay seconds."""
+        state = self._state(url)
+        state.next_start = max(state.next_start, time.monotonic() + delay)
+
+
+host_scheduler = HostScheduler()
@@ -0,0 +1,141 @@
+import re
+import unicodedata
+from dataclasses import dataclass, field
+from urllib.parse import unquote, urlsplit
+
+# Keywords per brochure link type, as URL path words and anchor text, in the
+# languages company sites are most often published in
+LINK_TYPE_KEYWORDS: dict[str, set[str]] = {
+    "about page": {
+        # en
+        "about", "about-us", "aboutus", "company", "our-company", "who-we-are",
+        "our-story", "mission", "team", "our-team", "leadership", "history",
+        # de / nl / scandinavian
+        "uber-uns", "ueber-uns", "unternehmen", "firma", "wir", "over-ons",
+        "bedrijf", "om-oss", "om-os", "foretaget", "virksomheden",
+        # fr / es / pt / it
+        "a-propos", "qui-sommes-nous", "entreprise", "societe", "notre-histoire",
+        "sobre", "sobre-nosotros", "nosotros", "quienes-somos", "empresa",
+        "sobre-nos", "quem-somos", "chi-siamo", "azienda", "la-societa",
+        # pl / cs / tr / ja / zh
+        "o-nas", "o-firmie", "hakkimizda", "kurumsal", "会社概要",
+        "企業情報", "关于我们", "公司简介",
+    },
+    "careers page": {
+        # en
+        "careers", "career", "jobs", "job", "join-us", "joinus", "work-with-us",
+        "hiring", "vacancies", "openings", "open-positions", "life-at",
+        # de / nl / scandinavian
+        "karriere", "stellenangebote", "stellen", "jobs-karriere", "vacatures",
+        "werken-bij", "karriar", "lediga-jobb", "job-hos-os",
+        # fr / es / pt / it
+        "carrieres", "carriere", "recrutement", "emplois", "nous-rejoindre",
+        "empleo", "empleos", "trabaja-con-nosotros", "carreras", "vagas",
+        "trabalhe-conosco", "carreiras", "lavora-con-noi",
+        # pl / cs / tr / ja / zh
+        "kariera", "praca", "kariyer", "採用", "採用情報", "招聘", "加入我们",
+    },
+    "customers page": {
+        "customers", "clients", "case-studies", "case-study", "success-stories",
+        "references", "referenzen", "kunden", "clientes", "casos-de-exito",
+        "references-clients", "klanten",
+    },
+}  # fmt: skip
+
+# Types the brochure cannot do without: when none of them is found with
+# confidence, the LLM decides instead
+REQUIRED_TYPES = ("about page",)
+# Minimum score for an optional type to be included at all
+MIN_INCLUDE_SCORE = 0.5
+MAX_LINKS_PER_TYPE = 2
+
+_WORD_SPLIT = re.compile(r"[^\w]+")
+
+
+def _fold(text: str) -> str:
+    """Lowercase and strip accents, so "À propos" matches "a-propos"."""
+    decomposed = unicodedata.normalize("NFKD", text.lower())
+    return "".join(c for c in decomposed if not unicodedata.combining(c))
+
+
+def _slug(text: str) -> str:
+    return "-".join(word for word in _WORD_SPLIT.split(_fold(text)) if word)
+
+
+@dataclass
+class LinkClassification:
+    links: list[dict] = field(default_factory=list)
+    # Lowest best-match score over REQUIRED_TYPES, from 0 to 1
+    confidence: float = 0.0
+
+    def as_selection(self) -> dict:
+        """The {"links": [{"type", "url"}]} structure the LLM would return."""
+        return {"links": self.links}
+
+
+def score_link(url: str, anchor_text: str, keywords: set[str]) -> float:
+    """
+    Score how clearly url is a page of the type described by keywords: an exact
+    path segment match is strongest, and counts less the further it is from
+    the last segment (/company/careers is a careers page); matching anchor
+    text raises the score.
+    """
+    segments = [_slug(unquote(s)) for s in urlsplit(url).path.split("/") if s]
+    if not segments:
+        return 0.0
+    score = 0.0
+    for depth, segment in enumerate(reversed(segments), start=1):
+        words = set(segment.split("-"))
+        if segment in keywords:
+            match = 1.0
+        elif words & keywords:
+            match = 0.6
+        else:
+            continue
+        score = max(score, match / depth)
+    # Deep pages (blog posts, individual job ads) are rarely overview pages
+    score /= 1 + 0.25 * max(len(segments) - 2, 0)
+    anchor = _slug(anchor_text)
+    if anchor and (anchor in keywords or set(anchor.split("-")) & keywords):
+        score += 0.4 if anchor in keywords else 0.2
+    return min(score, 1.0)
+
+
+def link_relevance(url: str, anchor_text: str = "") -> float:
+    """The best score_link of url over all brochure link types."""
+    return max(
+        score_link(url, anchor_text, keywords)
+        for keywords in LINK_TYPE_KEYWORDS.values()
+    )
+
+
+def classify_links(
+    candidates: list[str], link_texts: dict[str, str] | None = None
+) -> LinkClassification:
+    """
+    Pick brochure-relevant links from candidates without calling the LLM.
+    link_texts maps candidate URLs to the visible text of their links.
+    """
+    link_texts = link_texts or {}
+    links: list[dict] = []
+    used: set[str] = set()
+    best: dict[str, float] = {}
+    for link_type, keywords in LINK_TYPE_KEYWORDS.items():
+        scored = sorted(
+            (
+                (score_link(url, link_texts.get(url, ""), keywords), index, url)
+                for index, url in enumerate(candidates)
+            ),
+            key=lambda item: (-item[0], item[1]),
+        )
+        best[link_type] = scored[0][0] if scored else 0.0
+        picked = [
+            url
+            for score, _, url in scored
+            if score >= MIN_INCLUDE_SCORE and url not in used
+        ][:MAX_LINKS_PER_TYPE]
+        used.update(picked)
+        links.extend({"type": link_type, "url": url} for url in picked)
+    return LinkClassification(
+        links=links, confidence=min(best[t] for t in REQUIRED_TYPES)
+    )
@@ -0,0 +1,106 @@
+import re
+from urllib.parse import urljoin, urlsplit
+
+from app.services.urls import canonicalize_url, strip_tracking_params
+
+# Off-site destinations that never describe the company itself
+_IGNORED_DOMAINS = {
+    "facebook.com",
+    "twitter.com",
+    "x.com",
+    "linkedin.com",
+    "instagram.com",
+    "youtube.com",
+    "tiktok.com",
+    "pinterest.com",
+    "github.com",
+    "medium.com",
+    "t.me",
+    "wa.me",
+    "apps.apple.com",
+    "play.google.com",
+    "maps.google.com",
+    "goo.gl",
+}
+
+# Path segments, or -/_ separated words of them, of pages that are never
+# brochure material. Whole words only: /cartography and /legalzoom-partners stay
+_IGNORED_PATH_WORDS = {
+    "privacy",
+    "terms",
+    "cookie",
+    "cookies",
+    "legal",
+    "login",
+    "log-in",
+    "signin",
+    "sign-in",
+    "signup",
+    "sign-up",
+    "register",
+    "cart",
+    "checkout",
+}
+_PATH_WORD_SEPARATORS = re.compile(r"[-_.]+")
+
+_IGNORED_EXTENSIONS = (
+    ".pdf",
+    ".jpg",
+    ".jpeg",
+    ".png",
+    ".gif",
+    ".svg",
+    ".webp",
+    ".zip",
+    ".mp4",
+    ".mp3",
+    ".css",
+    ".js",
+    ".xml",
+    ".ics",
+)
+
+
+def _is_ignored_domain(host: str) -> bool:
+    host = host.removeprefix("www.")
+    return any(
+        host == domain or host.endswith("." + domain) for domain in _IGNORED_DOMAINS
+    )
+
+
+def _has_ignored_word(path: str) -> bool:
+    for segment in path.split("/"):
+        if segment in _IGNORED_PATH_WORDS:
+            return True
+        if not _IGNORED_PATH_WORDS.isdisjoint(_PATH_WORD_SEPARATORS.split(segment)):
+            return True
+    return False
+
+
+def normalize_link(page_url: str, href: str) -> str | None:
+    """
+    Resolve an href against the page it was found on and canonicalize it, or
+    return None for links that can never be a relevant web page (in-page
+    anchors, mailto:/tel:/javascript:, social networks, legal pages, files).
+    """
+    href = href.strip()
+    if not href or href.startswith("#"):
+        return None
+    url = urljoin(page_url, href)
+    parts = urlsplit(url)
+    if parts.scheme not in ("http", "https") or not parts.hostname:
+        return None
+    path = parts.path.lower()
+    if (
+        _is_ignored_domain(parts.hostname.lower())
+        or path.endswith(_IGNORED_EXTENSIONS)
+        or _has_ignored_word(path)
+    ):
+        return None
+    return strip_tracking_params(canonicalize_url(url))
+
+
+def prefilter_links(page_url: str, hrefs: list[str]) -> list[str]:
+    """Normalized, deduplicated links in first-seen order."""
+    links = (normalize_link(page_url, href) for href in hrefs)
+    return list(dict.fromkeys(link for link in links if link))
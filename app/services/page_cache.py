@@ -0,0 +1,66 @@
+from dataclasses import dataclass
+
+from app.core import metrics
+from app.core.cache import SQLiteCache
+from app.core.config import settings
+from app.services.extractor import Page
+from app.services.urls import canonicalize_url
+
+# Expired pages are kept (until LRU eviction) so they can be revalidated with
+# their ETag / Last-Modified validators instead of being downloaded again
+page_cache = SQLiteCache(
+    "page_cache",
+    ttl_seconds=settings.PAGE_CACHE_TTL_SECONDS,
+    max_entries=settings.PAGE_CACHE_MAX_ENTRIES,
+)
+
+
+@dataclass
+class CachedPage:
+    page: Page
+    fresh: bool
+    etag: str | None = None
+    last_modified: str | None = None
+
+    @property
+    def validators(self) -> dict[str, str]:
+        """Conditional request headers for revalidating this page."""
+        headers = {}
+        if self.etag:
+            headers["If-None-Match"] = self.etag
+        if self.last_modified:
+            headers["If-Modified-Since"] = self.last_modified
+        return headers
+
+
+async def lookup_page(url: str) -> CachedPage | None:
+    """Return the cached copy of a page, fresh or stale."""
+    if not settings.PAGE_CACHE_ENABLED:
+        return None
+    entry = await page_cache.get_entry_async(canonicalize_url(url))
+    if entry is None:
+        metrics.incr("page_cache.miss")
+        return None
+    metrics.incr("page_cache.hit" if entry.fresh else "page_cache.stale")
+    return CachedPage(
+        page=Page.from_dict(entry.value),
+        fresh=entry.fresh,
+        etag=entry.value.get("etag"),
+        last_modified=entry.value.get("last_modified"),
+    )
+
+
+async def store_page(
+    page: Page, *, etag: str | None = None, last_modified: str | None = None
+) -> None:
+    if settings.PAGE_CACHE_ENABLED:
+        await page_cache.set_async(
+            canonicalize_url(page.url),
+            {**page.to_dict(), "etag": etag, "last_modified": last_modified},
+        )
+
+
+async def mark_revalidated(url: str) -> None:
+    """Record a 304 Not Modified: the cached extraction is current again."""
+    await page_cache.touch_async(canonicalize_url(url))
+    metrics.incr("page_cache.revalidated")
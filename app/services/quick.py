@@ -0,0 +1,43 @@
+from app.core.config import settings
+from app.services.budget import count_tokens
+from app.services.compress import compress_to_tokens
+
+# Page.metadata keys holding the site's own description and name, most
+# trustworthy first
+_DESCRIPTION_KEYS = (
+    "ld:description",
+    "og:description",
+    "description",
+    "twitter:description",
+)
+_NAME_KEYS = ("ld:name", "og:site_name", "og:title", "twitter:title")
+
+
+def metadata_blurb(title: str, metadata: dict[str, str]) -> str | None:
+    """
+    A one-paragraph markdown blurb from a page's own meta/OpenGraph/JSON-LD
+    description, or None when no description reaches QUICK_METADATA_MIN_CHARS.
+    """
+    descriptions = [metadata[key] for key in _DESCRIPTION_KEYS if metadata.get(key)]
+    # The longest is usually the most informative; ties keep key order
+    description = max(descriptions, key=len, default="")
+    if len(description) < settings.QUICK_METADATA_MIN_CHARS:
+        return None
+    name = next((metadata[key] for key in _NAME_KEYS if metadata.get(key)), title)
+    if not name or name.casefold() in description.casefold():
+        return description
+    return f"**{name}**: {description}"
+
+
+def quick_context(
+    title: str, text: str, metadata: dict[str, str], max_tokens: int, model: str
+) -> str:
+    """Landing page title, metadata and as much text as fits in max_tokens."""
+    header = f"Webpage Title:\n{title}\n"
+    if metadata:
+        header += "Webpage Metadata:\n" + "".join(
+            f"{key}: {value}\n" for key, value in metadata.items()
+        )
+    header += "Webpage Contents:\n"
+    remaining = max(max_tokens - count_tokens(header, model), 0)
+    return header + compress_to_tokens(text, remaining, model)
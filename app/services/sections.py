@@ -0,0 +1,55 @@
+import hashlib
+import re
+
+# A section ends after a line whose hash falls on this modulus, so boundaries
+# depend on content only and stay put when text is inserted elsewhere
+_BOUNDARY_MODULUS = 8
+_MAX_SECTION_CHARS = 2_000
+_DIGITS = re.compile(r"\d+")
+
+
+def _normalize(text: str) -> str:
+    # Digits are masked so dates, counters and copyright years don't register
+    # as content changes
+    return _DIGITS.sub("0", " ".join(text.casefold().split()))
+
+
+def _digest(text: str) -> bytes:
+    return hashlib.blake2b(_normalize(text).encode(), digest_size=8).digest()
+
+
+def split_sections(text: str) -> list[str]:
+    """Split page text into content-defined sections of whole lines."""
+    sections: list[str] = []
+    current: list[str] = []
+    size = 0
+    for line in text.splitlines():
+        if not line.strip():
+            continue
+        current.append(line)
+        size += len(line)
+        if _digest(line)[0] % _BOUNDARY_MODULUS == 0 or size >= _MAX_SECTION_CHARS:
+            sections.append("\n".join(current))
+            current, size = [], 0
+    if current:
+        sections.append("\n".join(current))
+    return sections
+
+
+def section_hash(section: str) -> str:
+    return _digest(section).hex()
+
+
+def diff_sections(
+    previous_hashes: list[str], sections: list[str]
+) -> tuple[list[str], int]:
+    """
+    Compare sections against the hashes of an earlier version of the page.
+    Returns the sections that are new or changed, and how many earlier
+    sections no longer exist.
+    """
+    previous = set(previous_hashes)
+    hashes = [section_hash(section) for section in sections]
+    changed = [s for s, h in zip(sections, hashes) if h not in previous]
+    removed = len(previous - set(hashes))
+    return changed, removed
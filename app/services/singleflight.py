@@ -0,0 +1,187 @@
+import asyncio
+import time
+import uuid
+from collections.abc import AsyncIterator, Awaitable, Callable
+from typing import Any, AsyncGenerator
+
+from app.core import metrics
+from app.core.cache import SQLiteCache, cache_connection
+from app.core.config import settings
+from app.services.urls import canonicalize_url
+
+# Results published by the worker holding a cross-worker lease
+_results = SQLiteCache(
+    "singleflight_result",
+    ttl_seconds=settings.SINGLEFLIGHT_LEASE_SECONDS,
+    max_entries=1_000,
+)
+_lease_table_ready: set[str] = set()
+
+
+def flight_key(endpoint: str, url: str, company_name: str | None = None) -> str:
+    return f"{endpoint}|{canonicalize_url(url)}|{company_name or ''}"
+
+
+def _acquire_lease(key: str) -> tuple[bool, str]:
+    """
+    Try to take the cross-worker lease for key. Returns whether it was acquired
+    and the token of the current holder.
+    """
+    now = time.time()
+    token = uuid.uuid4().hex
+    with cache_connection() as conn:
+        if settings.CACHE_DB not in _lease_table_ready:
+            conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS singleflight_lease (
+                    key TEXT PRIMARY KEY,
+                    token TEXT NOT NULL,
+                    expires_at REAL NOT NULL
+                )
+                """
+            )
+            _lease_table_ready.add(settings.CACHE_DB)
+        conn.execute(
+            """
+            INSERT INTO singleflight_lease (key, token, expires_at) VALUES (?, ?, ?)
+            ON CONFLICT(key) DO UPDATE SET
+                token = excluded.token,
+                expires_at = excluded.expires_at
+            WHERE singleflight_lease.expires_at < ?
+            """,
+            (key, token, now + settings.SINGLEFLIGHT_LEASE_SECONDS, now),
+        )
+        row = conn.execute(
+            "SELECT token, expires_at FROM singleflight_lease WHERE key = ?", (key,)
+        ).fetchone()
+    return row[0] == token, row[0]
+
+
+def _lease_active(key: str, token: str) -> bool:
+    with cache_connection() as conn:
+        row = conn.execute(
+            "SELECT 1 FROM singleflight_lease WHERE key = ? AND token = ? "
+            "AND expires_at >= ?",
+            (key, token, time.time()),
+        ).fetchone()
+    return row is not None
+
+
+def _release_lease(key: str, token: str) -> None:
+    with cache_connection() as conn:
+        conn.execute(
+            "DELETE FROM singleflight_lease WHERE key = ? AND token = ?", (key, token)
+        )
+
+
+class _Broadcast:
+    """Runs one async stream and lets any number of subscribers follow it."""
+
+    def __init__(self, source: AsyncIterator[str]):
+        self.chunks: list[str] = []
+        self.done = False
+        self.error: BaseException | None = None
+        self._changed = asyncio.Condition()
+        self.task = asyncio.ensure_future(self._pump(source))
+
+    async def _pump(self, source: AsyncIterator[str]) -> None:
+        try:
+            async for chunk in source:
+                self.chunks.append(chunk)
+                async with self._changed:
+                    self._changed.notify_all()
+        except Exception as e:
+            self.error = e
+        finally:
+            self.done = True
+            async with self._changed:
+                self._changed.notify_all()
+
+    async def subscribe(self) -> AsyncGenerator[str, None]:
+        # Late subscribers first replay what has already been produced
+        index = 0
+        while True:
+            async with self._changed:
+                await self._changed.wait_for(
+                    lambda: index < len(self.chunks) or self.done
+                )
+            while index < len(self.chunks):
+                yield self.chunks[index]
+                index += 1
+            if self.done and index >= len(self.chunks):
+                if self.error is not None:
+                    raise self.error
+                return
+
+
+class SingleFlight:
+    """
+    Coalesces identical in-flight work: the first caller for a key runs it and
+    concurrent callers await the same result (or attach to the same stream).
+    """
+
+    def __init__(self) -> None:
+        self._calls: dict[str, asyncio.Future] = {}
+        self._streams: dict[str, _Broadcast] = {}
+
+    async def do(self, key: str, fn: Callable[[], Awaitable[Any]]) -> Any:
+        task = self._calls.get(key)
+        if task is None:
+            metrics.incr("singleflight.leader")
+            task = asyncio.ensure_future(self._run(key, fn))
+            self._calls[key] = task
+            task.add_done_callback(lambda t: self._forget(self._calls, key, t))
+        else:
+            metrics.incr("singleflight.coalesced")
+        # Shielded so one caller disconnecting does not cancel the shared work
+        return await asyncio.shield(task)
+
+    async def stream(
+        self, key: str, factory: Callable[[], AsyncIterator[str]]
+    ) -> AsyncGenerator[str, None]:
+        broadcast = self._streams.get(key)
+        if broadcast is None or broadcast.done:
+            metrics.incr("singleflight.leader")
+            broadcast = _Broadcast(factory())
+            self._streams[key] = broadcast
+            broadcast.task.add_done_callback(
+                lambda t: self._forget(self._streams, key, broadcast)
+            )
+        else:
+            metrics.incr("singleflight.coalesced")
+        async for chunk in broadcast.subscribe():
+            yield chunk
+
+    @staticmethod
+    def _forget(registry: dict, key: str, value: Any) -> None:
+        if registry.get(key) is value:
+            del registry[key]
+        if isinstance(value, asyncio.Future) and not value.cancelled():
+            value.exception()  # Mark retrieved even if every caller went away
+
+    async def _run(self, key: str, fn: Callable[[], Awaitable[Any]]) -> Any:
+        if not settings.SINGLEFLIGHT_CROSS_WORKER:
+            return await fn()
+
+        # Lease bookkeeping is blocking SQLite I/O, so it runs in a thread
+        acquired, token = await asyncio.to_thread(_acquire_lease, key)
+        if acquired:
+            try:
+                result = await fn()
+                await _results.set_async(f"{key}|{token}", result)
+                return result
+            finally:
+                await asyncio.to_thread(_release_lease, key, token)
+
+        # Another worker is doing the work; wait for its published result
+        metrics.incr("singleflight.coalesced_cross_worker")
+        while await asyncio.to_thread(_lease_active, key, token):
+            await asyncio.sleep(settings.SINGLEFLIGHT_POLL_INTERVAL)
+        result = await _results.get_async(f"{key}|{token}")
+        if result is not None:
+            return result
+        # The other worker failed or its lease expired
+        return await fn()
+
+
+singleflight = SingleFlight()
@@ -1,61 +1,334 @@
-from bs4 import BeautifulSoup
-import requests
+import asyncio
+import json
+from collections.abc import AsyncGenerator
+from dataclasses import dataclass
+
 from fastapi import HTTPException
-from openai import OpenAI
 from typing import Optional
+from app.core import metrics
 from app.core.config import settings
+from app.services.budget import count_tokens, split_into_chunks
+from app.services.completions import complete, stage_model
+from app.services.compress import compress_to_tokens_async
+from app.services.extractor import Page
+from app.services.fetcher import fetch_page
+from app.services.quick import metadata_blurb, quick_context
+from app.services.sections import diff_sections, section_hash, split_sections
 
 
-class WebsiteService:
-    def __init__(self):
-        self.openai_client = OpenAI(api_key=settings.OPENAI_API_KEY)
+@dataclass
+class PreviousSummary:
+    """An earlier summary of a URL and the section hashes of its page."""
 
-    def fetch_website_content(self, url: str) -> tuple[str, str]:
-        try:
-            response = requests.get(url, timeout=10)
-            response.raise_for_status()
+    summary: str
+    section_hashes: list[str]
 
-            soup = BeautifulSoup(response.content, "html.parser")
-            title = soup.title.string if soup.title else "No title found"
 
-            # Clean content
-            for tag in soup.body(["script", "style", "img", "input"]):
-                tag.decompose()
-            text = soup.body.get_text(separator="\n", strip=True)
+class WebsiteService:
+    system_prompt = (
+        "You are an assistant that analyzes website contents "
+        "and provides a short summary, ignoring navigation related text. "
+        "Respond in markdown."
+    )
+    update_system_prompt = (
+        "You are an assistant that keeps a short markdown summary of a website "
+        "up to date. You are given the current summary and the sections of the "
+        "website that were added or changed since. Revise the summary to "
+        "reflect them, keeping everything that is still accurate. "
+        "Respond in markdown with the complete updated summary."
+    )
+    reduce_system_prompt = (
+        "You are an assistant that combines partial summaries of consecutive "
+        "parts of one website into a single short summary. "
+        "Respond in markdown."
+    )
+
+    quick_system_prompt = (
+        "You are an assistant that describes what a website is about in one "
+        "short paragraph, ignoring navigation related text. "
+        "Respond in markdown."
+    )
 
-            return title, text
+    async def fetch_website_page(self, url: str) -> Page:
+        try:
+            return await fetch_page(url)
         except Exception as e:
             raise HTTPException(
                 status_code=400, detail=f"Failed to fetch website content: {str(e)}"
             )
 
-    def generate_summary(self, title: str, content: str) -> str:
+    async def fetch_website_content(self, url: str) -> tuple[str, str]:
+        page = await self.fetch_website_page(url)
+        return page.title, page.text
+
+    def _summary_prompt(self, title: str, content: str) -> str:
+        return (
+            f"You are looking at a website titled {title}. "
+            "The contents of this website is as follows; "
+            "please provide a short summary in markdown. "
+            "If it includes news or announcements, summarize these too.\n\n"
+            f"{content}"
+        )
+
+    async def _map_reduce(
+        self, title: str, chunks: list[str]
+    ) -> AsyncGenerator[dict, None]:
+        """Summarize chunks concurrently, then combine the partial summaries."""
+        model = stage_model("summary")
+        reduce_model = stage_model("summary_reduce")
+        semaphore = asyncio.Semaphore(settings.SUMMARY_MAP_CONCURRENCY)
+
+        async def summarize_chunk(index: int, chunk: str) -> tuple[int, str]:
+            async with semaphore:
+                user_prompt = (
+                    f"This is part {index + 1} of {len(chunks)} of a website "
+                    f"titled {title}. Summarize this part in a few sentences "
+                    "of markdown, keeping names, figures and announcements.\n\n"
+                    f"{chunk}"
+                )
+                return index, await complete(
+                    model=model,
+                    system_prompt=self.system_prompt,
+                    user_prompt=user_prompt,
+                    stage="summary",
+                )
+
+        tasks = [
+            asyncio.create_task(summarize_chunk(i, chunk))
+            for i, chunk in enumerate(chunks)
+        ]
+        partials = [""] * len(chunks)
         try:
-            system_prompt = (
-                "You are an assistant that analyzes website contents "
-                "and provides a short summary, ignoring navigation related text. "
-                "Respond in markdown."
+            for next_done in asyncio.as_completed(tasks):
+                index, partial = await next_done
+                partials[index] = partial
+                yield {
+                    "event": "partial",
+                    "chunk": index + 1,
+                    "chunks": len(chunks),
+                    "summary": partial,
+                }
+        finally:
+            for task in tasks:
+                task.cancel()
+
+        combined = "\n\n".join(
+            f"Part {i + 1}:\n{partial}" for i, partial in enumerate(partials)
+        )
+        user_prompt = (
+            f"Here are summaries of the consecutive parts of a website titled "
+            f"{title}. Combine them into one short summary in markdown. "
+            "If they include news or announcements, summarize these too.\n\n"
+            + await compress_to_tokens_async(
+                combined, settings.SUMMARY_PROMPT_TOKEN_BUDGET, reduce_model
             )
+        )
+        summary = await complete(
+            model=reduce_model,
+            system_prompt=self.reduce_system_prompt,
+            user_prompt=user_prompt,
+            stage="summary_reduce",
+        )
+        yield {"event": "summary", "title": title, "summary": summary}
 
-            user_prompt = (
-                f"You are looking at a website titled {title}. "
-                "The contents of this website is as follows; "
-                "please provide a short summary in markdown. "
-                "If it includes news or announcements, summarize these too.\n\n"
-                f"{content}"
+    async def summary_events(
+        self, title: str, content: str
+    ) -> AsyncGenerator[dict, None]:
+        """
+        Summarize content, yielding progress events: "started", one "partial"
+        per chunk summary (map-reduce mode only) and a final "summary". Content
+        over SUMMARY_MAP_REDUCE_THRESHOLD_TOKENS is split into chunks of
+        SUMMARY_CHUNK_TOKENS that are summarized concurrently and then
+        combined; smaller content is summarized in a single call.
+        """
+        model = stage_model("summary")
+        try:
+            limit = settings.SUMMARY_CHUNK_TOKENS * settings.SUMMARY_MAX_CHUNKS
+            tokens = count_tokens(content, model, limit=limit + 1)
+            if tokens <= settings.SUMMARY_MAP_REDUCE_THRESHOLD_TOKENS:
+                yield {"event": "started", "title": title, "chunks": 1}
+                # Keep the prompt within budget instead of sending unbounded text
+                content = await compress_to_tokens_async(
+                    content, settings.SUMMARY_PROMPT_TOKEN_BUDGET, model
+                )
+                summary = await complete(
+                    model=model,
+                    system_prompt=self.system_prompt,
+                    user_prompt=self._summary_prompt(title, content),
+                    stage="summary",
+                )
+                yield {"event": "summary", "title": title, "summary": summary}
+                return
+
+            # Beyond SUMMARY_MAX_CHUNKS chunks, keep the most central sentences
+            content = await compress_to_tokens_async(content, limit, model)
+            chunks = split_into_chunks(content, settings.SUMMARY_CHUNK_TOKENS, model)
+            yield {"event": "started", "title": title, "chunks": len(chunks)}
+            async for event in self._map_reduce(title, chunks):
+                yield event
+
+        except Exception as e:
+            raise HTTPException(
+                status_code=500, detail=f"Failed to generate summary: {str(e)}"
             )
 
-            response = self.openai_client.chat.completions.create(
-                model=settings.OPENAI_MODEL,  # Add to settings
-                messages=[
-                    {"role": "system", "content": system_prompt},
-                    {"role": "user", "content": user_prompt},
-                ],
+    async def generate_summary(self, title: str, content: str) -> str:
+        async for event in self.summary_events(title, content):
+            if event["event"] == "summary":
+                return event["summary"]
+        raise HTTPException(status_code=500, detail="Failed to generate summary")
+
+    async def update_summary(
+        self, title: str, summary: str, changed_sections: list[str], removed: int
+    ) -> str:
+        """Revise an existing summary given only the changed page sections."""
+        model = stage_model("summary")
+        try:
+            changes = await compress_to_tokens_async(
+                "\n\n".join(changed_sections),
+                settings.SUMMARY_PROMPT_TOKEN_BUDGET,
+                model,
+            )
+            user_prompt = (
+                f"Website title: {title}\n\n"
+                f"Current summary:\n{summary}\n\n"
+                f"Sections added or changed since:\n{changes}\n\n"
+                f"{removed} earlier sections no longer appear on the page."
+            )
+            return await complete(
+                model=model,
+                system_prompt=self.update_system_prompt,
+                user_prompt=user_prompt,
+                stage="summary",
+            )
+        except Exception as e:
+            raise HTTPException(
+                status_code=500, detail=f"Failed to update summary: {str(e)}"
             )
 
-            return response.choices[0].message.content
+    def _sections(self, title: str, content: str) -> list[str]:
+        # The title counts as a section, so a renamed site is a change too
+        return [f"Title: {title}", *split_sections(content)]
 
+    async def _reuse_summary(
+        self,
+        title: str,
+        content: str,
+        sections: list[str],
+        previous: PreviousSummary | None,
+    ) -> str | None:
+        """
+        The previous summary when the page is unchanged, an updated one when
+        few sections changed, or None when the page needs a full summary.
+        """
+        if previous is None:
+            return None
+        changed, removed = diff_sections(previous.section_hashes, sections)
+        if not changed and not removed:
+            metrics.incr("summary.unchanged")
+            return previous.summary
+        changed_chars = sum(len(section) for section in changed)
+        # Removed sections alone can't be described without their text
+        if changed and changed_chars <= settings.SUMMARY_INCREMENTAL_MAX_CHANGE * (
+            len(content) or 1
+        ):
+            metrics.incr("summary.incremental")
+            return await self.update_summary(title, previous.summary, changed, removed)
+        return None
+
+    async def summarize(
+        self, url: str, previous: PreviousSummary | None = None
+    ) -> tuple[str, str, list[str]]:
+        """
+        Fetch a website and summarize it, returning (title, summary, section
+        hashes). With a previous summary, an unchanged page reuses it and a
+        page with few changed sections gets a cheaper update pass instead of
+        a full regeneration.
+        """
+        title, content = await self.fetch_website_content(url)
+        sections = self._sections(title, content)
+        hashes = [section_hash(section) for section in sections]
+        summary = await self._reuse_summary(title, content, sections, previous)
+        if summary is None:
+            metrics.incr("summary.full")
+            summary = await self.generate_summary(title, content)
+        return title, summary, hashes
+
+    async def quick_summary(self, url: str) -> tuple[str, str]:
+        """
+        Return (title, one-paragraph summary) from the landing page alone:
+        straight from its metadata when that describes the site well enough,
+        else from a capped prompt to the quick model.
+        """
+        page = await self.fetch_website_page(url)
+        blurb = metadata_blurb(page.title, page.metadata)
+        if blurb is not None:
+            metrics.incr("summary.quick_metadata")
+            return page.title, blurb
+
+        metrics.incr("summary.quick_model")
+        model = stage_model("quick")
+        try:
+            user_prompt = (
+                "Describe what this website is about in one short paragraph "
+                "of markdown.\n\n"
+                + await asyncio.to_thread(
+                    quick_context,
+                    page.title,
+                    page.text,
+                    page.metadata,
+                    settings.QUICK_PROMPT_TOKEN_BUDGET,
+                    model,
+                )
+            )
+            summary = await complete(
+                model=model,
+                system_prompt=self.quick_system_prompt,
+                user_prompt=user_prompt,
+                stage="quick",
+            )
         except Exception as e:
             raise HTTPException(
                 status_code=500, detail=f"Failed to generate summary: {str(e)}"
             )
+        return page.title, summary
+
+    async def stream_summary(
+        self, url: str, mode: str = "full", previous: PreviousSummary | None = None
+    ) -> AsyncGenerator[str, None]:
+        """
+        Fetch and summarize a website as NDJSON progress events, reusing a
+        previous summary like summarize(). Full-mode "summary" events carry
+        the page's "section_hashes" for the caller to index.
+        """
+        if mode == "quick":
+            title, summary = await self.quick_summary(url)
+            events = [
+                {"event": "started", "title": title, "chunks": 1},
+                {"event": "summary", "title": title, "summary": summary},
+            ]
+            for event in events:
+                yield json.dumps(event) + "\n"
+            return
+        title, content = await self.fetch_website_content(url)
+        sections = self._sections(title, content)
+        hashes = [section_hash(section) for section in sections]
+        reused = await self._reuse_summary(title, content, sections, previous)
+        if reused is not None:
+            events = [
+                {"event": "started", "title": title, "chunks": 1},
+                {
+                    "event": "summary",
+                    "title": title,
+                    "summary": reused,
+                    "section_hashes": hashes,
+                },
+            ]
+            for event in events:
+                yield json.dumps(event) + "\n"
+            return
+        metrics.incr("summary.full")
+        async for event in self.summary_events(title, content):
+            if event["event"] == "summary":
+                event = {**event, "section_hashes": hashes}
+            yield json.dumps(event) + "\n"
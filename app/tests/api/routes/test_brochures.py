@@ -0,0 +1,54 @@
+from unittest.mock import patch
+
+from fastapi.testclient import TestClient
+from sqlmodel import Session, select
+
+from app.core.config import settings
+from app.models import Brochure
+
+
+async def _fake_stream(company_name: str, url: str, mode: str = "full"):
+    for chunk in ["# Acme\n", "Acme builds ", "rockets."]:
+        yield chunk
+
+
+async def _failing_stream(company_name: str, url: str, mode: str = "full"):
+    yield "# Acme\n"
+    raise RuntimeError("model went away")
+
+
+def test_public_stream_saves_streamed_content(client: TestClient, db: Session) -> None:
+    url = "https://acme.example/stream-ok"
+    with patch(
+        "app.api.routes.brochures.brochure_service.stream_brochure", _fake_stream
+    ):
+        r = client.post(
+            f"{settings.API_V1_STR}/brochures/public/stream",
+            json={"url": url, "company_name": "Acme"},
+        )
+    assert r.status_code == 200
+    assert r.text == "# Acme\nAcme builds rockets."
+
+    db.expire_all()
+    brochure = db.exec(select(Brochure).where(Brochure.url == url)).one()
+    assert brochure.status == "completed"
+    assert brochure.content == r.text
+
+
+def test_public_stream_marks_failure(client: TestClient, db: Session) -> None:
+    url = "https://acme.example/stream-fail"
+    with patch(
+        "app.api.routes.brochures.brochure_service.stream_brochure", _failing_stream
+    ):
+        r = client.post(
+            f"{settings.API_V1_STR}/brochures/public/stream",
+            json={"url": url, "company_name": "Acme"},
+        )
+    assert r.status_code == 200
+    assert r.text == "# Acme\n\n\n[Brochure generation failed: model went away]\n"
+
+    db.expire_all()
+    brochure = db.exec(select(Brochure).where(Brochure.url == url)).one()
+    assert brochure.status == "failed"
+    assert brochure.content == "# Acme\n"
+    assert brochure.error_message == "model went away"
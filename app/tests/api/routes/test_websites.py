@@ -0,0 +1,143 @@
+import json
+from unittest.mock import patch
+from uuid import UUID
+
+from fastapi.testclient import TestClient
+from sqlmodel import Session, select
+
+from app.core.config import settings
+from app.models import WebsiteSectionIndex, WebsiteSummary
+
+
+async def _fake_stream(url: str, mode: str = "full", previous=None):
+    events = [
+        {"event": "started", "title": "Acme", "chunks": 2},
+        {"event": "partial", "chunk": 2, "chunks": 2, "summary": "Part two."},
+        {"event": "partial", "chunk": 1, "chunks": 2, "summary": "Part one."},
+        {"event": "summary", "title": "Acme", "summary": "Acme builds rockets."},
+    ]
+    for event in events:
+        yield json.dumps(event) + "\n"
+
+
+async def _failing_stream(url: str, mode: str = "full", previous=None):
+    yield json.dumps({"event": "started", "title": "Acme", "chunks": 1}) + "\n"
+    raise RuntimeError("model went away")
+
+
+def test_public_stream_summary(client: TestClient, db: Session) -> None:
+    url = "https://acme.example/summary-stream"
+    with patch("app.api.routes.websites.website_service.stream_summary", _fake_stream):
+        r = client.post(
+            f"{settings.API_V1_STR}/websites/public/summarize/stream",
+            json={"url": url},
+        )
+    assert r.status_code == 200
+    assert r.headers["content-type"] == "application/x-ndjson"
+    events = [json.loads(line) for line in r.text.splitlines()]
+    assert [e["event"] for e in events] == ["started", "partial", "partial", "summary"]
+
+    summary = db.exec(select(WebsiteSummary).where(WebsiteSummary.url == url)).one()
+    assert summary.summary == "Acme builds rockets."
+
+
+def test_public_stream_summary_reports_errors(client: TestClient, db: Session) -> None:
+    url = "https://acme.example/summary-stream-fail"
+    with patch(
+        "app.api.routes.websites.website_service.stream_summary", _failing_stream
+    ):
+        r = client.post(
+            f"{settings.API_V1_STR}/websites/public/summarize/stream",
+            json={"url": url},
+        )
+    events = [json.loads(line) for line in r.text.splitlines()]
+    assert events[-1] == {"event": "error", "detail": "model went away"}
+    assert (
+        db.exec(select(WebsiteSummary).where(WebsiteSummary.url == url)).first() is None
+    )
+
+
+def test_public_summary_reuses_unchanged_page(client: TestClient, db: Session) -> None:
+    url = "https://acme.example/refresh"
+    pages = iter(["Acme builds rockets.\n© 2024", "Acme builds rockets.\n© 2025"])
+    calls: list[str] = []
+
+    async def fake_fetch(url: str) -> tuple[str, str]:
+        return "Acme", next(pages)
+
+    async def fake_complete(*, model, system_prompt, user_prompt, **kwargs) -> str:
+        calls.append(user_prompt)
+        return "Acme builds rockets."
+
+    with (
+        patch(
+            "app.api.routes.websites.website_service.fetch_website_content", fake_fetch
+        ),
+        patch("app.services.website_service.complete", fake_complete),
+    ):
+        for _ in range(2):
+            r = client.post(
+                f"{settings.API_V1_STR}/websites/public/summarize", json={"url": url}
+            )
+            assert r.status_code == 200
+            assert r.json()["summary"] == "Acme builds rockets."
+
+    assert len(calls) == 1
+    index = db.get(WebsiteSectionIndex, url)
+    assert index is not None
+    assert index.summary_id == UUID(r.json()["id"])
+
+
+def test_public_stream_summary_reuses_and_indexes_page(
+    client: TestClient, db: Session
+) -> None:
+    url = "https://acme.example/refresh-stream"
+    calls: list[str] = []
+
+    async def fake_fetch(url: str) -> tuple[str, str]:
+        return "Acme", "Acme builds rockets."
+
+    async def fake_complete(*, model, system_prompt, user_prompt, **kwargs) -> str:
+        calls.append(user_prompt)
+        return "Acme builds rockets."
+
+    with (
+        patch(
+            "app.api.routes.websites.website_service.fetch_website_content", fake_fetch
+        ),
+        patch("app.services.website_service.complete", fake_complete),
+    ):
+        for _ in range(2):
+            r = client.post(
+                f"{settings.API_V1_STR}/websites/public/summarize/stream",
+                json={"url": url},
+            )
+            final = json.loads(r.text.splitlines()[-1])
+            assert final == {
+                "event": "summary",
+                "title": "Acme",
+                "summary": "Acme builds rockets.",
+            }
+
+    # The second request reused the indexed summary
+    assert len(calls) == 1
+    assert db.get(WebsiteSectionIndex, url) is not None
+
+
+def test_quick_summary_is_not_indexed(client: TestClient, db: Session) -> None:
+    url = "https://acme.example/quick"
+
+    async def fake_quick_summary(url: str) -> tuple[str, str]:
+        return "Acme", "Acme builds rockets."
+
+    with patch(
+        "app.api.routes.websites.website_service.quick_summary", fake_quick_summary
+    ):
+        r = client.post(
+            f"{settings.API_V1_STR}/websites/public/summarize",
+            json={"url": url, "mode": "quick"},
+        )
+
+    assert r.status_code == 200
+    assert r.json()["summary"] == "Acme builds rockets."
+    assert db.get(WebsiteSectionIndex, url) is None
@@ -1,4 +1,5 @@
 from collections.abc import Generator
+from unittest.mock import patch
 
 import pytest
 from fastapi.testclient import TestClient
@@ -12,6 +13,14 @@ from app.tests.utils.user import authentication_token_from_email
 from app.tests.utils.utils import get_superuser_token_headers
 
 
+@pytest.fixture(scope="session", autouse=True)
+def cache_db(tmp_path_factory: pytest.TempPathFactory) -> Generator[str, None, None]:
+    # Tests clear caches and counters; never let them touch a real cache.db
+    path = str(tmp_path_factory.mktemp("cache") / "cache.db")
+    with patch.object(settings, "CACHE_DB", path):
+        yield path
+
+
 @pytest.fixture(scope="session", autouse=True)
 def db() -> Generator[Session, None, None]:
     with Session(engine) as session:
@@ -0,0 +1,20 @@
+from sqlmodel import Session
+
+from app.crud import website as crud
+from app.tests.utils.utils import random_lower_string
+
+
+def test_section_index_is_keyed_by_canonical_url(db: Session) -> None:
+    host = f"{random_lower_string()}.example"
+    summary = crud.create_public_website_summary(
+        session=db, url=f"https://{host}/", title="Acme", summary="Rockets."
+    )
+    crud.save_section_index(
+        session=db,
+        url=f"HTTPS://{host.upper()}/#team",
+        summary_id=summary.id,
+        section_hashes=["a", "b"],
+    )
+
+    indexed = crud.get_indexed_summary(session=db, url=f"https://{host}")
+    assert indexed == ("Rockets.", ["a", "b"])
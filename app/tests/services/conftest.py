@@ -0,0 +1,18 @@
+from collections.abc import Generator
+
+import pytest
+
+from app.services.completions import completion_cache
+from app.services.discovery import discovery_cache
+from app.services.page_cache import page_cache
+
+
+@pytest.fixture(autouse=True)
+def clear_caches() -> Generator[None, None, None]:
+    page_cache.clear()
+    completion_cache.clear()
+    discovery_cache.clear()
+    yield
+    page_cache.clear()
+    completion_cache.clear()
+    discovery_cache.clear()
@@ -0,0 +1,134 @@
+import asyncio
+from unittest.mock import patch
+
+import httpx
+
+from app.services.brochure_service import BrochureService
+
+
+def test_get_all_details_keeps_link_order() -> None:
+    delays = {"/": 0, "/about": 0.05, "/careers": 0.0}
+
+    async def handler(request: httpx.Request) -> httpx.Response:
+        if request.url.path not in delays:
+            return httpx.Response(404)
+        # The first link answers last, so completion order differs from link order
+        await asyncio.sleep(delays[request.url.path])
+        path = request.url.path
+        page = f"<html><head><title>{path}</title></head><body>{path} page</body>"
+        return httpx.Response(200, content=page.encode())
+
+    links = {
+        "links": [
+            {"type": "about page", "url": "https://acme.example/about"},
+            {"type": "careers page", "url": "https://acme.example/careers"},
+        ]
+    }
+    client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    service = BrochureService()
+    with (
+        patch("app.services.fetcher.get_http_client", return_value=client),
+        patch.object(service, "_get_relevant_links", return_value=links),
+    ):
+        details = asyncio.run(service._get_all_details("https://acme.example/"))
+
+    assert details.index("about page") < details.index("careers page")
+    assert details.index("/about") < details.index("/careers")
+
+
+def test_get_all_details_reuses_prefetched_pages() -> None:
+    requests: list[str] = []
+    about_requested = asyncio.Event()
+    landing = (
+        b"<html><head><title>Acme</title></head><body>"
+        b'<a href="/about">About</a><a href="/careers">Careers</a></body></html>'
+    )
+
+    async def handler(request: httpx.Request) -> httpx.Response:
+        path = request.url.path
+        requests.append(path)
+        if path == "/about":
+            about_requested.set()
+        elif path == "/careers":
+            await asyncio.sleep(5)  # Dropped before it answers
+        elif path != "/":
+            return httpx.Response(404)
+        page = landing if path == "/" else f"<title>{path}</title>x".encode()
+        return httpx.Response(200, content=page)
+
+    async def select_links(website, candidates):
+        # The sub-page is already being fetched while selection is in flight
+        await asyncio.wait_for(about_requested.wait(), timeout=1)
+        return {"links": [{"type": "about page", "url": "https://acme.example/about"}]}
+
+    client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    service = BrochureService()
+    with (
+        patch("app.services.fetcher.get_http_client", return_value=client),
+        patch.object(service, "_get_relevant_links", side_effect=select_links),
+    ):
+        details = asyncio.run(
+            asyncio.wait_for(service._get_all_details("https://acme.example/"), 2)
+        )
+
+    assert "about page" in details
+    assert "/careers" not in details
+    assert requests.count("/about") == 1
+
+
+def test_get_all_details_drops_near_duplicate_pages() -> None:
+    about = "<p>" + " ".join(f"Acme fact number {i}." for i in range(40)) + "</p>"
+    pages = {
+        "/": "<p>Welcome to Acme, the rocket company.</p>",
+        "/about": about,
+        "/about-us": about.replace("</p>", " Updated.</p>"),
+        "/careers": "<p>We are hiring rocket engineers in Oslo and Austin.</p>",
+    }
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        if request.url.path not in pages:
+            return httpx.Response(404)
+        return httpx.Response(200, content=pages[request.url.path].encode())
+
+    links = {
+        "links": [
+            {"type": "about page", "url": "https://acme.example/about"},
+            {"type": "company page", "url": "https://acme.example/about-us"},
+            {"type": "careers page", "url": "https://acme.example/careers"},
+        ]
+    }
+    client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    service = BrochureService()
+    with (
+        patch("app.services.fetcher.get_http_client", return_value=client),
+        patch.object(service, "_get_relevant_links", return_value=links),
+    ):
+        details = asyncio.run(service._get_all_details("https://acme.example/"))
+
+    assert "about page" in details
+    assert "company page" not in details
+    assert "hiring rocket engineers" in details
+
+
+def test_quick_brochure_uses_landing_page_only() -> None:
+    requests: list[str] = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        requests.append(request.url.path)
+        page = (
+            '<html><head><title>Acme</title><meta name="description" '
+            'content="Acme builds rockets."></head><body>'
+            '<p>Welcome to Acme.</p><a href="/about">About us</a></body>'
+        )
+        return httpx.Response(200, content=page.encode())
+
+    client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    service = BrochureService()
+    with patch("app.services.fetcher.get_http_client", return_value=client):
+        prompt = asyncio.run(
+            service._get_brochure_user_prompt("Acme", "https://acme.example/", "quick")
+        )
+
+    assert requests == ["/"]
+    assert "description: Acme builds rockets." in prompt
+    assert "Welcome to Acme." in prompt
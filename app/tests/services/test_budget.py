@@ -0,0 +1,53 @@
+from app.services.budget import (
+    allocate_budget,
+    count_tokens,
+    link_type_weight,
+    min_tokens,
+    split_into_chunks,
+    truncate_to_tokens,
+)
+
+
+def test_allocate_budget_redistributes_unused_share() -> None:
+    # The small page keeps what it needs; the rest goes to the large pages
+    allocation = allocate_budget(
+        needs=[100, 5_000, 5_000], weights=[1, 1, 1], budget=3_100
+    )
+    assert allocation == [100, 1_500, 1_500]
+
+
+def test_allocate_budget_respects_weights() -> None:
+    allocation = allocate_budget(needs=[10_000, 10_000], weights=[2, 1], budget=3_000)
+    assert allocation == [2_000, 1_000]
+
+
+def test_allocate_budget_fits_everything_when_possible() -> None:
+    assert allocate_budget(needs=[10, 20], weights=[1, 1], budget=1_000) == [10, 20]
+
+
+def test_truncate_to_tokens_fits_budget() -> None:
+    text = "word " * 2_000
+    truncated = truncate_to_tokens(text, 100, "gpt-4o-mini")
+    assert count_tokens(truncated, "gpt-4o-mini") <= 100
+    assert text.startswith(truncated)
+    assert truncate_to_tokens("short", 100, "gpt-4o-mini") == "short"
+
+
+def test_min_tokens_is_a_lower_bound() -> None:
+    for text in ["Hello, world!", "a b c d e f g", "Supercalifragilistic!!! x", ""]:
+        assert min_tokens(text, "gpt-4o-mini") <= count_tokens(text, "gpt-4o-mini")
+
+
+def test_link_type_weight() -> None:
+    assert link_type_weight("About page") > link_type_weight("blog page")
+
+
+def test_split_into_chunks_respects_token_limit() -> None:
+    model = "gpt-4o-mini"
+    text = "\n".join(f"Line {i} of the page." for i in range(200)) + "\n" + "x" * 2_000
+
+    chunks = split_into_chunks(text, 100, model)
+
+    assert len(chunks) > 1
+    assert all(count_tokens(chunk, model) <= 100 for chunk in chunks)
+    assert "".join(chunks).replace("\n", "") == text.replace("\n", "")
@@ -0,0 +1,115 @@
+import asyncio
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, patch
+
+import pytest
+
+from app.core import metrics
+from app.services.completions import (
+    complete,
+    stage_config,
+    stage_model,
+    stream_completion,
+)
+
+
+def _chunk(content: str) -> SimpleNamespace:
+    return SimpleNamespace(
+        choices=[SimpleNamespace(delta=SimpleNamespace(content=content))]
+    )
+
+
+async def _stream(*chunks: str):
+    for content in chunks:
+        yield _chunk(content)
+
+
+def _fake_client(create: AsyncMock) -> SimpleNamespace:
+    return SimpleNamespace(
+        chat=SimpleNamespace(completions=SimpleNamespace(create=create))
+    )
+
+
+async def _collect(agen) -> list[str]:
+    return [chunk async for chunk in agen]
+
+
+def test_complete_is_cached_per_prompt() -> None:
+    message = SimpleNamespace(content="A summary")
+    create = AsyncMock(
+        return_value=SimpleNamespace(choices=[SimpleNamespace(message=message)])
+    )
+    with patch(
+        "app.services.completions.get_openai_client", return_value=_fake_client(create)
+    ):
+        first = asyncio.run(complete(model="m", system_prompt="s", user_prompt="u"))
+        second = asyncio.run(complete(model="m", system_prompt="s", user_prompt="u"))
+        asyncio.run(complete(model="m", system_prompt="s", user_prompt="other"))
+
+    assert first == second == "A summary"
+    assert create.await_count == 2
+
+
+def test_cached_stream_is_replayed_in_chunks() -> None:
+    create = AsyncMock(return_value=_stream("Hello ", "brochure ", "world"))
+    kwargs = {"model": "m", "system_prompt": "s", "user_prompt": "u"}
+    with (
+        patch(
+            "app.services.completions.get_openai_client",
+            return_value=_fake_client(create),
+        ),
+        patch("app.core.config.settings.COMPLETION_REPLAY_CHUNK_SIZE", 5),
+    ):
+        live = asyncio.run(_collect(stream_completion(**kwargs)))
+        replay = asyncio.run(_collect(stream_completion(**kwargs)))
+
+    assert create.await_count == 1
+    assert "".join(replay) == "".join(live) == "Hello brochure world"
+    assert replay == ["Hello", " broc", "hure ", "world"]
+
+
+def test_stage_settings_reach_the_request_and_metrics() -> None:
+    message = SimpleNamespace(content='{"links": []}')
+    usage = SimpleNamespace(prompt_tokens=120, completion_tokens=8)
+    create = AsyncMock(
+        return_value=SimpleNamespace(
+            choices=[SimpleNamespace(message=message)], usage=usage
+        )
+    )
+    metrics.reset_counters()
+    with (
+        patch(
+            "app.services.completions.get_openai_client",
+            return_value=_fake_client(create),
+        ),
+        patch("app.core.config.settings.LINK_SELECTION_MODEL", "small-model"),
+        patch("app.core.config.settings.LINK_SELECTION_MAX_TOKENS", 300),
+        patch("app.core.config.settings.LINK_SELECTION_TIMEOUT", 5.0),
+    ):
+        model = stage_model("link_selection")
+        for _ in range(2):
+            asyncio.run(
+                complete(
+                    model=model,
+                    system_prompt="s",
+                    user_prompt="links",
+                    stage="link_selection",
+                )
+            )
+
+    assert model == "small-model"
+    create.assert_awaited_once()
+    assert create.await_args is not None
+    assert create.await_args.kwargs["max_tokens"] == 300
+    assert create.await_args.kwargs["timeout"] == 5.0
+    counters = metrics.get_counters()
+    assert counters["llm.link_selection.calls"] == 2
+    assert counters["llm.link_selection.cached"] == 1
+    assert counters["llm.link_selection.prompt_tokens"] == 120
+    assert counters["llm.link_selection.completion_tokens"] == 8
+    assert counters["llm.link_selection.seconds"] > 0
+
+
+def test_unknown_stage_is_rejected() -> None:
+    with pytest.raises(ValueError):
+        stage_config("translation")
@@ -0,0 +1,55 @@
+from unittest.mock import patch
+
+from app.services.budget import count_tokens
+from app.services.compress import compress_to_tokens, split_sentences
+
+MODEL = "gpt-4o-mini"
+
+TEXT = "\n".join(
+    [
+        "Acme Rockets builds reusable rockets for small satellites.",
+        "Our reusable rockets have launched forty small satellites to orbit.",
+        "Cookie preferences can be changed at any time.",
+        "Acme rockets launch satellites every two weeks from three spaceports.",
+        "Follow us.",
+        "Small satellites reach orbit faster with a dedicated Acme launch.",
+    ]
+)
+
+
+def test_split_sentences() -> None:
+    assert split_sentences("One. Two? Three!\nDr. Smith said 3.5 is fine. Next") == [
+        "One.",
+        "Two?",
+        "Three!",
+        "Dr.",
+        "Smith said 3.5 is fine.",
+        "Next",
+    ]
+
+
+def test_short_text_is_unchanged() -> None:
+    assert compress_to_tokens(TEXT, 10_000, MODEL) == TEXT
+    assert compress_to_tokens(TEXT, 0, MODEL) == ""
+
+
+def test_compression_keeps_central_sentences_in_order() -> None:
+    budget = count_tokens(TEXT, MODEL) // 2
+
+    compressed = compress_to_tokens(TEXT, budget, MODEL)
+
+    assert count_tokens(compressed, MODEL) <= budget
+    lines = compressed.splitlines()
+    assert "Cookie preferences can be changed at any time." not in lines
+    # Unlike truncation, central sentences from the end of the text survive
+    assert (
+        "Acme rockets launch satellites every two weeks from three spaceports." in lines
+    )
+    assert lines == [line for line in TEXT.splitlines() if line in lines]
+
+
+def test_disabled_compression_truncates() -> None:
+    budget = count_tokens(TEXT, MODEL) // 2
+    with patch("app.core.config.settings.PROMPT_COMPRESSION_ENABLED", False):
+        compressed = compress_to_tokens(TEXT, budget, MODEL)
+    assert TEXT.startswith(compressed)
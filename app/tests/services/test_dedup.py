@@ -0,0 +1,65 @@
+from pathlib import Path
+
+from app.services.dedup import dedupe_lines, minhash_sketch, sketch_similarity
+from app.services.extractor import extract_page
+
+FIXTURES = Path(__file__).resolve().parent.parent / "fixtures" / "pages"
+
+
+def test_dedupe_lines_keeps_first_occurrence() -> None:
+    texts = [
+        "Acme Rockets\nWe launch satellites.\nContact us",
+        "acme   rockets\nOur story began in 1999.\nContact us",
+        "Contact us",
+    ]
+
+    deduped, stats = dedupe_lines(texts)
+
+    assert deduped == [
+        "Acme Rockets\nWe launch satellites.\nContact us",
+        "Our story began in 1999.",
+        "",
+    ]
+    assert stats.lines == 7
+    assert stats.removed_lines == 3
+    assert stats.removed_chars == len("acme   rockets") + 2 * len("Contact us")
+
+
+def test_dedupe_lines_keeps_repeats_within_a_page() -> None:
+    texts = ["Plan\nYes\nYes\nNo", "Yes\nPricing"]
+
+    deduped, stats = dedupe_lines(texts)
+
+    assert deduped == ["Plan\nYes\nYes\nNo", "Pricing"]
+    assert stats.removed_lines == 1
+
+
+def test_dedupe_fixture_site() -> None:
+    pages = [
+        extract_page(
+            f"https://acme.example/{path.stem}", path.read_bytes(), None, "off"
+        )
+        for path in sorted(FIXTURES.glob("*.html"))
+    ]
+
+    deduped, stats = dedupe_lines([page.text for page in pages])
+
+    # The shared menus and footer are only kept on the first page
+    assert stats.removed_lines > 0
+    assert sum(map(len, deduped)) < sum(len(page.text) for page in pages)
+    assert set(deduped[0].splitlines()) == set(pages[0].text.splitlines())
+
+
+def test_sketch_similarity_detects_near_duplicates() -> None:
+    about = extract_page(
+        "https://acme.example/about", (FIXTURES / "about.html").read_bytes()
+    )
+    careers = extract_page(
+        "https://acme.example/careers", (FIXTURES / "careers.html").read_bytes()
+    )
+    variant = about.text.replace("Acme", "ACME") + "\nUpdated for 2025."
+
+    assert sketch_similarity(about.fingerprint, about.fingerprint) == 1.0
+    assert sketch_similarity(about.fingerprint, minhash_sketch(variant)) >= 0.8
+    assert sketch_similarity(about.fingerprint, careers.fingerprint) < 0.3
+    assert sketch_similarity([], about.fingerprint) == 0.0
@@ -0,0 +1,141 @@
+import asyncio
+from unittest.mock import patch
+
+import httpx
+
+from app.services.brochure_service import BrochureService, Website
+from app.services.discovery import SiteIndex, _compact, _parse_sitemap, discover_site
+
+ROBOTS = b"""
+User-agent: *
+Disallow: /private/
+Sitemap: https://acme.example/sitemap_index.xml
+"""
+
+SITEMAP_INDEX = b"""<?xml version="1.0" encoding="UTF-8"?>
+<sitemapindex xmlns="http://www.sitemaps.org/schemas/sitemap/0.9">
+  <sitemap><loc>https://acme.example/pages.xml</loc></sitemap>
+</sitemapindex>
+"""
+
+PAGES_SITEMAP = b"""<?xml version="1.0" encoding="UTF-8"?>
+<urlset xmlns="http://www.sitemaps.org/schemas/sitemap/0.9">
+  <url><loc>https://acme.example/blog/2024/01/post</loc></url>
+  <url><loc>https://acme.example/about</loc></url>
+  <url><loc>https://other.example/about</loc></url>
+  <url><loc>https://acme.example/private/team</loc></url>
+</urlset>
+"""
+
+DOCUMENTS = {
+    "/robots.txt": ("text/plain", ROBOTS),
+    "/sitemap_index.xml": ("application/xml", SITEMAP_INDEX),
+    "/pages.xml": ("application/xml", PAGES_SITEMAP),
+}
+
+
+def _client(requests: list[str]) -> httpx.AsyncClient:
+    def handler(request: httpx.Request) -> httpx.Response:
+        requests.append(request.url.path)
+        if request.url.path not in DOCUMENTS:
+            return httpx.Response(404)
+        content_type, body = DOCUMENTS[request.url.path]
+        return httpx.Response(200, headers={"Content-Type": content_type}, content=body)
+
+    return httpx.AsyncClient(transport=httpx.MockTransport(handler))
+
+
+def test_discover_site_reads_robots_and_sitemaps() -> None:
+    requests: list[str] = []
+    with patch("app.services.fetcher.get_http_client", return_value=_client(requests)):
+        index = asyncio.run(discover_site("https://ACME.example/some/page"))
+
+    assert index.origin == "https://acme.example"
+    # Same-site URLs only, shallowest first
+    assert index.urls == [
+        "https://acme.example/about",
+        "https://acme.example/private/team",
+        "https://acme.example/blog/2024/01/post",
+    ]
+    assert index.allows("/about")
+    assert not index.allows("https://acme.example/private/team")
+    assert requests == ["/robots.txt", "/sitemap_index.xml", "/pages.xml"]
+
+
+def test_discover_site_is_cached_per_domain() -> None:
+    requests: list[str] = []
+    with patch("app.services.fetcher.get_http_client", return_value=_client(requests)):
+        asyncio.run(discover_site("https://acme.example/"))
+        index = asyncio.run(discover_site("https://acme.example/careers"))
+
+    assert len(requests) == 3
+    assert not index.allows("/private/")
+
+
+def test_compact_keeps_www_variant_of_site() -> None:
+    urls = [
+        "https://www.acme.example/about",
+        "http://acme.example/careers",
+        "https://shop.acme.example/",
+        "https://other.example/about",
+    ]
+
+    assert _compact(urls, "https://acme.example") == [
+        "https://www.acme.example/about",
+        "http://acme.example/careers",
+    ]
+
+
+def test_robots_rules_only_apply_to_own_host() -> None:
+    index = SiteIndex(
+        origin="https://acme.example", robots_txt="User-agent: *\nDisallow: /acme"
+    )
+
+    assert not index.allows("/acme/jobs")
+    assert not index.allows("https://www.acme.example/acme/jobs")
+    assert index.allows("https://boards.greenhouse.io/acme")
+
+
+def test_parse_sitemap_survives_truncation() -> None:
+    pages, children = _parse_sitemap(PAGES_SITEMAP[:200])
+
+    assert pages == ["https://acme.example/blog/2024/01/post"]
+    assert children == []
+
+
+def test_candidate_links_drop_disallowed_and_duplicates() -> None:
+    requests: list[str] = []
+    with patch("app.services.fetcher.get_http_client", return_value=_client(requests)):
+        index = asyncio.run(discover_site("https://acme.example/"))
+
+    website = Website("https://acme.example/")
+    website.links = ["/private/board", "https://acme.example/about", "/careers"]
+    candidates = BrochureService()._candidate_links(website, index)
+
+    assert candidates == [
+        "https://acme.example/about",
+        "https://acme.example/careers",
+        "https://acme.example/blog/2024/01/post",
+    ]
+
+
+def test_candidate_cap_keeps_relevant_sitemap_urls() -> None:
+    index = SiteIndex(
+        origin="https://acme.example",
+        urls=["https://acme.example/about", "https://acme.example/careers"],
+    )
+    website = Website("https://acme.example/")
+    website.links = [f"/product/{i}" for i in range(60)]
+
+    with patch("app.services.brochure_service.settings.LINK_CANDIDATES_MAX", 50):
+        candidates = BrochureService()._candidate_links(website, index)
+
+    assert len(candidates) == 50
+    assert candidates[:2] == [
+        "https://acme.example/product/0",
+        "https://acme.example/product/1",
+    ]
+    assert candidates[-2:] == [
+        "https://acme.example/about",
+        "https://acme.example/careers",
+    ]
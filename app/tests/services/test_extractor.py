@@ -0,0 +1,149 @@
+import asyncio
+from pathlib import Path
+from unittest.mock import patch
+
+import pytest
+
+from app.core.executor import shutdown_parse_executor
+from app.services.extractor import (
+    available_backends,
+    extract_page,
+    extract_page_async,
+)
+
+FIXTURES = Path(__file__).parent.parent / "fixtures" / "pages"
+
+PAGE = b"""
+<html>
+  <head><title>Acme</title><style>body { color: red; }</style></head>
+  <body>
+    <h1>Welcome to Acme</h1>
+    <p>We build rockets.</p>
+    <a href="/about">About</a>
+  </body>
+</html>
+"""
+
+
+@pytest.mark.parametrize("backend", available_backends())
+def test_extract_page(backend: str) -> None:
+    page = extract_page("https://acme.example/", PAGE, backend, boilerplate="off")
+    assert page.title == "Acme"
+    assert page.text.splitlines() == ["Welcome to Acme", "We build rockets.", "About"]
+    assert page.links == ["/about"]
+    assert page.link_texts == ["About"]
+
+
+def test_large_pages_are_parsed_in_process_pool() -> None:
+    with (
+        patch("app.core.config.settings.PARSE_INLINE_MAX_BYTES", 16),
+        patch("app.core.config.settings.PARSE_PROCESS_WORKERS", 1),
+    ):
+        try:
+            page = asyncio.run(extract_page_async("https://acme.example/", PAGE))
+        finally:
+            shutdown_parse_executor()
+    assert page == extract_page("https://acme.example/", PAGE)
+
+
+def test_backends_agree_on_fixture_corpus() -> None:
+    for path in sorted(FIXTURES.glob("*.html")):
+        html = path.read_bytes()
+        pages = [extract_page(path.name, html, b) for b in available_backends()]
+        assert all(page == pages[0] for page in pages), path.name
+        assert "gtag" not in pages[0].text
+        assert "/careers" in pages[0].links
+
+
+@pytest.mark.parametrize("backend", available_backends())
+def test_link_texts_parallel_links(backend: str) -> None:
+    html = b'<p><a href="/a">Our <b>story</b></a> <a href="/b"><img src="x"></a>'
+    page = extract_page("https://acme.example/", html, backend)
+    assert page.links == ["/a", "/b"]
+    assert page.link_texts == ["Our story", ""]
+
+
+@pytest.mark.parametrize("level", ["light", "balanced", "aggressive"])
+def test_boilerplate_removal(level: str) -> None:
+    html = (FIXTURES / "landing.html").read_bytes()
+    raw = extract_page("https://acme.example/", html, boilerplate="off")
+    page = extract_page("https://acme.example/", html, boilerplate=level)
+
+    assert "Reusable first stage" in page.text
+    assert "Terms of Service" not in page.text  # footer
+    assert "Launch services" not in page.text  # nav
+    assert page.links == raw.links
+    assert 0 < page.boilerplate_ratio < 1
+    assert len(page.text) < len(raw.text)
+
+
+def test_boilerplate_levels_are_ordered() -> None:
+    html = (FIXTURES / "landing.html").read_bytes()
+    ratios = [
+        extract_page("https://acme.example/", html, boilerplate=level).boilerplate_ratio
+        for level in ["off", "light", "balanced", "aggressive"]
+    ]
+    assert ratios == sorted(ratios)
+    assert ratios[0] == 0
+
+
+def test_article_header_is_content() -> None:
+    html = b"""
+    <body>
+      <header><a href="/">Home</a></header>
+      <article><header><h1>Our story</h1></header><p>Founded in 1999.</p></article>
+      <div class="cookie-consent">We use cookies.</div>
+    </body>
+    """
+    page = extract_page("https://acme.example/", html, boilerplate="balanced")
+    assert page.text.splitlines() == ["Our story", "Founded in 1999."]
+
+
+def test_chrome_hints_match_whole_class_tokens() -> None:
+    html = b"""
+    <body class="page no-sidebar">
+      <main>
+        <section class="shareholders"><p>Letter to shareholders.</p></section>
+        <section class="social-impact"><p>Our social impact.</p></section>
+        <div class="share-buttons"><p>Share this page.</p></div>
+      </main>
+    </body>
+    """
+    page = extract_page("https://acme.example/", html, boilerplate="balanced")
+    assert page.text.splitlines() == ["Letter to shareholders.", "Our social impact."]
+
+
+def test_content_region_resets_chrome_hints() -> None:
+    html = b"""
+    <div class="layout with-sidebar" id="menu">
+      <article><p>Founded in 1999.</p></article>
+      <p>Menu entry</p>
+    </div>
+    """
+    page = extract_page("https://acme.example/", html, boilerplate="balanced")
+    assert page.text.splitlines() == ["Founded in 1999."]
+
+
+@pytest.mark.parametrize("backend", available_backends())
+def test_metadata_from_meta_tags_and_json_ld(backend: str) -> None:
+    html = b"""
+    <html><head>
+      <meta name="Description" content="Acme   builds rockets.">
+      <meta property="og:site_name" content="Acme">
+      <meta name="viewport" content="width=device-width">
+      <script type="application/ld+json">{"@graph": [
+        {"@type": "WebSite", "name": "Acme website"},
+        {"@type": "Organization", "name": "Acme Rockets",
+         "description": "Reusable launch vehicles."}
+      ]}</script>
+      <script type="application/ld+json">{not json</script>
+    </head><body><p>Welcome</p></body></html>
+    """
+    page = extract_page("https://acme.example/", html, backend)
+    assert page.metadata == {
+        "description": "Acme builds rockets.",
+        "og:site_name": "Acme",
+        "ld:name": "Acme Rockets",
+        "ld:description": "Reusable launch vehicles.",
+    }
+    assert page.text == "Welcome"
@@ -0,0 +1,162 @@
+import asyncio
+from unittest.mock import patch
+
+import httpx
+import pytest
+from fastapi import HTTPException
+
+from app.services.brochure_service import Website
+from app.services.fetcher import ThrottledError, UnsupportedContentError, fetch
+from app.services.host_scheduler import HostScheduler, parse_retry_after
+
+PAGE = b"""
+<html>
+  <head><title>Acme</title></head>
+  <body>
+    <script>var x = 1;</script>
+    <h1>Welcome to Acme</h1>
+    <a href="/about">About</a>
+    <a href="https://acme.example/careers">Careers</a>
+  </body>
+</html>
+"""
+
+
+def _client(handler) -> httpx.AsyncClient:
+    return httpx.AsyncClient(transport=httpx.MockTransport(handler))
+
+
+def test_website_fetch_parses_content() -> None:
+    def handler(request: httpx.Request) -> httpx.Response:
+        return httpx.Response(200, content=PAGE)
+
+    with patch("app.services.fetcher.get_http_client", return_value=_client(handler)):
+        website = asyncio.run(Website.fetch("https://acme.example/"))
+
+    assert website.title == "Acme"
+    assert "Welcome to Acme" in website.text
+    assert "var x" not in website.text
+    assert website.links == ["/about", "https://acme.example/careers"]
+
+
+def test_website_fetch_error_status() -> None:
+    def handler(request: httpx.Request) -> httpx.Response:
+        return httpx.Response(404)
+
+    with patch("app.services.fetcher.get_http_client", return_value=_client(handler)):
+        with pytest.raises(HTTPException) as exc_info:
+            asyncio.run(Website.fetch("https://acme.example/missing"))
+
+    assert exc_info.value.status_code == 400
+
+
+def test_fetch_rejects_binary_content_type() -> None:
+    def handler(request: httpx.Request) -> httpx.Response:
+        return httpx.Response(
+            200, headers={"Content-Type": "application/pdf"}, content=b"%PDF-1.7"
+        )
+
+    with patch("app.services.fetcher.get_http_client", return_value=_client(handler)):
+        with pytest.raises(UnsupportedContentError):
+            asyncio.run(fetch("https://acme.example/brochure.pdf"))
+
+
+def test_fetch_sniffs_untyped_binary_body() -> None:
+    def handler(request: httpx.Request) -> httpx.Response:
+        return httpx.Response(200, content=b"\x89PNG\r\n\x1a\n" + b"\x00" * 64)
+
+    with patch("app.services.fetcher.get_http_client", return_value=_client(handler)):
+        with pytest.raises(UnsupportedContentError):
+            asyncio.run(fetch("https://acme.example/logo"))
+
+
+def test_fetch_stops_at_byte_cap() -> None:
+    def handler(request: httpx.Request) -> httpx.Response:
+        return httpx.Response(
+            200, headers={"Content-Type": "text/html"}, content=b"<p>x</p>" * 1_000
+        )
+
+    with (
+        patch("app.services.fetcher.get_http_client", return_value=_client(handler)),
+        patch("app.core.config.settings.FETCH_MAX_BYTES", 100),
+    ):
+        result = asyncio.run(fetch("https://acme.example/huge"))
+
+    assert result.truncated
+    assert len(result.content) == 100
+
+
+def test_fetch_retries_after_throttling() -> None:
+    calls = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        calls.append(request)
+        if len(calls) == 1:
+            return httpx.Response(429, headers={"Retry-After": "0"})
+        return httpx.Response(200, headers={"Content-Type": "text/html"}, content=PAGE)
+
+    with patch("app.services.fetcher.get_http_client", return_value=_client(handler)):
+        result = asyncio.run(fetch("https://throttled.example/"))
+
+    assert result.status_code == 200
+    assert len(calls) == 2
+
+
+def test_fetch_gives_up_on_long_retry_after() -> None:
+    calls = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        calls.append(request)
+        return httpx.Response(503, headers={"Retry-After": "3600"})
+
+    with patch("app.services.fetcher.get_http_client", return_value=_client(handler)):
+        with pytest.raises(ThrottledError):
+            asyncio.run(fetch("https://overloaded.example/"))
+
+    assert len(calls) == 1
+
+
+def test_fetch_fails_fast_while_host_is_paused() -> None:
+    calls = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        calls.append(request)
+        return httpx.Response(503, headers={"Retry-After": "3600"})
+
+    async def fetch_twice() -> None:
+        with pytest.raises(ThrottledError):
+            await fetch("https://paused.example/a")
+        with pytest.raises(ThrottledError):
+            await asyncio.wait_for(fetch("https://paused.example/b"), 1)
+
+    with patch("app.services.fetcher.get_http_client", return_value=_client(handler)):
+        asyncio.run(fetch_twice())
+
+    # The second fetch never reached the host
+    assert len(calls) == 1
+
+
+def test_parse_retry_after() -> None:
+    assert parse_retry_after("120") == 120.0
+    assert parse_retry_after("Wed, 21 Oct 2015 07:28:00 GMT") == 0.0
+    assert parse_retry_after("soon") is None
+    assert parse_retry_after(None) is None
+
+
+def test_host_scheduler_forgets_idle_hosts() -> None:
+    scheduler = HostScheduler()
+
+    async def crawl() -> None:
+        for i in range(3):
+            async with scheduler.slot(f"https://host{i}.example/"):
+                pass
+        scheduler.back_off("https://busy.example/", 60)
+        scheduler._next_sweep = 0.0
+        async with scheduler.slot("https://host0.example/page"):
+            assert "host0.example" in scheduler._hosts
+
+    with patch("app.services.host_scheduler.settings.HTTP_MIN_HOST_INTERVAL", 0):
+        asyncio.run(crawl())
+
+    # Hosts with nothing in flight and no pending pause are dropped
+    assert list(scheduler._hosts) == ["busy.example"]
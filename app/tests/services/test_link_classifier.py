@@ -0,0 +1,104 @@
+import asyncio
+import json
+from pathlib import Path
+from unittest.mock import AsyncMock, patch
+
+from app.services.brochure_service import BrochureService, Website
+from app.services.extractor import extract_page
+from app.services.link_classifier import classify_links, score_link
+from app.services.links import prefilter_links
+
+FIXTURES = Path(__file__).resolve().parent.parent / "fixtures" / "pages"
+KEYWORDS = {"careers", "karriere", "jobs"}
+
+
+def test_score_link_prefers_shallow_exact_matches() -> None:
+    assert score_link("https://a.example/careers", "", KEYWORDS) == 1.0
+    assert score_link("https://a.example/de/karriere", "", KEYWORDS) == 1.0
+    assert score_link("https://a.example/careers/engineer-42", "", KEYWORDS) < 1.0
+    assert score_link("https://a.example/blog/2024/jobs-report", "", KEYWORDS) < 0.5
+    assert score_link("https://a.example/pricing", "", KEYWORDS) == 0.0
+
+
+def test_anchor_text_raises_score() -> None:
+    plain = score_link("https://a.example/join", "", KEYWORDS)
+    labelled = score_link("https://a.example/join", "Careers", KEYWORDS)
+    assert labelled > plain
+
+
+def test_classify_multilingual_links() -> None:
+    result = classify_links(
+        [
+            "https://acme.example/fr/produits",
+            "https://acme.example/fr/a-propos",
+            "https://acme.example/fr/carrieres",
+        ]
+    )
+
+    assert result.confidence == 1.0
+    assert result.as_selection() == {
+        "links": [
+            {"type": "about page", "url": "https://acme.example/fr/a-propos"},
+            {"type": "careers page", "url": "https://acme.example/fr/carrieres"},
+        ]
+    }
+
+
+def test_classify_landing_fixture() -> None:
+    url = "https://acme.example/"
+    page = extract_page(url, (FIXTURES / "landing.html").read_bytes())
+
+    result = classify_links(prefilter_links(url, page.links))
+
+    urls = {link["url"]: link["type"] for link in result.links}
+    assert result.confidence >= 0.8
+    assert urls["https://acme.example/about"] == "about page"
+    assert urls["https://acme.example/careers"] == "careers page"
+    assert "https://acme.example/contact" not in urls
+
+
+def test_relevant_links_skip_llm_when_confident() -> None:
+    website = Website("https://acme.example/")
+    service = BrochureService()
+    llm = AsyncMock(return_value={"links": []})
+
+    with patch.object(service, "_select_links_with_llm", llm):
+        selection = asyncio.run(
+            service._get_relevant_links(website, ["https://acme.example/about"])
+        )
+        asyncio.run(
+            service._get_relevant_links(website, ["https://acme.example/products"])
+        )
+
+    assert selection["links"][0]["url"] == "https://acme.example/about"
+    llm.assert_awaited_once()
+
+
+def test_shadow_mode_records_llm_choice_for_confident_cases(tmp_path: Path) -> None:
+    record = tmp_path / "cases.jsonl"
+    website = Website("https://acme.example/")
+    service = BrochureService()
+    choice = {"links": [{"type": "about page", "url": "https://acme.example/team"}]}
+    llm = AsyncMock(return_value=choice)
+
+    async def select() -> dict:
+        selection = await service._get_relevant_links(
+            website, ["https://acme.example/about", "https://acme.example/team"]
+        )
+        await asyncio.gather(*service._shadow_tasks)
+        return selection
+
+    with (
+        patch.object(service, "_select_links_with_llm", llm),
+        patch(
+            "app.services.brochure_service.settings.LINK_SELECTION_RECORD_PATH",
+            str(record),
+        ),
+        patch("app.services.brochure_service.settings.LINK_SELECTION_SHADOW", True),
+    ):
+        selection = asyncio.run(select())
+
+    # The classifier still answers; the LLM's choice is only recorded
+    assert selection["links"][0]["url"] == "https://acme.example/about"
+    [case] = [json.loads(line) for line in record.read_text().splitlines()]
+    assert case["selection"] == choice
@@ -0,0 +1,67 @@
+from pathlib import Path
+
+from app.services.extractor import extract_page
+from app.services.links import normalize_link, prefilter_links
+from app.services.urls import strip_tracking_params
+
+FIXTURES = Path(__file__).resolve().parent.parent / "fixtures" / "pages"
+
+
+def test_normalize_link_resolves_and_canonicalizes() -> None:
+    page = "https://Acme.example/company/"
+
+    assert normalize_link(page, "team") == "https://acme.example/company/team"
+    assert normalize_link(page, "/about#history") == "https://acme.example/about"
+    assert normalize_link(page, "//acme.example:443/careers") == (
+        "https://acme.example/careers"
+    )
+
+
+def test_normalize_link_drops_irrelevant_links() -> None:
+    page = "https://acme.example/"
+
+    for href in [
+        "",
+        "#top",
+        "mailto:hello@acme.example",
+        "tel:+15555550100",
+        "javascript:void(0)",
+        "https://www.linkedin.com/company/acme",
+        "https://twitter.com/acme",
+        "/privacy",
+        "/terms-of-service",
+        "/static/brochure.pdf",
+    ]:
+        assert normalize_link(page, href) is None, href
+
+
+def test_normalize_link_matches_ignored_words_whole() -> None:
+    page = "https://acme.example/"
+
+    for href in ["/cartography", "/descartes-lab", "/legalzoom-partners", "/determs"]:
+        assert normalize_link(page, href) == f"https://acme.example{href}", href
+    for href in ["/legal/imprint", "/account/sign-in", "/cookie_policy", "/shop/cart"]:
+        assert normalize_link(page, href) is None, href
+
+
+def test_strip_tracking_params() -> None:
+    assert (
+        strip_tracking_params("https://a.example/x?utm_source=nl&id=3&gclid=abc")
+        == "https://a.example/x?id=3"
+    )
+    assert strip_tracking_params("https://a.example/x?ref=home") == (
+        "https://a.example/x"
+    )
+
+
+def test_prefilter_landing_fixture() -> None:
+    url = "https://acme.example/"
+    page = extract_page(url, (FIXTURES / "landing.html").read_bytes())
+
+    links = prefilter_links(url, page.links)
+
+    assert len(links) < len(page.links)
+    assert len(links) == len(set(links))
+    assert "https://acme.example/contact" in links
+    assert "https://acme.example/news/series-c" in links
+    assert not any("mailto:" in link or "linkedin" in link for link in links)
@@ -0,0 +1,104 @@
+import asyncio
+from unittest.mock import patch
+
+import httpx
+
+from app.core import metrics
+from app.core.cache import SQLiteCache, cache_connection
+from app.services.fetcher import fetch_page
+
+
+def test_cache_expires_entries() -> None:
+    cache = SQLiteCache("test_cache_ttl", ttl_seconds=60, max_entries=10)
+    cache.clear()
+    with patch("app.core.cache.time.time", return_value=1_000.0):
+        cache.set("a", {"value": 1})
+    with patch("app.core.cache.time.time", return_value=1_030.0):
+        assert cache.get("a") == {"value": 1}
+    with patch("app.core.cache.time.time", return_value=1_061.0):
+        assert cache.get("a") is None
+
+
+def test_cache_evicts_least_recently_used() -> None:
+    cache = SQLiteCache("test_cache_lru", ttl_seconds=60, max_entries=2)
+    cache.clear()
+    with patch("app.core.cache.time.time", return_value=1.0):
+        cache.set("a", 1)
+    with patch("app.core.cache.time.time", return_value=2.0):
+        cache.set("b", 2)
+    with patch("app.core.cache.time.time", return_value=3.0):
+        assert cache.get("a") == 1
+    with patch("app.core.cache.time.time", return_value=4.0):
+        cache.set("c", 3)
+        assert cache.get("a") == 1
+        assert cache.get("b") is None
+        assert cache.get("c") == 3
+
+
+def test_fetch_page_is_served_from_cache() -> None:
+    calls = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        calls.append(request.url)
+        return httpx.Response(
+            200, content=b"<html><head><title>Acme</title></head><body>Hi</body></html>"
+        )
+
+    client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    metrics.reset_counters()
+    with patch("app.services.fetcher.get_http_client", return_value=client):
+        first = asyncio.run(fetch_page("https://ACME.example/#top"))
+        second = asyncio.run(fetch_page("https://acme.example"))
+
+    assert len(calls) == 1
+    assert first.title == second.title == "Acme"
+    assert first.text == second.text == "Hi"
+    counters = metrics.get_counters()
+    assert counters["page_cache.miss"] == 1
+    assert counters["page_cache.hit"] == 1
+
+
+def test_stale_page_is_revalidated_with_etag() -> None:
+    requests = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        requests.append(request)
+        if request.headers.get("If-None-Match") == '"v1"':
+            return httpx.Response(304)
+        return httpx.Response(
+            200,
+            headers={"ETag": '"v1"'},
+            content=b"<html><head><title>Acme</title></head><body>Hi</body></html>",
+        )
+
+    client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    metrics.reset_counters()
+    with patch("app.services.fetcher.get_http_client", return_value=client):
+        with patch("app.core.cache.time.time", return_value=1_000.0):
+            asyncio.run(fetch_page("https://acme.example/"))
+        with (
+            patch("app.core.cache.time.time", return_value=1_000_000.0),
+            patch("app.services.fetcher.extract_page_async") as extract_mock,
+        ):
+            page = asyncio.run(fetch_page("https://acme.example/"))
+
+    assert len(requests) == 2
+    assert requests[1].headers["If-None-Match"] == '"v1"'
+    extract_mock.assert_not_called()
+    assert page.title == "Acme"
+    counters = metrics.get_counters()
+    assert counters["page_cache.stale"] == 1
+    assert counters["page_cache.revalidated"] == 1
+
+
+def test_counters_are_buffered_until_flushed() -> None:
+    metrics.reset_counters()
+    metrics.incr("test.buffered", 2)
+    metrics.incr("test.buffered")
+    with cache_connection() as conn:
+        row = conn.execute(
+            "SELECT value FROM metric_counter WHERE name = 'test.buffered'"
+        ).fetchone()
+
+    assert row is None
+    assert metrics.get_counters()["test.buffered"] == 3
@@ -0,0 +1,38 @@
+import hashlib
+
+from app.services.sections import diff_sections, section_hash, split_sections
+
+
+def _word(i: int) -> str:
+    # Digits don't count as content, so lines must differ in their letters
+    return "".join(
+        chr(97 + int(c, 16)) for c in hashlib.md5(str(i).encode()).hexdigest()[:8]
+    )
+
+
+TEXT = "\n".join(f"Line {_word(i)} of the page." for i in range(300))
+
+
+def test_split_sections_keeps_every_line() -> None:
+    sections = split_sections(TEXT)
+
+    assert len(sections) > 1
+    assert "\n".join(sections) == TEXT
+
+
+def test_insertion_only_changes_nearby_sections() -> None:
+    sections = split_sections(TEXT)
+    lines = TEXT.splitlines()
+    edited = "\n".join(lines[:150] + ["A brand new paragraph."] + lines[150:])
+
+    changed, removed = diff_sections(
+        [section_hash(s) for s in sections], split_sections(edited)
+    )
+
+    assert len(changed) == 1
+    assert "A brand new paragraph." in changed[0]
+    assert removed == 1
+
+
+def test_digits_and_whitespace_are_not_changes() -> None:
+    assert section_hash("© 2024  Acme") == section_hash("© 2025 acme")
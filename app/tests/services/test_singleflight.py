@@ -0,0 +1,72 @@
+import asyncio
+from unittest.mock import patch
+
+from app.services.singleflight import SingleFlight
+
+
+def test_do_coalesces_concurrent_calls() -> None:
+    calls = 0
+
+    async def work() -> str:
+        nonlocal calls
+        calls += 1
+        await asyncio.sleep(0.01)
+        return "result"
+
+    async def main() -> list[str]:
+        flight = SingleFlight()
+        return await asyncio.gather(*(flight.do("k", work) for _ in range(5)))
+
+    assert asyncio.run(main()) == ["result"] * 5
+    assert calls == 1
+
+
+def test_stream_late_subscriber_receives_whole_stream() -> None:
+    starts = 0
+
+    async def source():
+        nonlocal starts
+        starts += 1
+        for chunk in ["a", "b", "c"]:
+            await asyncio.sleep(0.01)
+            yield chunk
+
+    async def collect(flight: SingleFlight, delay: float) -> str:
+        await asyncio.sleep(delay)
+        return "".join([chunk async for chunk in flight.stream("k", source)])
+
+    async def main() -> list[str]:
+        flight = SingleFlight()
+        return list(await asyncio.gather(collect(flight, 0), collect(flight, 0.015)))
+
+    assert asyncio.run(main()) == ["abc", "abc"]
+    assert starts == 1
+
+
+def test_do_coalesces_across_workers() -> None:
+    calls = 0
+
+    async def work() -> list[str]:
+        nonlocal calls
+        calls += 1
+        await asyncio.sleep(0.05)
+        return ["title", "summary"]
+
+    async def main() -> list:
+        # Two instances stand in for two workers sharing the cache database
+        first, second = SingleFlight(), SingleFlight()
+        return list(
+            await asyncio.gather(
+                first.do("cross", work),
+                second.do("cross", work),
+            )
+        )
+
+    with (
+        patch("app.core.config.settings.SINGLEFLIGHT_CROSS_WORKER", True),
+        patch("app.core.config.settings.SINGLEFLIGHT_POLL_INTERVAL", 0.01),
+    ):
+        results = asyncio.run(main())
+
+    assert results == [["title", "summary"]] * 2
+    assert calls == 1
@@ -0,0 +1,180 @@
+import asyncio
+from unittest.mock import patch
+
+from app.services.budget import count_tokens
+from app.services.extractor import Page
+from app.services.website_service import PreviousSummary, WebsiteService
+
+CONTENT = "\n".join(
+    f"Paragraph {i} about Acme rockets and launches." for i in range(60)
+)
+
+
+def _collect(content: str) -> tuple[list[dict], list[str]]:
+    prompts: list[str] = []
+    running = 0
+    peak = 0
+
+    async def fake_complete(*, model, system_prompt, user_prompt, **kwargs) -> str:
+        nonlocal running, peak
+        prompts.append(user_prompt)
+        running += 1
+        peak = max(peak, running)
+        await asyncio.sleep(0.01)
+        running -= 1
+        return f"summary {len(prompts)}"
+
+    async def run() -> list[dict]:
+        return [e async for e in WebsiteService().summary_events("Acme", content)]
+
+    with (
+        patch("app.services.website_service.complete", fake_complete),
+        patch("app.core.config.settings.SUMMARY_MAP_REDUCE_THRESHOLD_TOKENS", 200),
+        patch("app.core.config.settings.SUMMARY_CHUNK_TOKENS", 100),
+        patch("app.core.config.settings.SUMMARY_MAP_CONCURRENCY", 2),
+    ):
+        events = asyncio.run(run())
+    assert peak <= 2
+    return events, prompts
+
+
+def test_small_content_is_summarized_in_one_call() -> None:
+    events, prompts = _collect("Acme builds rockets.")
+
+    assert [e["event"] for e in events] == ["started", "summary"]
+    assert len(prompts) == 1
+
+
+def test_large_content_is_map_reduced() -> None:
+    events, prompts = _collect(CONTENT)
+
+    chunks = events[0]["chunks"]
+    assert chunks > 1
+    assert [e["event"] for e in events] == ["started"] + ["partial"] * chunks + [
+        "summary"
+    ]
+    assert sorted(e["chunk"] for e in events[1:-1]) == list(range(1, chunks + 1))
+    # Every chunk plus the final reduce call
+    assert len(prompts) == chunks + 1
+    reduce_prompt = prompts[-1]
+    assert reduce_prompt.index("Part 1:") < reduce_prompt.index(f"Part {chunks}:")
+    assert events[-1]["summary"] == f"summary {chunks + 1}"
+
+
+MISSIONS = ["Aurora", "Borealis", "Cygnus", "Draco", "Eridanus", "Fornax", "Gemini"]
+PAGE = "\n".join(
+    [
+        f"Acme launched the {name} {kind} mission."
+        for name in MISSIONS
+        for kind in ["cargo", "survey", "relay", "weather", "imaging"]
+    ]
+    + ["© 2024 Acme Rockets. All rights reserved."]
+)
+
+
+def _summarize(content: str, previous: PreviousSummary | None):
+    prompts: list[str] = []
+
+    async def fake_complete(*, model, system_prompt, user_prompt, **kwargs) -> str:
+        prompts.append(user_prompt)
+        return "fresh summary"
+
+    async def fake_fetch(url: str) -> tuple[str, str]:
+        return "Acme", content
+
+    service = WebsiteService()
+    with (
+        patch("app.services.website_service.complete", fake_complete),
+        patch.object(service, "fetch_website_content", fake_fetch),
+    ):
+        result = asyncio.run(service.summarize("https://acme.example/", previous))
+    return result, prompts
+
+
+def test_unchanged_page_reuses_summary() -> None:
+    (_, _, hashes), _ = _summarize(PAGE, None)
+
+    # Only the footer year changed
+    (_, summary, _), prompts = _summarize(
+        PAGE.replace("2024", "2025"), PreviousSummary("old summary", hashes)
+    )
+
+    assert summary == "old summary"
+    assert prompts == []
+
+
+def test_changed_section_gets_update_pass() -> None:
+    (_, _, hashes), _ = _summarize(PAGE, None)
+    changed = PAGE.replace("Gemini imaging", "first crewed Gemini imaging")
+
+    (_, summary, _), prompts = _summarize(
+        changed, PreviousSummary("old summary", hashes)
+    )
+
+    assert summary == "fresh summary"
+    assert len(prompts) == 1
+    assert "Current summary:\nold summary" in prompts[0]
+    assert "first crewed Gemini" in prompts[0]
+    assert "Aurora cargo" not in prompts[0]
+
+
+def test_rewritten_page_is_summarized_again() -> None:
+    (_, _, hashes), _ = _summarize(PAGE, None)
+
+    (_, _, _), prompts = _summarize(
+        "Acme now sells garden furniture.", PreviousSummary("old summary", hashes)
+    )
+
+    assert "Current summary" not in prompts[0]
+
+
+def _quick_summarize(page: Page) -> tuple[tuple[str, str], list[tuple[str, str]]]:
+    calls: list[tuple[str, str]] = []
+
+    async def fake_complete(*, model, system_prompt, user_prompt, **kwargs) -> str:
+        calls.append((model, user_prompt))
+        return "quick summary"
+
+    async def fake_fetch_page(url: str) -> Page:
+        return page
+
+    with (
+        patch("app.services.website_service.complete", fake_complete),
+        patch("app.services.website_service.fetch_page", fake_fetch_page),
+        patch("app.core.config.settings.QUICK_MODEL", "fast-model"),
+        patch("app.core.config.settings.QUICK_PROMPT_TOKEN_BUDGET", 100),
+    ):
+        result = asyncio.run(WebsiteService().quick_summary(page.url))
+    return result, calls
+
+
+def test_quick_summary_answers_from_rich_metadata() -> None:
+    description = "Acme designs, builds and launches reusable rockets " * 3
+    page = Page(
+        url="https://acme.example/",
+        title="Home",
+        text=PAGE,
+        metadata={"og:site_name": "Acme", "og:description": description},
+    )
+
+    (title, summary), calls = _quick_summarize(page)
+
+    assert (title, summary) == ("Home", description)
+    assert calls == []
+
+
+def test_quick_summary_uses_capped_prompt_to_quick_model() -> None:
+    page = Page(
+        url="https://acme.example/",
+        title="Acme",
+        text=PAGE,
+        metadata={"description": "Rockets."},
+    )
+
+    (_, summary), calls = _quick_summarize(page)
+
+    assert summary == "quick summary"
+    [(model, prompt)] = calls
+    assert model == "fast-model"
+    assert "description: Rockets." in prompt
+    assert count_tokens(prompt, model) <= 150
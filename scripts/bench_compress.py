@@ -0,0 +1,119 @@
+"""
+Benchmark extractive prompt compression (TextRank) against plain truncation.
+
+Usage (from the project root, with the app settings available in .env):
+
+    python scripts/bench_compress.py [--sizes 10 50 100] [--ratio 0.25]
+
+Builds page texts of the given sizes (KB) and compresses each to --ratio of
+its tokens. The texts are generated, not repeated: every line is a fresh run
+of sentences whose words are drawn with a Zipf distribution from the fixture
+page corpus, padded with made-up words to a realistic vocabulary size, so no
+sentence repeats and the term statistics look like prose. Reports latency, plus two quality
+proxies against the full text: cosine similarity of the term-frequency
+vectors, and recall of the 50 most frequent content words. The same figures
+are shown for truncation to the same budget.
+"""
+
+import argparse
+import random
+import re
+import sys
+import time
+from collections import Counter
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from app.core.config import settings  # noqa: E402
+from app.services.budget import count_tokens, truncate_to_tokens  # noqa: E402
+from app.services.compress import compress_to_tokens  # noqa: E402
+from app.services.extractor import extract_page  # noqa: E402
+
+DEFAULT_CORPUS = Path(__file__).resolve().parent.parent / "app/tests/fixtures/pages"
+_WORD = re.compile(r"\w{4,}")
+_VOCABULARY_SIZE = 5000
+_SYLLABLES = [c + v for c in "bcdfghklmnprstvz" for v in "aeiou"]
+
+
+def _build_text(corpus: list[str], size: int, seed: int = 0) -> str:
+    rng = random.Random(seed)
+    counts = Counter(re.findall(r"[A-Za-z][a-z]+", " ".join(corpus)))
+    vocabulary = list(dict.fromkeys(word.lower() for word, _ in counts.most_common()))
+    made_up = set(vocabulary)
+    while len(made_up) < _VOCABULARY_SIZE:
+        word = "".join(rng.choices(_SYLLABLES, k=rng.randint(2, 4)))
+        if word not in made_up:
+            made_up.add(word)
+            vocabulary.append(word)
+    # Zipf weights over the corpus words, most frequent first
+    weights = [1 / rank for rank in range(1, len(vocabulary) + 1)]
+    lines: list[str] = []
+    total = 0
+    while total < size:
+        sentences = []
+        for _ in range(rng.randint(1, 6)):
+            words = rng.choices(vocabulary, weights, k=rng.randint(6, 28))
+            sentences.append(" ".join(words).capitalize() + rng.choice(".!?"))
+        line = " ".join(sentences)
+        lines.append(line)
+        total += len(line) + 1
+    return "\n".join(lines)[:size]
+
+
+def _quality(original: str, compressed: str) -> tuple[float, float]:
+    full = Counter(_WORD.findall(original.casefold()))
+    kept = Counter(_WORD.findall(compressed.casefold()))
+    dot = sum(count * kept[word] for word, count in full.items())
+    norm = (
+        sum(c * c for c in full.values()) * sum(c * c for c in kept.values())
+    ) ** 0.5
+    top = [word for word, _ in full.most_common(50)]
+    recall = sum(1 for word in top if word in kept) / len(top)
+    return (dot / norm if norm else 0.0), recall
+
+
+def _time(fn, rounds: int) -> tuple[str, float]:
+    fn()  # Warm up caches and the tokenizer
+    start = time.perf_counter()
+    for _ in range(rounds):
+        result = fn()
+    return result, (time.perf_counter() - start) / rounds * 1000
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10, 50, 100])
+    parser.add_argument("--ratio", type=float, default=0.25)
+    parser.add_argument("--rounds", type=int, default=5)
+    parser.add_argument("--corpus", type=Path, default=DEFAULT_CORPUS)
+    args = parser.parse_args()
+
+    model = settings.OPENAI_MODEL
+    corpus = [
+        extract_page(path.name, path.read_bytes()).text
+        for path in sorted(args.corpus.glob("*.html"))
+    ]
+    print(f"compressing to {args.ratio:.0%} of the tokens, model {model}")
+    print(
+        f"{'size':>6}{'tokens':>8}{'method':>10}{'ms':>9}" f"{'cosine':>9}{'top-50':>9}"
+    )
+    for size_kb in args.sizes:
+        text = _build_text(corpus, size_kb * 1024)
+        tokens = count_tokens(text, model)
+        budget = int(tokens * args.ratio)
+        methods = {
+            "textrank": lambda: compress_to_tokens(text, budget, model),
+            "truncate": lambda: truncate_to_tokens(text, budget, model),
+        }
+        for name, fn in methods.items():
+            result, ms = _time(fn, args.rounds)
+            cosine, recall = _quality(text, result)
+            print(
+                f"{size_kb:>5}K{tokens:>8}{name:>10}{ms:>9.1f}"
+                f"{cosine:>9.2f}{recall:>9.0%}"
+            )
+
+
+if __name__ == "__main__":
+    main()
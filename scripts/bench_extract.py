@@ -0,0 +1,68 @@
+"""
+Benchmark the HTML extraction backends on the fixture page corpus.
+
+Usage (from the project root, with the app settings available in .env):
+
+    python scripts/bench_extract.py [--rounds 200] [--corpus app/tests/fixtures/pages]
+
+Reports pages/sec and MB/sec for every installed backend, plus the previous
+BeautifulSoup-based extraction as a baseline.
+"""
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+from bs4 import BeautifulSoup
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from app.services.extractor import available_backends, extract_page  # noqa: E402
+
+DEFAULT_CORPUS = Path(__file__).resolve().parent.parent / "app/tests/fixtures/pages"
+
+
+def _beautifulsoup_baseline(url: str, html: bytes) -> None:
+    soup = BeautifulSoup(html, "html.parser")
+    _ = soup.title.string if soup.title else "No title found"
+    if soup.body:
+        for tag in soup.body(["script", "style", "img", "input"]):
+            tag.decompose()
+        soup.body.get_text(separator="\n", strip=True)
+    [link.get("href") for link in soup.find_all("a") if link.get("href")]
+
+
+def _bench(extract, corpus: list[bytes], rounds: int) -> float:
+    start = time.perf_counter()
+    for _ in range(rounds):
+        for html in corpus:
+            extract("https://bench.example/", html)
+    return time.perf_counter() - start
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--rounds", type=int, default=200)
+    parser.add_argument("--corpus", type=Path, default=DEFAULT_CORPUS)
+    args = parser.parse_args()
+
+    corpus = [path.read_bytes() for path in sorted(args.corpus.glob("*.html"))]
+    if not corpus:
+        sys.exit(f"No *.html files found in {args.corpus}")
+    pages = len(corpus) * args.rounds
+    megabytes = sum(len(html) for html in corpus) * args.rounds / 1_000_000
+
+    candidates = {"bs4 (baseline)": _beautifulsoup_baseline}
+    for backend in available_backends():
+        candidates[backend] = lambda url, html, b=backend: extract_page(url, html, b)
+
+    print(f"{len(corpus)} pages x {args.rounds} rounds ({megabytes:.1f} MB)")
+    print(f"{'backend':<16}{'pages/sec':>12}{'MB/sec':>10}")
+    for name, extract in candidates.items():
+        elapsed = _bench(extract, corpus, args.rounds)
+        print(f"{name:<16}{pages / elapsed:>12.0f}{megabytes / elapsed:>10.1f}")
+
+
+if __name__ == "__main__":
+    main()
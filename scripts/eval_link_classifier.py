@@ -0,0 +1,77 @@
+"""
+Evaluate the local link classifier against recorded LLM link choices.
+
+Usage (from the project root, with the app settings available in .env):
+
+    python scripts/eval_link_classifier.py cases.jsonl [--min-confidence 0.8]
+
+Cases are recorded by setting LINK_SELECTION_RECORD_PATH: every link selection
+answered by the LLM is appended as one JSON line. With the classifier enabled
+the LLM only answers the cases the classifier is unsure of, so also set
+LINK_SELECTION_SHADOW to record the LLM's choice for the confident cases (or
+record with LINK_CLASSIFIER_ENABLED=false). Reports how often the
+classifier would have been confident enough to skip the LLM, and precision and
+recall of its picks against the LLM's, for the confident cases and overall.
+"""
+
+import argparse
+import json
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from app.services.link_classifier import classify_links  # noqa: E402
+from app.services.urls import canonicalize_url  # noqa: E402
+
+
+def _urls(selection: dict) -> set[str]:
+    return {
+        canonicalize_url(link["url"])
+        for link in selection.get("links", [])
+        if link.get("url")
+    }
+
+
+def _precision_recall(pairs: list[tuple[set[str], set[str]]]) -> tuple[float, float]:
+    true_positives = sum(len(picked & expected) for picked, expected in pairs)
+    picked_total = sum(len(picked) for picked, _ in pairs)
+    expected_total = sum(len(expected) for _, expected in pairs)
+    precision = true_positives / picked_total if picked_total else 1.0
+    recall = true_positives / expected_total if expected_total else 1.0
+    return precision, recall
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("cases", type=Path)
+    parser.add_argument("--min-confidence", type=float, default=0.8)
+    args = parser.parse_args()
+
+    cases = [
+        json.loads(line)
+        for line in args.cases.read_text(encoding="utf-8").splitlines()
+        if line.strip()
+    ]
+    if not cases:
+        sys.exit(f"No cases found in {args.cases}")
+
+    confident: list[tuple[set[str], set[str]]] = []
+    overall: list[tuple[set[str], set[str]]] = []
+    for case in cases:
+        result = classify_links(case["candidates"], case.get("link_texts"))
+        pair = (_urls(result.as_selection()), _urls(case["selection"]))
+        overall.append(pair)
+        if result.confidence >= args.min_confidence:
+            confident.append(pair)
+
+    print(f"{len(cases)} recorded cases, min confidence {args.min_confidence}")
+    print(f"hit rate (LLM call skipped): {len(confident) / len(cases):.1%}")
+    print(f"{'subset':<12}{'cases':>8}{'precision':>12}{'recall':>10}")
+    for name, pairs in (("confident", confident), ("all", overall)):
+        precision, recall = _precision_recall(pairs)
+        print(f"{name:<12}{len(pairs):>8}{precision:>12.1%}{recall:>10.1%}")
+
+
+if __name__ == "__main__":
+    main()